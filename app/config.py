@@ -20,6 +20,69 @@ class Settings(BaseSettings):
     supabase_anon_key: str = "placeholder-anon-key"
     supabase_service_role_key: str = "placeholder-service-role-key"
     
+    # Optional read replica API URL (same keys as the primary); reads stay on the
+    # primary for read_your_writes_seconds after a user writes
+    supabase_read_replica_url: Optional[str] = None
+    read_your_writes_seconds: float = 5.0
+    replica_retry_after_seconds: float = 30.0
+    
+    # Upstream call protection: per-request timeout, overall deadline including
+    # retries, retries for idempotent reads, and circuit breaker thresholds
+    supabase_timeout_seconds: float = 10.0
+    supabase_call_deadline_seconds: float = 15.0
+    supabase_read_retries: int = 2
+    supabase_retry_backoff_seconds: float = 0.1
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_seconds: float = 30.0
+    
+    # Logging: JSON lines (or "text") written off the event loop by a queue
+    # listener. log_levels overrides per module, e.g.
+    # "app.services.email_service=DEBUG,app.utils.query_budget=ERROR". Repeats
+    # of one message beyond log_repeat_limit per window are suppressed.
+    log_level: str = "INFO"
+    log_levels: str = ""
+    log_format: str = "json"
+    log_queue_size: int = 10000
+    log_repeat_limit: int = 5
+    log_repeat_window_seconds: float = 60.0
+    
+    # Admission control: concurrent requests and wait queue per lane. Lead
+    # create/assign use the critical lane, dashboards/audit logs/bulk deletes
+    # the heavy lane; excess requests get 503 with Retry-After
+    admission_control_enabled: bool = True
+    admission_default_concurrency: int = 64
+    admission_default_queue: int = 128
+    admission_heavy_concurrency: int = 4
+    admission_heavy_queue: int = 8
+    admission_critical_concurrency: int = 16
+    admission_critical_queue: int = 64
+    admission_queue_timeout_seconds: float = 2.0
+    admission_critical_queue_timeout_seconds: float = 5.0
+    admission_retry_after_seconds: int = 2
+    
+    # Per-route request and upstream call metrics, exposed at /metrics
+    metrics_enabled: bool = True
+    
+    # Per-request profiling for staging: when enabled, admins can add an
+    # X-Profile: 1 header (or ?profile=1) to sample one request's Python stacks
+    # and time its upstream calls; results are kept at /api/admin/profiles
+    profiling_enabled: bool = False
+    profiling_interval_seconds: float = 0.002
+    profiling_max_profiles: int = 50
+    
+    # N+1 detection for debug/staging: "off", "warn" or "raise" when a query
+    # shape repeats more than query_repeat_threshold times in one request, or a
+    # request exceeds its route's query_budget (default_query_budget if unset)
+    query_budget_mode: str = "off"
+    query_repeat_threshold: int = 3
+    default_query_budget: Optional[int] = None
+    
+    # Database access: "postgrest" (via Supabase) or "postgres" (direct pool, service role only)
+    database_backend: str = "postgrest"
+    database_url: Optional[str] = None
+    database_pool_min_size: int = 1
+    database_pool_max_size: int = 10
+    
     # SMTP
     smtp_host: str = "smtp.gmail.com"
     smtp_port: int = 587
@@ -32,6 +95,26 @@ class Settings(BaseSettings):
     default_sla_duration_minutes: int = 120
     scheduler_interval_minutes: int = 5
     reminder_before_deadline_minutes: int = 30
+    scheduler_history_size: int = 50  # job runs kept per job for /api/admin/scheduler
+    
+    # Caches
+    user_directory_ttl_seconds: int = 300
+    user_directory_max_entries: int = 1000
+    custom_field_cache_ttl_seconds: int = 300
+    
+    # Event stream
+    event_stream_queue_size: int = 100
+    event_stream_heartbeat_seconds: int = 15
+    event_bus_database_url: Optional[str] = None  # enables Postgres LISTEN/NOTIFY fan-out across workers
+    
+    # Responses
+    fast_json_responses: bool = False  # precompiled TypeAdapter encoding for list endpoints (leads/users always use it for ETags)
+    gzip_responses: bool = False
+    gzip_minimum_size: int = 1024
+    
+    # POST /api/batch
+    batch_max_requests: int = 20
+    batch_concurrency: int = 6  # sub-requests of one batch running at once
     
     # CORS
     cors_origins: list[str] = [
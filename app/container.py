@@ -0,0 +1,61 @@
+"""Service container - application services built lazily, once per process
+
+Nothing here runs at import time. Routes receive services through FastAPI
+dependencies (Depends(get_lead_service)), so the first request that needs
+a service builds it, and tests can swap one with app.dependency_overrides.
+Background work reaches them through the same getters from the lifespan.
+"""
+
+from functools import lru_cache
+from app.services.audit_service import AuditService
+from app.services.dashboard_service import DashboardService
+from app.services.email_service import EmailService
+from app.services.lead_service import LeadService
+from app.services.scheduler_service import SchedulerService
+from app.services.sla_service import SLAService
+
+
+@lru_cache()
+def get_email_service() -> EmailService:
+    return EmailService()
+
+
+@lru_cache()
+def get_sla_service() -> SLAService:
+    return SLAService()
+
+
+@lru_cache()
+def get_lead_service() -> LeadService:
+    return LeadService(email_service=get_email_service())
+
+
+@lru_cache()
+def get_dashboard_service() -> DashboardService:
+    return DashboardService()
+
+
+@lru_cache()
+def get_audit_service() -> AuditService:
+    return AuditService()
+
+
+@lru_cache()
+def get_scheduler_service() -> SchedulerService:
+    return SchedulerService(sla_service=get_sla_service(), email_service=get_email_service())
+
+
+SERVICE_GETTERS = (
+    get_email_service,
+    get_sla_service,
+    get_lead_service,
+    get_dashboard_service,
+    get_audit_service,
+    get_scheduler_service,
+)
+
+
+def reset_container():
+    """Forget every built service so the next use builds it again (tests)"""
+    for getter in SERVICE_GETTERS:
+        getter.cache_clear()
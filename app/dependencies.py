@@ -1,16 +1,30 @@
 """Dependency injection - Supabase Auth based"""
 
+from contextvars import ContextVar
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+from app.utils.metrics import upstream_call
+from app.services.loaders import Loaders
+from app.utils.read_replica import current_user_id
+from app.utils.log import bind
 
 security = HTTPBearer(auto_error=False)
 
+# Set by POST /api/batch so its sub-requests reuse the already validated user
+batch_user: ContextVar[Optional[dict]] = ContextVar("batch_user", default=None)
+
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
     Validate JWT token with Supabase Auth and return user info.
     """
+    user = batch_user.get()
+    if user is not None:
+        return user
+    
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -24,7 +38,8 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         client = get_supabase_client()
         
         # Verify token with Supabase Auth
-        user_response = client.auth.get_user(token)
+        with upstream_call("gotrue", "get_user"):
+            user_response = client.auth.get_user(token)
         
         if not user_response or not user_response.user:
             raise HTTPException(
@@ -35,9 +50,12 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         auth_user = user_response.user
         
         # Get role from users table
-        profile = client.table("users").select("id, name, email, role").eq(
+        profile = await execute(client.table("users").select("id, name, email, role").eq(
             "id", str(auth_user.id)
-        ).execute()
+        ))
+        
+        current_user_id.set(str(auth_user.id))
+        bind(user_id=str(auth_user.id))
         
         if profile.data:
             return profile.data[0]
@@ -77,3 +95,8 @@ async def require_sdr(current_user: dict = Depends(get_current_user)) -> dict:
             detail="SDR or Admin access required"
         )
     return current_user
+
+
+async def get_loaders() -> Loaders:
+    """Request-scoped batching loaders (FastAPI caches dependencies per request)"""
+    return Loaders()
@@ -1,25 +1,43 @@
 """FastAPI application entry point"""
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import get_settings
-from app.services.scheduler_service import SchedulerService
-from app.routers import auth, users, leads, dashboard, audit_logs, admin_users, custom_fields
+from app.container import get_scheduler_service
+from app.services.event_bus import event_bus, PostgresEventBackbone
+from app.middleware.compression import SelectiveGZipMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.middleware.admission import AdmissionControlMiddleware
+from app.utils.log import configure_logging, shutdown_logging
+from app.utils.metrics import render_metrics
+from app.routers import auth, users, leads, dashboard, audit_logs, admin_users, admin_profiles, admin_scheduler, custom_fields, events, batch
 
 settings = get_settings()
-scheduler_service = SchedulerService()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown"""
-    # Startup
+    # Startup: services are built here or on first use, never at import
+    configure_logging()
+    scheduler_service = get_scheduler_service()
     scheduler_service.start()
+    event_backbone = None
+    if settings.event_bus_database_url:
+        event_backbone = PostgresEventBackbone(event_bus, settings.event_bus_database_url)
+        event_backbone.start()
     yield
     # Shutdown
+    if event_backbone is not None:
+        event_backbone.stop()
     scheduler_service.scheduler.shutdown()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -30,6 +48,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Innermost, so shed responses still get CORS headers and are counted in metrics
+if settings.admission_control_enabled:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -44,14 +66,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.gzip_responses:
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
+if settings.query_budget_mode != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+# Outside the other middleware, so latency includes them
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Outside the metrics middleware so every log line of a request has its id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(admin_users.router)
+app.include_router(admin_profiles.router)
+app.include_router(admin_scheduler.router)
 app.include_router(users.router)
 app.include_router(leads.router)
 app.include_router(custom_fields.router)
 app.include_router(dashboard.router)
 app.include_router(audit_logs.router)
+app.include_router(events.router)
+app.include_router(batch.router)
 
 
 @app.get("/health")
@@ -64,6 +106,14 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    if not settings.metrics_enabled:
+        return PlainTextResponse("Metrics disabled", status_code=404)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,110 @@
+"""Admission control and load shedding middleware"""
+
+import json
+from typing import Dict, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import get_settings
+from app.middleware.metrics import route_template
+from app.utils.admission import AdmissionLane
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Lead intake must keep working while dashboards are shed
+CRITICAL_ROUTES = {
+    ("POST", "/api/leads"),
+    ("POST", "/api/leads/{lead_id}/assign"),
+}
+
+# Expensive aggregations and bulk operations, limited separately from reads
+HEAVY_ROUTES = {
+    ("GET", "/api/dashboard/metrics"),
+    ("GET", "/api/dashboard/leads-per-assignee"),
+    ("GET", "/api/audit-logs"),
+    ("POST", "/api/leads/bulk-delete"),
+}
+
+# Never queued or shed: probes, scraping, and long-lived event streams.
+# A batch is not admitted as a whole; each sub-request takes its own lane.
+EXEMPT_ROUTES = {"/health", "/metrics", "/api/events/stream", "/api/batch"}
+
+
+def route_lane(method: str, route: str) -> Optional[str]:
+    """Admission lane for a route template, or None if the route is exempt"""
+    if route in EXEMPT_ROUTES:
+        return None
+    if (method, route) in CRITICAL_ROUTES:
+        return "critical"
+    if (method, route) in HEAVY_ROUTES:
+        return "heavy"
+    return "default"
+
+
+class AdmissionControlMiddleware:
+    """Bound concurrent requests per lane and shed the excess with 503
+
+    Each lane (critical, heavy, default) has its own concurrency limit and
+    bounded FIFO wait queue, so saturated dashboards never take slots from
+    lead create/assign. A request that finds its queue full, or waits longer
+    than the lane's timeout, gets 503 with Retry-After immediately.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        settings = get_settings()
+        self.retry_after = str(settings.admission_retry_after_seconds)
+        self.lanes: Dict[str, AdmissionLane] = {
+            "critical": AdmissionLane(
+                "critical",
+                settings.admission_critical_concurrency,
+                settings.admission_critical_queue,
+                settings.admission_critical_queue_timeout_seconds
+            ),
+            "heavy": AdmissionLane(
+                "heavy",
+                settings.admission_heavy_concurrency,
+                settings.admission_heavy_queue,
+                settings.admission_queue_timeout_seconds
+            ),
+            "default": AdmissionLane(
+                "default",
+                settings.admission_default_concurrency,
+                settings.admission_default_queue,
+                settings.admission_queue_timeout_seconds
+            ),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope["admission"] = self
+        lane_name = route_lane(scope["method"], route_template(scope))
+        if lane_name is None:
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.lanes[lane_name]
+        if not await lane.acquire():
+            logger.warning("Shedding request in %s lane", lane_name, extra={"path": scope["path"]})
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is busy, please retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", self.retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
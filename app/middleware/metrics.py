@@ -0,0 +1,61 @@
+"""Request metrics middleware"""
+
+import time
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    REQUEST_UPSTREAM_CALLS,
+    UPSTREAM_SERVICES,
+    start_request_tally,
+)
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route serving a request, e.g. /api/leads/{lead_id}
+
+    Templates keep label cardinality bounded; unmatched paths share one label.
+    """
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Record latency, in-flight count, status codes and upstream calls per route"""
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+        calls = start_request_tally()
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        HTTP_IN_FLIGHT.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method, route)
+            HTTP_LATENCY.observe(method, route, value=time.perf_counter() - started)
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            for service in UPSTREAM_SERVICES:
+                REQUEST_UPSTREAM_CALLS.observe(method, route, service, value=calls.get(service, 0))
@@ -0,0 +1,82 @@
+"""Opt-in per-request profiling middleware"""
+
+from urllib.parse import parse_qs
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import get_settings
+from app.dependencies import get_current_user
+from app.utils.profiling import (
+    RequestProfile,
+    activate,
+    deactivate,
+    install_upstream_observer,
+    profile_store,
+)
+
+TRUTHY = {"1", "true", "yes"}
+
+
+def profiling_requested(scope: Scope) -> bool:
+    """X-Profile: 1 header or ?profile=1 query flag"""
+    if Headers(scope=scope).get("x-profile", "").lower() in TRUTHY:
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("profile", [""])[0].lower() in TRUTHY
+
+
+async def is_admin(scope: Scope) -> bool:
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user = await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+    except HTTPException:
+        return False
+    return user.get("role") == "admin"
+
+
+class ProfilingMiddleware:
+    """Profile single requests on demand (see app.utils.profiling)
+
+    Only added when PROFILING_ENABLED is set. A request is profiled when it
+    carries the profile flag and an admin bearer token; anyone else's flag is
+    ignored. The response gets X-Profile-Id and Server-Timing headers and the
+    profile is kept at /api/admin/profiles/{id}.
+
+    The CPU figure and stack samples cover the event loop thread, so profile
+    while the worker is otherwise quiet for a clean attribution.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.interval = get_settings().profiling_interval_seconds
+        install_upstream_observer()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not profiling_requested(scope) or not await is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        profile = RequestProfile(scope["method"], scope["path"], self.interval)
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Profile-Id"] = profile.id
+                headers["Access-Control-Expose-Headers"] = "X-Profile-Id, Server-Timing"
+                # Timing up to the response start; the stored profile also covers the body
+                profile.measure()
+                headers["Server-Timing"] = profile.server_timing()
+            await send(message)
+        
+        token = activate(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            deactivate(token)
+            profile_store.add(profile)
@@ -0,0 +1,22 @@
+"""Per-request query tracking middleware"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.utils.query_budget import track_queries
+
+
+class QueryBudgetMiddleware:
+    """Fingerprint the queries of every HTTP request (see app.utils.query_budget)
+
+    Only added when QUERY_BUDGET_MODE is warn or raise.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with track_queries(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
@@ -0,0 +1,31 @@
+"""Batch request Pydantic models"""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+
+class BatchItem(BaseModel):
+    """One sub-request of a batch"""
+    id: Optional[str] = None  # echoed back so clients can match responses
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str  # including any query string, e.g. /api/leads?limit=20
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    """Schema for POST /api/batch"""
+    requests: List[BatchItem] = Field(..., min_length=1)
+
+
+class BatchItemResponse(BaseModel):
+    """Result of one sub-request"""
+    id: Optional[str]
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any]
+
+
+class BatchResponse(BaseModel):
+    """Sub-request results, in request order"""
+    responses: List[BatchItemResponse]
@@ -1,7 +1,7 @@
 """Lead-related Pydantic models"""
 
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -37,6 +37,16 @@ class LeadAssign(BaseModel):
     comment: Optional[str] = None
 
 
+class LeadBulkDelete(BaseModel):
+    """Schema for deleting many leads at once"""
+    lead_ids: List[str] = Field(..., min_length=1, max_length=50000)
+
+
+class LeadBulkDeleteResponse(BaseModel):
+    """Schema for bulk delete result"""
+    deleted: int
+
+
 class StatusHistoryItem(BaseModel):
     """Schema for status history"""
     id: str
@@ -71,6 +81,55 @@ class LeadResponse(BaseModel):
         from_attributes = True
 
 
+class LeadSummaryResponse(BaseModel):
+    """Lightweight lead response for board views (fields=summary)"""
+    id: str
+    name: str
+    status: str
+    deadline: Optional[datetime] = None
+    sla_deadline: Optional[datetime] = None
+    assignee_id: Optional[str] = None
+    assignee_name: Optional[str] = "Unassigned"
+
+
+class LeadPartialResponse(BaseModel):
+    """Lead response carrying only the fields requested via fields=a,b,c"""
+    id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    website: Optional[str] = None
+    source: Optional[str] = None
+    status: Optional[str] = None
+    deadline: Optional[datetime] = None
+    notes: Optional[str] = None
+    sla_deadline: Optional[datetime] = None
+    custom_fields: Optional[Dict[str, Any]] = None
+    assignee_id: Optional[str] = None
+    assignee_name: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class LeadDetailResponse(LeadResponse):
-    """Extended lead response with status history"""
+    """Extended lead response with the most recent status history"""
     status_history: Optional[list[StatusHistoryItem]] = None
+    status_history_total: Optional[int] = None
+
+
+class StatusHistoryPage(BaseModel):
+    """Schema for a page of lead status history"""
+    items: list[StatusHistoryItem]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+class LeadSearchResult(LeadResponse):
+    """Lead search hit with its relevance rank"""
+    search_rank: float
+
+
+class LeadSearchPage(BaseModel):
+    """Schema for a page of lead search results"""
+    items: list[LeadSearchResult]
+    next_cursor: Optional[str] = None
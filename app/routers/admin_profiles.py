@@ -0,0 +1,37 @@
+"""Request profile routes - restricted to admins only"""
+
+from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import PlainTextResponse
+from app.dependencies import require_admin
+from app.utils.profiling import profile_store
+
+router = APIRouter(prefix="/api/admin/profiles", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+def _get_profile(profile_id: str):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile
+
+
+@router.get("")
+async def list_profiles() -> List[dict]:
+    """Most recent request profiles, newest first"""
+    return [profile.summary() for profile in profile_store.recent()]
+
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str) -> dict:
+    """Time breakdown of one profiled request: upstream calls vs Python CPU"""
+    return _get_profile(profile_id).to_dict()
+
+
+@router.get("/{profile_id}/folded", response_class=PlainTextResponse)
+async def get_profile_folded(profile_id: str):
+    """Sampled stacks in collapsed format for flamegraph.pl, speedscope or inferno"""
+    return PlainTextResponse(_get_profile(profile_id).folded())
@@ -0,0 +1,14 @@
+"""Scheduler job telemetry routes - restricted to admins only"""
+
+from typing import List
+from fastapi import APIRouter, Depends
+from app.dependencies import require_admin
+from app.services.job_telemetry import job_telemetry
+
+router = APIRouter(prefix="/api/admin/scheduler", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/jobs")
+async def get_scheduler_jobs() -> List[dict]:
+    """Background jobs with runs in progress and recent run history"""
+    return job_telemetry.snapshot()
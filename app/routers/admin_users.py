@@ -3,9 +3,14 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel, EmailStr
 from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+from app.utils.metrics import upstream_call
 from app.dependencies import get_current_user
+from app.services.user_directory import user_directory
+from app.utils.log import get_logger
 
 router = APIRouter(prefix="/api/admin/users", tags=["admin"])
+logger = get_logger(__name__)
 
 
 class AdminCreateUserRequest(BaseModel):
@@ -51,15 +56,16 @@ async def create_user(user_data: AdminCreateUserRequest, current_user: dict = De
             )
         
         # Create auth user via admin API
-        auth_response = admin_client.auth.admin.create_user({
-            "email": user_data.email,
-            "password": user_data.password,
-            "email_confirm": True,
-            "user_metadata": {
-                "name": user_data.name,
-                "created_by_admin": current_user["id"]
-            }
-        })
+        with upstream_call("gotrue", "admin.create_user"):
+            auth_response = admin_client.auth.admin.create_user({
+                "email": user_data.email,
+                "password": user_data.password,
+                "email_confirm": True,
+                "user_metadata": {
+                    "name": user_data.name,
+                    "created_by_admin": current_user["id"]
+                }
+            })
         
         if not auth_response.user:
             raise HTTPException(
@@ -71,15 +77,16 @@ async def create_user(user_data: AdminCreateUserRequest, current_user: dict = De
         auth_user_id = str(auth_user.id)
         
         # Create user profile
-        user_profile = admin_client.table("users").insert({
+        user_profile = await execute(admin_client.table("users").insert({
             "id": auth_user_id,
             "name": user_data.name,
             "email": user_data.email,
             "phone": user_data.phone,
             "role": user_data.role
-        }).execute()
+        }))
         
         profile_created = True
+        user_directory.invalidate(auth_user_id)
         
         return {
             "message": "User created successfully",
@@ -91,10 +98,11 @@ async def create_user(user_data: AdminCreateUserRequest, current_user: dict = De
         if auth_user_id:
             try:
                 if profile_created:
-                    admin_client.table("users").delete().eq("id", auth_user_id).execute()
-                admin_client.auth.admin.delete_user(auth_user_id)
+                    await execute(admin_client.table("users").delete().eq("id", auth_user_id))
+                with upstream_call("gotrue", "admin.delete_user"):
+                    admin_client.auth.admin.delete_user(auth_user_id)
             except Exception as cleanup_err:
-                print(f"Cleanup failed: {cleanup_err}")
+                logger.error("Cleanup failed: %s", cleanup_err)
         
         if isinstance(e, HTTPException):
             raise e
@@ -138,7 +146,7 @@ async def update_user(
             )
         
         # Update user profile
-        result = admin_client.table("users").update(update_payload).eq("id", user_id).execute()
+        result = await execute(admin_client.table("users").update(update_payload).eq("id", user_id))
         
         if not result.data:
             raise HTTPException(
@@ -146,6 +154,8 @@ async def update_user(
                 detail="User not found"
             )
         
+        user_directory.invalidate(user_id)
+        
         return {
             "message": "User updated successfully",
             "user": result.data[0]
@@ -174,10 +184,12 @@ async def delete_user(user_id: str, current_user: dict = Depends(require_admin))
             )
         
         # Delete from users table
-        admin_client.table("users").delete().eq("id", user_id).execute()
+        await execute(admin_client.table("users").delete().eq("id", user_id))
         
         # Delete auth user
-        admin_client.auth.admin.delete_user(user_id)
+        with upstream_call("gotrue", "admin.delete_user"):
+            admin_client.auth.admin.delete_user(user_id)
+        user_directory.invalidate(user_id)
         
         return {"message": "User deleted successfully"}
     
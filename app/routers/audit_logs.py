@@ -1,11 +1,14 @@
 """Audit logs routes"""
 
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, status, Query, Depends
 from typing import List, Optional
 from app.services.audit_service import AuditService
+from app.utils.serialization import json_response, AUDIT_LOG_LIST_ADAPTER
+from app.config import get_settings
+from app.container import get_audit_service
 
 router = APIRouter(prefix="/api/audit-logs", tags=["audit"])
-audit_service = AuditService()
+settings = get_settings()
 
 
 @router.get("")
@@ -14,17 +17,21 @@ async def get_audit_logs(
     lead_id: Optional[str] = Query(None),
     user_id: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=200)
+    limit: int = Query(50, ge=1, le=200),
+    audit_service: AuditService = Depends(get_audit_service)
 ):
     """Get audit logs with optional filters (admin only)"""
     try:
-        return await audit_service.get_audit_logs(
+        logs = await audit_service.get_audit_logs(
             action_type=action_type,
             lead_id=lead_id,
             user_id=user_id,
             skip=skip,
             limit=limit
         )
+        if settings.fast_json_responses:
+            return json_response(AUDIT_LOG_LIST_ADAPTER, logs)
+        return logs
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
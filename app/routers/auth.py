@@ -1,11 +1,19 @@
 """Authentication routes - Supabase Auth based"""
 
-from fastapi import APIRouter, HTTPException, status, Depends
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Response
 from app.models.user import UserLoginRequest, UserRegisterRequest
 from app.utils.supabase_client import get_supabase_client, get_supabase_anon_client
+from app.utils.resilience import execute
+from app.utils.metrics import upstream_call
 from app.dependencies import get_current_user
+from app.services.user_directory import user_directory
+from app.utils.etag import content_etag, etag_matches, not_modified, set_etag, weak_etag
+from app.utils.log import get_logger
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
+logger = get_logger(__name__)
 
 
 @router.post("/register")
@@ -31,14 +39,15 @@ async def register_assignee(user_data: UserRegisterRequest):
         assigned_role = "assignee"
         
         # Create user via admin API (auto-confirms email)
-        auth_response = admin_client.auth.admin.create_user({
-            "email": user_data.email,
-            "password": user_data.password,
-            "email_confirm": True,
-            "user_metadata": {
-                "name": user_data.name
-            }
-        })
+        with upstream_call("gotrue", "admin.create_user"):
+            auth_response = admin_client.auth.admin.create_user({
+                "email": user_data.email,
+                "password": user_data.password,
+                "email_confirm": True,
+                "user_metadata": {
+                    "name": user_data.name
+                }
+            })
         
         if not auth_response.user:
             raise HTTPException(
@@ -50,21 +59,23 @@ async def register_assignee(user_data: UserRegisterRequest):
         auth_user_id = str(auth_user.id)
         
         # Create profile in users table with default assignee role
-        user_profile = admin_client.table("users").insert({
+        user_profile = await execute(admin_client.table("users").insert({
             "id": auth_user_id,
             "name": user_data.name,
             "email": user_data.email,
             "role": assigned_role
-        }).execute()
+        }))
         
         profile_created = True
+        user_directory.invalidate(auth_user_id)
         
         # Sign in with anon client to get tokens
         anon_client = get_supabase_anon_client()
-        login_response = anon_client.auth.sign_in_with_password({
-            "email": user_data.email,
-            "password": user_data.password
-        })
+        with upstream_call("gotrue", "sign_in_with_password"):
+            login_response = anon_client.auth.sign_in_with_password({
+                "email": user_data.email,
+                "password": user_data.password
+            })
         
         return {
             "message": "Account created successfully",
@@ -80,10 +91,11 @@ async def register_assignee(user_data: UserRegisterRequest):
             try:
                 admin_client = get_supabase_client()
                 if profile_created:
-                    admin_client.table("users").delete().eq("id", auth_user_id).execute()
-                admin_client.auth.admin.delete_user(auth_user_id)
+                    await execute(admin_client.table("users").delete().eq("id", auth_user_id))
+                with upstream_call("gotrue", "admin.delete_user"):
+                    admin_client.auth.admin.delete_user(auth_user_id)
             except Exception as cleanup_err:
-                print(f"Cleanup failed for user {auth_user_id}: {cleanup_err}")
+                logger.error("Cleanup failed for user %s: %s", auth_user_id, cleanup_err)
 
         if isinstance(e, HTTPException):
             raise e
@@ -107,10 +119,11 @@ async def login(credentials: UserLoginRequest):
         # Anon client for sign_in_with_password
         anon_client = get_supabase_anon_client()
         
-        auth_response = anon_client.auth.sign_in_with_password({
-            "email": credentials.email,
-            "password": credentials.password
-        })
+        with upstream_call("gotrue", "sign_in_with_password"):
+            auth_response = anon_client.auth.sign_in_with_password({
+                "email": credentials.email,
+                "password": credentials.password
+            })
         
         if not auth_response.user or not auth_response.session:
             raise HTTPException(
@@ -120,9 +133,9 @@ async def login(credentials: UserLoginRequest):
         
         # Get user profile with service role client (bypasses RLS)
         admin_client = get_supabase_client()
-        user_profile = admin_client.table("users").select("*").eq(
+        user_profile = await execute(admin_client.table("users").select("*").eq(
             "id", str(auth_response.user.id)
-        ).execute()
+        ))
         
         user_data = user_profile.data[0] if user_profile.data else {
             "id": str(auth_response.user.id),
@@ -148,19 +161,31 @@ async def login(credentials: UserLoginRequest):
 
 
 @router.get("/me")
-async def get_me(current_user: dict = Depends(get_current_user)):
-    """Get current user profile"""
+async def get_me(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get current user profile; 304 when If-None-Match is still current"""
     try:
         client = get_supabase_client()
-        response = client.table("users").select("*").eq("id", current_user["id"]).execute()
+        result = await execute(client.table("users").select("*").eq("id", current_user["id"]))
         
-        if not response.data:
+        if not result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User profile not found"
             )
         
-        return response.data[0]
+        profile = result.data[0]
+        if profile.get("updated_at"):
+            etag = weak_etag(profile["updated_at"])
+        else:
+            etag = content_etag(json.dumps(profile, sort_keys=True, default=str).encode())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        return profile
     
     except HTTPException:
         raise
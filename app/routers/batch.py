@@ -0,0 +1,153 @@
+"""Batch route - several API calls in one round trip"""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from app.models.batch import BatchItem, BatchRequest, BatchResponse
+from app.dependencies import get_current_user, batch_user
+from app.config import get_settings
+from app.middleware.admission import route_lane
+from app.middleware.metrics import route_template
+from app.utils.query_budget import track_queries
+from app.utils.log import get_logger
+
+router = APIRouter(prefix="/api/batch", tags=["batch"])
+settings = get_settings()
+logger = get_logger(__name__)
+
+# Recursion and long-lived streams cannot be answered inside a batch
+FORBIDDEN_PATHS = {"/api/batch", "/api/events/stream"}
+
+# The batch's own credentials always win; framing headers are rebuilt
+DROPPED_HEADERS = {"authorization", "cookie", "host", "content-length", "content-type"}
+
+# Connection-level scope keys shared by every sub-request
+INHERITED_SCOPE_KEYS = (
+    "asgi", "http_version", "scheme", "server", "client", "root_path", "app",
+    "starlette.exception_handlers",
+)
+
+
+def _result(item: BatchItem, status_code: int, headers: Dict[str, str], body: Any) -> dict:
+    return {"id": item.id, "status": status_code, "headers": headers, "body": body}
+
+
+def _decode_body(headers: Dict[str, str], raw: bytes) -> Any:
+    if not raw:
+        return None
+    if headers.get("content-type", "").startswith("application/json"):
+        return json.loads(raw)
+    return raw.decode("utf-8", errors="replace")
+
+
+async def dispatch(request: Request, item: BatchItem) -> dict:
+    """Run one sub-request through the app's routes, in-process
+
+    Goes straight to the router: the batch request already passed through
+    the middleware stack, and its authenticated user is reused via batch_user.
+    Each sub-request is still admitted through its route's admission lane.
+    """
+    path, _, query = item.path.partition("?")
+    if not path.startswith("/api/") or path.rstrip("/") in FORBIDDEN_PATHS:
+        return _result(item, status.HTTP_400_BAD_REQUEST, {}, {"detail": f"Path not allowed in a batch: {path}"})
+
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+    headers = [(name.lower().encode(), value.encode()) for name, value in item.headers.items()
+               if name.lower() not in DROPPED_HEADERS]
+    if "authorization" in request.headers:
+        headers.append((b"authorization", request.headers["authorization"].encode()))
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    scope = {key: request.scope[key] for key in INHERITED_SCOPE_KEYS if key in request.scope}
+    scope.update({
+        "type": "http",
+        "method": item.method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(request.scope.get("state") or {}),
+    })
+
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        return {"type": "http.disconnect"}
+
+    response: Dict[str, Any] = {"status": 500, "headers": {}, "body": []}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in message.get("headers", [])
+                if name.lower() != b"content-length"
+            }
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    admission = request.scope.get("admission")
+    lane_name = route_lane(item.method, route_template(scope)) if admission is not None else None
+    lane = admission.lanes[lane_name] if lane_name is not None else None
+    if lane is not None and not await lane.acquire():
+        logger.warning("Shedding batch sub-request in %s lane", lane_name, extra={"path": path})
+        return _result(
+            item,
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            {"retry-after": admission.retry_after},
+            {"detail": "Server is busy, please retry shortly"}
+        )
+
+    try:
+        with track_queries(f"{item.method} {path}"):
+            await request.app.router(scope, receive, send)
+    except StarletteHTTPException as e:
+        # Raised by the router itself for unknown paths and methods
+        return _result(item, e.status_code, {}, {"detail": e.detail})
+    except Exception:
+        logger.exception("Batch sub-request failed", extra={"method": item.method, "path": path})
+        return _result(item, status.HTTP_500_INTERNAL_SERVER_ERROR, {}, {"detail": "Internal Server Error"})
+    finally:
+        if lane is not None:
+            lane.release()
+
+    raw = b"".join(response["body"])
+    return _result(item, response["status"], response["headers"], _decode_body(response["headers"], raw))
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(
+    payload: BatchRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """Run several API calls concurrently with a single authentication
+
+    Each sub-request gets its own status, headers and body, in request
+    order; a failing sub-request does not fail the batch.
+    """
+    if len(payload.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_max_requests} requests per batch"
+        )
+
+    limiter = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def run(item: BatchItem) -> dict:
+        async with limiter:
+            return await dispatch(request, item)
+
+    # Set before the sub-request tasks are created so each inherits it
+    token = batch_user.set(current_user)
+    try:
+        results: List[dict] = await asyncio.gather(*(run(item) for item in payload.requests))
+    finally:
+        batch_user.reset(token)
+    return {"responses": results}
@@ -1,10 +1,13 @@
 """Custom fields service and router"""
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
 from app.dependencies import get_current_user, require_sdr
+from app.services.custom_field_service import custom_field_service, FIELD_TYPES
+from app.utils.etag import etag_matches, not_modified, set_etag
 
 router = APIRouter(prefix="/api/custom-fields", tags=["custom-fields"])
 
@@ -26,12 +29,19 @@ class CustomFieldResponse(BaseModel):
 
 
 @router.get("", response_model=List[CustomFieldResponse])
-async def list_custom_fields(current_user: dict = Depends(get_current_user)):
-    """List all active custom fields"""
+async def list_custom_fields(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """List all active custom fields; 304 when If-None-Match is still current"""
     try:
-        client = get_supabase_client()
-        response = client.table("custom_fields").select("*").eq("is_active", True).execute()
-        return response.data or []
+        fields = await custom_field_service.get_active_fields()
+        etag = await custom_field_service.get_etag()
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        return fields
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -49,11 +59,10 @@ async def create_custom_field(
         client = get_supabase_client()
         
         # Validate field_type
-        valid_types = ["text", "number", "date", "select", "checkbox"]
-        if field_data.field_type not in valid_types:
+        if field_data.field_type not in FIELD_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid field_type. Must be one of: {', '.join(valid_types)}"
+                detail=f"Invalid field_type. Must be one of: {', '.join(FIELD_TYPES)}"
             )
         
         # For select type, options is required
@@ -63,16 +72,17 @@ async def create_custom_field(
                 detail="options required for select field_type"
             )
         
-        response = client.table("custom_fields").insert({
+        response = await execute(client.table("custom_fields").insert({
             "name": field_data.name,
             "field_type": field_data.field_type,
             "is_active": field_data.is_active,
             "options": field_data.options
-        }).execute()
+        }))
         
         if not response.data:
             raise ValueError("Failed to create custom field")
         
+        custom_field_service.invalidate()
         return response.data[0]
     
     except Exception as e:
@@ -94,12 +104,24 @@ async def update_custom_field(
     try:
         client = get_supabase_client()
         
-        response = client.table("custom_fields").update({
+        if field_data.field_type not in FIELD_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid field_type. Must be one of: {', '.join(FIELD_TYPES)}"
+            )
+        
+        if field_data.field_type == "select" and not field_data.options:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="options required for select field_type"
+            )
+        
+        response = await execute(client.table("custom_fields").update({
             "name": field_data.name,
             "field_type": field_data.field_type,
             "is_active": field_data.is_active,
             "options": field_data.options
-        }).eq("id", field_id).execute()
+        }).eq("id", field_id))
         
         if not response.data:
             raise HTTPException(
@@ -107,6 +129,7 @@ async def update_custom_field(
                 detail="Custom field not found"
             )
         
+        custom_field_service.invalidate()
         return response.data[0]
     
     except Exception as e:
@@ -127,9 +150,9 @@ async def delete_custom_field(
     try:
         client = get_supabase_client()
         
-        response = client.table("custom_fields").update({
+        response = await execute(client.table("custom_fields").update({
             "is_active": False
-        }).eq("id", field_id).execute()
+        }).eq("id", field_id))
         
         if not response.data:
             raise HTTPException(
@@ -137,6 +160,7 @@ async def delete_custom_field(
                 detail="Custom field not found"
             )
         
+        custom_field_service.invalidate()
         return {"message": "Custom field deleted successfully"}
     
     except Exception as e:
@@ -1,16 +1,18 @@
 """Dashboard and metrics routes"""
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Depends
 from app.models.dashboard import MetricsResponse, LeadsPerAssigneeResponse
 from app.services.dashboard_service import DashboardService
+from app.services.loaders import Loaders
+from app.dependencies import get_loaders
+from app.container import get_dashboard_service
 from typing import List
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
-dashboard_service = DashboardService()
 
 
 @router.get("/metrics", response_model=MetricsResponse)
-async def get_metrics():
+async def get_metrics(dashboard_service: DashboardService = Depends(get_dashboard_service)):
     """Get dashboard metrics"""
     try:
         return await dashboard_service.get_metrics()
@@ -22,10 +24,13 @@ async def get_metrics():
 
 
 @router.get("/leads-per-assignee", response_model=List[LeadsPerAssigneeResponse])
-async def get_leads_per_assignee():
+async def get_leads_per_assignee(
+    loaders: Loaders = Depends(get_loaders),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
     """Get leads grouped by assignee"""
     try:
-        return await dashboard_service.get_leads_per_assignee()
+        return await dashboard_service.get_leads_per_assignee(loaders=loaders)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,57 @@
+"""Real-time lead event stream routes"""
+
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from typing import Optional
+from app.config import get_settings
+from app.dependencies import get_current_user, security
+from app.services.event_bus import event_bus
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+settings = get_settings()
+
+
+async def get_stream_user(
+    access_token: Optional[str] = Query(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> dict:
+    """Authenticate via bearer header, or ?access_token= for browser EventSource clients"""
+    if credentials is None and access_token:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+    return await get_current_user(credentials)
+
+
+@router.get("/stream")
+async def stream_events(request: Request, current_user: dict = Depends(get_stream_user)):
+    """Server-Sent Events stream of lead created/updated/assigned/deleted and SLA breach events
+
+    Assignees only receive events for their own leads. Event payloads carry
+    ids and status only; clients refetch the lead when they need details.
+    """
+    async def event_source():
+        subscription = event_bus.subscribe(current_user)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(),
+                        timeout=settings.event_stream_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,40 +1,209 @@
 """Lead management routes"""
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+import re
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Response
 from starlette import status as http_status
-from typing import List, Optional
-from datetime import datetime
-from app.models.lead import LeadCreate, LeadUpdate, LeadAssign, LeadResponse, LeadDetailResponse
-from app.utils.supabase_client import get_supabase_client
-from app.services.lead_service import LeadService
+from typing import List, Optional, Union
+from app.models.lead import (
+    LeadCreate,
+    LeadUpdate,
+    LeadAssign,
+    LeadResponse,
+    LeadSummaryResponse,
+    LeadPartialResponse,
+    LeadDetailResponse,
+    LeadBulkDelete,
+    LeadBulkDeleteResponse,
+    LeadSearchPage,
+    StatusHistoryPage,
+)
+from app.services.lead_service import (
+    LeadService,
+    DEFAULT_HISTORY_LIMIT,
+    resolve_lead_fields,
+    LeadNotFoundError,
+    LeadAccessDeniedError,
+    LeadPreconditionFailedError,
+)
 from app.services.email_service import EmailService
-from app.dependencies import get_current_user, require_sdr
+from app.container import get_lead_service, get_email_service
+from app.services.custom_field_service import custom_field_service
+from app.dependencies import get_current_user, require_sdr, get_loaders
+from app.services.loaders import Loaders
+from app.utils.query_budget import query_budget
+from app.utils.etag import conditional_response, etag_matches, not_modified, set_etag, weak_etag
+from app.utils.serialization import (
+    json_response,
+    fields_response,
+    LEAD_LIST_ADAPTER,
+    LEAD_SUMMARY_LIST_ADAPTER,
+    LEAD_PARTIAL_LIST_ADAPTER,
+)
 
 router = APIRouter(prefix="/api/leads", tags=["leads"])
-lead_service = LeadService()
-email_service = EmailService()
 
 
-@router.get("", response_model=List[LeadResponse])
+# ":<history>:<history_limit>" suffix of lead detail ETags
+DETAIL_VARIANT = re.compile(r":(recent|none):\d+$")
+
+
+def lead_etag(updated_at: str, history: str, history_limit: int) -> str:
+    """Weak ETag of a lead detail response; the history options select the variant"""
+    return weak_etag(f"{updated_at}:{history}:{history_limit}")
+
+
+def parse_if_match(value: str) -> Optional[str]:
+    """Extract the updated_at version from an If-Match header value (a detail ETag or bare updated_at)"""
+    value = value.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    return DETAIL_VARIANT.sub("", value.strip('"'))
+
+
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {
+        "model": Union[List[LeadResponse], List[LeadSummaryResponse], List[LeadPartialResponse]],
+        "description": "Full leads by default, LeadSummaryResponse items for fields=summary, "
+                       "or LeadPartialResponse items carrying only the requested fields",
+    }},
+    dependencies=[Depends(query_budget(4))]
+)
 async def list_leads(
     source: Optional[str] = Query(None),
     lead_status: Optional[str] = Query(None, alias="status"),
     assignee_id: Optional[str] = Query(None),
     sla_status: Optional[str] = Query(None),
+    cf: Optional[List[str]] = Query(None, description="Custom field filter as name:op:value, repeatable"),
+    fields: Optional[str] = Query(None, description="summary, full, or a comma separated list of lead fields"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    current_user: dict = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders),
+    lead_service: LeadService = Depends(get_lead_service)
 ):
-    """List all leads with optional filters"""
+    """List all leads with optional filters
+
+    Custom field filters: `cf=industry:eq:fintech`, `cf=budget:gt:50000`,
+    `cf=industry:in:fintech,retail`. Use `fields=summary` for board views.
+    Responses carry a content ETag; polls with If-None-Match get 304.
+    """
+    try:
+        validator = await custom_field_service.get_validator()
+        custom_filters = validator.parse_filters(cf)
+        response_fields = resolve_lead_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
     try:
-        return await lead_service.list_leads(
+        leads = await lead_service.list_leads(
             source=source,
             status=lead_status,
             assignee_id=assignee_id,
             sla_status=sla_status,
+            custom_filters=custom_filters,
+            fields=response_fields,
             skip=skip,
-            limit=limit
+            limit=limit,
+            loaders=loaders
+        )
+        # Always encoded up front (byte-identical to the default path) so the
+        # body can be hashed into an ETag
+        if fields == "summary":
+            response = fields_response(LEAD_SUMMARY_LIST_ADAPTER, leads, response_fields)
+        elif fields and fields != "full":
+            response = fields_response(LEAD_PARTIAL_LIST_ADAPTER, leads, response_fields)
+        else:
+            response = json_response(LEAD_LIST_ADAPTER, leads)
+        return conditional_response(response, if_none_match)
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.get("/search", response_model=LeadSearchPage, dependencies=[Depends(query_budget(4))])
+async def search_leads(
+    q: str = Query(..., min_length=1, max_length=200),
+    source: Optional[str] = Query(None),
+    lead_status: Optional[str] = Query(None, alias="status"),
+    assignee_id: Optional[str] = Query(None),
+    sla_status: Optional[str] = Query(None),
+    cf: Optional[List[str]] = Query(None, description="Custom field filter as name:op:value, repeatable"),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders),
+    lead_service: LeadService = Depends(get_lead_service)
+):
+    """Ranked full-text search over lead name, email, website and notes"""
+    try:
+        validator = await custom_field_service.get_validator()
+        return await lead_service.search_leads(
+            q,
+            source=source,
+            status=lead_status,
+            assignee_id=assignee_id,
+            sla_status=sla_status,
+            custom_filters=validator.parse_filters(cf),
+            cursor=cursor,
+            limit=limit,
+            loaders=loaders
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.get("/{lead_id}", response_model=LeadDetailResponse, dependencies=[Depends(query_budget(4))])
+async def get_lead(
+    lead_id: str,
+    response: Response,
+    history: str = Query("recent", pattern="^(recent|none)$"),
+    history_limit: int = Query(DEFAULT_HISTORY_LIMIT, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders),
+    lead_service: LeadService = Depends(get_lead_service)
+):
+    """Get lead details by ID with the most recent status history
+
+    The ETag is W/"<updated_at>:<history>:<history_limit>" (every history
+    entry comes with a lead write, and each history option is its own
+    variant). With a matching If-None-Match only updated_at is looked up and
+    304 is returned; the same value works as If-Match for PATCH.
+    """
+    try:
+        if if_none_match:
+            version = await lead_service.get_lead_version(lead_id)
+            if version is not None:
+                etag = lead_etag(version, history, history_limit)
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+
+        lead = await lead_service.get_lead_details(
+            lead_id,
+            history=history,
+            history_limit=history_limit,
+            loaders=loaders
         )
+        set_etag(response, lead_etag(lead["updated_at"], history, history_limit))
+        return lead
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -42,11 +211,22 @@ async def list_leads(
         )
 
 
-@router.get("/{lead_id}", response_model=LeadDetailResponse)
-async def get_lead(lead_id: str, current_user: dict = Depends(get_current_user)):
-    """Get lead details by ID"""
+@router.get("/{lead_id}/history", response_model=StatusHistoryPage, dependencies=[Depends(query_budget(2))])
+async def get_lead_history(
+    lead_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_HISTORY_LIMIT, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    lead_service: LeadService = Depends(get_lead_service)
+):
+    """Page through a lead's status history, newest first"""
     try:
-        return await lead_service.get_lead_details(lead_id)
+        return await lead_service.get_lead_history(lead_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -55,7 +235,11 @@ async def get_lead(lead_id: str, current_user: dict = Depends(get_current_user))
 
 
 @router.post("", response_model=LeadResponse)
-async def create_lead(lead_data: LeadCreate, current_user: dict = Depends(require_sdr)):
+async def create_lead(
+    lead_data: LeadCreate,
+    current_user: dict = Depends(require_sdr),
+    lead_service: LeadService = Depends(get_lead_service)
+):
     """Create a new lead"""
     try:
         return await lead_service.create_lead(lead_data, current_user["id"])
@@ -67,21 +251,47 @@ async def create_lead(lead_data: LeadCreate, current_user: dict = Depends(requir
 
 
 @router.patch("/{lead_id}", response_model=LeadResponse)
-async def update_lead(lead_id: str, lead_data: LeadUpdate, current_user: dict = Depends(get_current_user)):
-    """Update lead by ID - SDR/Admin can update all, assignees can update own leads"""
+async def update_lead(
+    lead_id: str,
+    lead_data: LeadUpdate,
+    updated_at: Optional[str] = Query(None),
+    if_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    lead_service: LeadService = Depends(get_lead_service)
+):
+    """Update lead by ID - SDR/Admin can update all, assignees can update own leads
+
+    Send the lead's ETag or last seen updated_at as If-Match (or
+    ?updated_at=) to get a 412 instead of silently overwriting a concurrent
+    edit.
+    """
     try:
-        # If assignee, check if they own this lead
-        if current_user.get("role") == "assignee":
-            lead = await lead_service.get_lead_details(lead_id)
-            if lead.get("assignee_id") != current_user["id"]:
-                raise HTTPException(
-                    status_code=http_status.HTTP_403_FORBIDDEN,
-                    detail="Cannot update leads assigned to others"
-                )
+        # Assignees may only touch their own leads; enforced inside the update
+        owner_id = current_user["id"] if current_user.get("role") == "assignee" else None
+        expected_updated_at = parse_if_match(if_match) if if_match else updated_at
         
-        return await lead_service.update_lead(lead_id, lead_data, current_user["id"])
-    except HTTPException:
-        raise
+        return await lead_service.update_lead(
+            lead_id,
+            lead_data,
+            current_user["id"],
+            owner_id=owner_id,
+            expected_updated_at=expected_updated_at
+        )
+    except LeadNotFoundError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except LeadAccessDeniedError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_403_FORBIDDEN,
+            detail=str(e)
+        )
+    except LeadPreconditionFailedError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_400_BAD_REQUEST,
@@ -90,7 +300,14 @@ async def update_lead(lead_id: str, lead_data: LeadUpdate, current_user: dict =
 
 
 @router.post("/{lead_id}/assign", response_model=LeadResponse)
-async def assign_lead(lead_id: str, assignment: LeadAssign, current_user: dict = Depends(require_sdr)):
+async def assign_lead(
+    lead_id: str,
+    assignment: LeadAssign,
+    current_user: dict = Depends(require_sdr),
+    loaders: Loaders = Depends(get_loaders),
+    lead_service: LeadService = Depends(get_lead_service),
+    email_service: EmailService = Depends(get_email_service)
+):
     """Assign lead to a user"""
     try:
         lead = await lead_service.assign_lead(
@@ -102,7 +319,7 @@ async def assign_lead(lead_id: str, assignment: LeadAssign, current_user: dict =
         
         # Send assignment email (non-blocking, don't fail the request)
         try:
-            await email_service.send_assignment_email(lead, assignment.assignee_id)
+            await email_service.send_assignment_email(lead, assignment.assignee_id, loaders=loaders)
         except Exception:
             pass  # Email failure shouldn't block assignment
         
@@ -115,16 +332,22 @@ async def assign_lead(lead_id: str, assignment: LeadAssign, current_user: dict =
 
 
 @router.post("/{lead_id}/resend-email")
-async def resend_notification_email(lead_id: str, current_user: dict = Depends(require_sdr)):
+async def resend_notification_email(
+    lead_id: str,
+    current_user: dict = Depends(require_sdr),
+    loaders: Loaders = Depends(get_loaders),
+    lead_service: LeadService = Depends(get_lead_service),
+    email_service: EmailService = Depends(get_email_service)
+):
     """Resend notification email for a lead"""
     try:
-        lead = await lead_service.get_lead_details(lead_id)
+        lead = await lead_service.get_lead_details(lead_id, history="none", loaders=loaders)
         if not lead.get("assignee_id"):
             raise HTTPException(
                 status_code=http_status.HTTP_400_BAD_REQUEST,
                 detail="Lead has no assignee"
             )
-        await email_service.send_assignment_email(lead, lead["assignee_id"])
+        await email_service.send_assignment_email(lead, lead["assignee_id"], loaders=loaders)
         return {"message": "Email resent successfully"}
     except HTTPException:
         raise
@@ -133,20 +356,41 @@ async def resend_notification_email(lead_id: str, current_user: dict = Depends(r
             status_code=http_status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+@router.post("/bulk-delete", response_model=LeadBulkDeleteResponse)
+async def bulk_delete_leads(
+    payload: LeadBulkDelete,
+    current_user: dict = Depends(require_sdr),
+    lead_service: LeadService = Depends(get_lead_service)
+):
+    """Delete many leads by ID, e.g. for clean-up jobs"""
+    try:
+        deleted = await lead_service.delete_leads(payload.lead_ids)
+        return {"deleted": deleted}
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
 @router.delete("/{lead_id}")
-async def delete_lead(lead_id: str, current_user: dict = Depends(require_sdr)):
+async def delete_lead(
+    lead_id: str,
+    current_user: dict = Depends(require_sdr),
+    lead_service: LeadService = Depends(get_lead_service)
+):
     """Delete lead by ID"""
     try:
-        client = get_supabase_client()
-        # Delete related records first (since no CASCADE in schema)
-        client.table("status_history").delete().eq("lead_id", lead_id).execute()
-        client.table("notifications").delete().eq("lead_id", lead_id).execute()
-        
-        # Now delete the lead
-        client.table("leads").delete().eq("id", lead_id).execute()
-        return {"message": "Lead deleted successfully"}
+        deleted = await lead_service.delete_lead(lead_id)
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+    
+    if not deleted:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail="Lead not found"
+        )
+    return {"message": "Lead deleted successfully"}
@@ -1,21 +1,25 @@
 """User management routes"""
 
 import uuid
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Header
+from typing import List, Optional
 from app.models.user import UserCreate, UserUpdate, UserResponse
 from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+from app.utils.serialization import json_response, USER_LIST_ADAPTER
+from app.utils.etag import conditional_response
+from app.services.user_directory import user_directory
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 
 @router.get("", response_model=List[UserResponse])
-async def list_users():
-    """List all users (admin only)"""
+async def list_users(if_none_match: Optional[str] = Header(None)):
+    """List all users (admin only); 304 when If-None-Match matches the content ETag"""
     try:
         client = get_supabase_client()
-        response = client.table("users").select("*").execute()
-        return response.data
+        response = await execute(client.table("users").select("*"))
+        return conditional_response(json_response(USER_LIST_ADAPTER, response.data), if_none_match)
     
     except Exception as e:
         raise HTTPException(
@@ -29,7 +33,7 @@ async def get_user(user_id: str):
     """Get user by ID"""
     try:
         client = get_supabase_client()
-        response = client.table("users").select("*").eq("id", user_id).execute()
+        response = await execute(client.table("users").select("*").eq("id", user_id))
         
         if not response.data:
             raise HTTPException(
@@ -52,13 +56,13 @@ async def create_user(user_data: UserCreate):
     try:
         client = get_supabase_client()
         
-        response = client.table("users").insert({
+        response = await execute(client.table("users").insert({
             "id": str(uuid.uuid4()),
             "name": user_data.name,
             "email": user_data.email,
             "phone": user_data.phone,
             "role": user_data.role
-        }).execute()
+        }))
         
         if not response.data:
             raise HTTPException(
@@ -66,6 +70,7 @@ async def create_user(user_data: UserCreate):
                 detail="Failed to create user"
             )
         
+        user_directory.invalidate(response.data[0]["id"])
         return response.data[0]
     
     except Exception as e:
@@ -88,7 +93,7 @@ async def update_user(user_id: str, user_data: UserUpdate):
                 detail="No fields to update"
             )
         
-        response = client.table("users").update(update_dict).eq("id", user_id).execute()
+        response = await execute(client.table("users").update(update_dict).eq("id", user_id))
         
         if not response.data:
             raise HTTPException(
@@ -96,6 +101,7 @@ async def update_user(user_id: str, user_data: UserUpdate):
                 detail="User not found"
             )
         
+        user_directory.invalidate(user_id)
         return response.data[0]
     
     except Exception as e:
@@ -110,7 +116,8 @@ async def delete_user(user_id: str):
     """Delete user by ID (admin only)"""
     try:
         client = get_supabase_client()
-        response = client.table("users").delete().eq("id", user_id).execute()
+        response = await execute(client.table("users").delete().eq("id", user_id))
+        user_directory.invalidate(user_id)
         return {"message": "User deleted successfully"}
     
     except Exception as e:
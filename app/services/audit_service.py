@@ -1,6 +1,8 @@
 """Audit service - handles audit log operations"""
 
 from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+from app.utils.read_replica import read_router
 from typing import Optional, List, Dict, Any
 
 class AuditService:
@@ -18,16 +20,17 @@ class AuditService:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get audit logs with filters"""
-        query = self.client.table("status_history").select("*")
+        def build(client):
+            query = client.table("status_history").select("*")
+            if action_type:
+                query = query.eq("action_type", action_type)
+            if lead_id:
+                query = query.eq("lead_id", lead_id)
+            if user_id:
+                query = query.eq("updated_by", user_id)
+            return query.order("updated_at", desc=True).range(skip, skip + limit - 1)
         
-        if action_type:
-            query = query.eq("action_type", action_type)
-        if lead_id:
-            query = query.eq("lead_id", lead_id)
-        if user_id:
-            query = query.eq("updated_by", user_id)
-        
-        response = query.order("updated_at", desc=True).range(skip, skip + limit - 1).execute()
+        response = await read_router.execute(build)
         
         return response.data if response.data else []
     
@@ -39,9 +42,10 @@ class AuditService:
         metadata: Optional[Dict[str, Any]] = None
     ):
         """Log an action to audit trail"""
-        self.client.table("status_history").insert({
+        await execute(self.client.table("status_history").insert({
             "lead_id": lead_id,
             "action_type": action_type,
             "updated_by": user_id,
             "metadata": metadata or {}
-        }).execute()
+        }))
+        read_router.mark_write(user_id)
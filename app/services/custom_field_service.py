@@ -0,0 +1,260 @@
+"""Custom field service - cached field definitions and lead custom_fields validation"""
+
+import json
+import math
+import re
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+from app.config import get_settings
+from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+from app.utils.etag import content_etag
+
+settings = get_settings()
+
+FIELD_TYPES = ["text", "number", "date", "select", "checkbox"]
+
+# Filter operators accepted per field type by GET /api/leads?cf=name:op:value
+FILTER_OPERATORS = {
+    "text": {"eq", "in"},
+    "number": {"eq", "gt", "gte", "lt", "lte"},
+    "date": {"eq", "gt", "gte", "lt", "lte"},
+    "select": {"eq", "in"},
+    "checkbox": {"eq"},
+}
+
+# Field names that can be used as a PostgREST JSON path without quoting
+FILTERABLE_NAME = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+class CustomFieldFilter(NamedTuple):
+    """A typed filter on one custom field value"""
+    name: str
+    field_type: str
+    op: str
+    value: Any
+
+
+def _coerce_text(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError("expected text")
+    return value
+
+
+def _coerce_number(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError("expected a number")
+        value = int(number) if number.is_integer() and "." not in value else number
+    if not isinstance(value, (int, float)):
+        raise ValueError("expected a number")
+    # nan/inf would break the numeric comparisons in custom field filters
+    if not math.isfinite(value):
+        raise ValueError("expected a finite number")
+    return value
+
+
+def _coerce_date(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str):
+        try:
+            if len(value) == 10:
+                return date.fromisoformat(value).isoformat()
+            return datetime.fromisoformat(value).isoformat()
+        except ValueError:
+            pass
+    raise ValueError("expected an ISO date")
+
+
+def _coerce_checkbox(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise ValueError("expected true or false")
+
+
+def _select_coercer(options: List[str]) -> Callable[[Any], str]:
+    allowed = frozenset(options)
+    
+    def coerce(value: Any) -> str:
+        if value not in allowed:
+            raise ValueError(f"expected one of: {', '.join(options)}")
+        return value
+    
+    return coerce
+
+
+def build_coercer(definition: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Build the coercion function for a single custom field definition"""
+    field_type = definition.get("field_type")
+    if field_type == "text":
+        return _coerce_text
+    if field_type == "number":
+        return _coerce_number
+    if field_type == "date":
+        return _coerce_date
+    if field_type == "checkbox":
+        return _coerce_checkbox
+    if field_type == "select":
+        return _select_coercer(definition.get("options") or [])
+    raise ValueError(f"Unknown field_type '{field_type}' for custom field '{definition.get('name')}'")
+
+
+class CustomFieldValidator:
+    """Validator compiled once from a set of active custom field definitions
+
+    Maps every field name to a coercion function up front, so validating a
+    lead's custom_fields is a dict walk with no DB access.
+    """
+    
+    def __init__(self, definitions: List[Dict[str, Any]], inactive_names: Iterable[str] = ()):
+        self.definitions = {d["name"]: d for d in definitions}
+        self._coercers = {d["name"]: build_coercer(d) for d in definitions}
+        self.inactive_names = frozenset(inactive_names) - self.definitions.keys()
+    
+    def validate(self, values: Optional[Dict[str, Any]], keep_inactive: bool = False) -> Dict[str, Any]:
+        """Validate and coerce custom field values, raising ValueError on bad input
+
+        With keep_inactive, values of deactivated fields are passed through
+        unchanged, so updates that send back a lead's stored custom_fields
+        keep working after a field is deactivated. Unknown names are
+        always rejected.
+        """
+        if not values:
+            return {}
+        
+        cleaned = {}
+        errors = []
+        for name, value in values.items():
+            coerce = self._coercers.get(name)
+            if coerce is None and keep_inactive and name in self.inactive_names:
+                cleaned[name] = value
+                continue
+            if coerce is None:
+                errors.append(f"'{name}' is not an active custom field")
+                continue
+            if value is None:
+                cleaned[name] = None
+                continue
+            try:
+                cleaned[name] = coerce(value)
+            except ValueError as e:
+                errors.append(f"'{name}': {str(e)}")
+        
+        if errors:
+            raise ValueError(f"Invalid custom_fields: {'; '.join(errors)}")
+        return cleaned
+    
+    def parse_filters(self, expressions: Optional[List[str]]) -> List[CustomFieldFilter]:
+        """Parse `name:op:value` filter expressions into typed filters
+
+        `in` takes a comma separated list of values. Values are coerced with
+        the same rules as stored data so comparisons line up with the JSONB.
+        """
+        filters = []
+        for expression in expressions or []:
+            name, sep, rest = expression.partition(":")
+            op, sep2, raw_value = rest.partition(":")
+            if not sep or not sep2:
+                raise ValueError(f"Invalid custom field filter '{expression}', expected name:op:value")
+            
+            definition = self.definitions.get(name)
+            if definition is None or not FILTERABLE_NAME.match(name):
+                raise ValueError(f"'{name}' is not a filterable custom field")
+            
+            field_type = definition["field_type"]
+            if op not in FILTER_OPERATORS[field_type]:
+                allowed = ", ".join(sorted(FILTER_OPERATORS[field_type]))
+                raise ValueError(f"Operator '{op}' not supported for {field_type} field '{name}' (use {allowed})")
+            
+            coerce = self._coercers[name]
+            try:
+                if op == "in":
+                    value = [coerce(v) for v in raw_value.split(",")]
+                else:
+                    value = coerce(raw_value)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for custom field filter '{name}': {str(e)}")
+            
+            filters.append(CustomFieldFilter(name, field_type, op, value))
+        
+        return filters
+
+
+class CustomFieldService:
+    """Service for custom field definitions, cached in-process
+
+    The custom field routes call invalidate() after every write; the TTL only
+    bounds staleness for writes made by other processes.
+    """
+    
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self._client = None
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.custom_field_cache_ttl_seconds
+        self.version = 0
+        self._fields: Optional[List[Dict[str, Any]]] = None
+        self._validator: Optional[CustomFieldValidator] = None
+        self._etag: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+    
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_supabase_client()
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    async def get_active_fields(self) -> List[Dict[str, Any]]:
+        """Get active custom field definitions"""
+        await self._ensure_loaded()
+        return self._fields
+    
+    async def get_validator(self) -> CustomFieldValidator:
+        """Get the validator compiled from the active definitions"""
+        await self._ensure_loaded()
+        return self._validator
+    
+    async def get_etag(self) -> str:
+        """Weak ETag of the active definitions, recomputed only when they are reloaded"""
+        await self._ensure_loaded()
+        return self._etag
+    
+    def invalidate(self):
+        """Drop cached definitions so the next read reloads them"""
+        with self._lock:
+            self._fields = None
+            self._validator = None
+            self.version += 1
+    
+    async def _ensure_loaded(self):
+        if self._fields is not None and time.monotonic() < self._expires_at:
+            return
+        
+        # Inactive definitions are loaded too, so their stored values can be kept
+        response = await execute(self.client.table("custom_fields").select("*"))
+        rows = response.data or []
+        fields = [row for row in rows if row.get("is_active")]
+        inactive_names = [row["name"] for row in rows if not row.get("is_active")]
+        validator = CustomFieldValidator(fields, inactive_names)
+        etag = content_etag(json.dumps(fields, sort_keys=True, default=str).encode())
+        
+        with self._lock:
+            self._fields = fields
+            self._validator = validator
+            self._etag = etag
+            self._expires_at = time.monotonic() + self.ttl_seconds
+
+
+custom_field_service = CustomFieldService()
@@ -1,7 +1,9 @@
 """Dashboard service - handles dashboard metrics and aggregations"""
 
 from app.utils.supabase_client import get_supabase_client
-from typing import Dict, List, Any
+from app.utils.read_replica import read_router
+from app.services.loaders import Loaders, load_users
+from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 
 class DashboardService:
@@ -13,7 +15,7 @@ class DashboardService:
     async def get_metrics(self) -> Dict[str, Any]:
         """Get dashboard metrics"""
         # Get all leads
-        leads_response = self.client.table("leads").select("*").execute()
+        leads_response = await read_router.execute(lambda client: client.table("leads").select("*"))
         leads = leads_response.data if leads_response.data else []
         
         # Calculate metrics
@@ -41,7 +43,7 @@ class DashboardService:
                 leads_per_assignee[assignee_id] = leads_per_assignee.get(assignee_id, 0) + 1
         
         # Average response time
-        status_history = self.client.table("status_history").select("*").execute()
+        status_history = await read_router.execute(lambda client: client.table("status_history").select("*"))
         avg_response_time = self._calculate_avg_response_time(status_history.data if status_history.data else [])
         
         return {
@@ -53,13 +55,14 @@ class DashboardService:
             "average_response_time_minutes": avg_response_time
         }
     
-    async def get_leads_per_assignee(self) -> List[Dict[str, Any]]:
+    async def get_leads_per_assignee(self, loaders: Optional[Loaders] = None) -> List[Dict[str, Any]]:
         """Get leads grouped by assignee"""
-        leads_response = self.client.table("leads").select("*").execute()
+        leads_response = await read_router.execute(lambda client: client.table("leads").select("*"))
         leads = leads_response.data if leads_response.data else []
         
-        users_response = self.client.table("users").select("id, name").execute()
-        users = {user["id"]: user["name"] for user in (users_response.data if users_response.data else [])}
+        assignee_ids = {lead["assignee_id"] for lead in leads if lead.get("assignee_id")}
+        assignees = await load_users(assignee_ids, loaders)
+        users = {user_id: user["name"] for user_id, user in assignees.items()}
         
         assignee_stats = {}
         for lead in leads:
@@ -6,11 +6,16 @@ from email.mime.multipart import MIMEMultipart
 from jinja2 import Template, FileSystemLoader, Environment
 from app.config import get_settings
 from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+from app.utils.metrics import upstream_call
+from app.services.loaders import Loaders, load_user
 from typing import Optional, Dict, Any
 import asyncio
 import os
+from app.utils.log import get_logger
 
 settings = get_settings()
+logger = get_logger(__name__)
 
 
 class EmailService:
@@ -29,7 +34,13 @@ class EmailService:
         template_dir = os.path.join(os.path.dirname(__file__), "..", "templates")
         self.jinja_env = Environment(loader=FileSystemLoader(template_dir))
     
-    async def send_assignment_email(self, lead: Dict[str, Any], assignee_id: str, max_retries: int = 3):
+    async def send_assignment_email(
+        self,
+        lead: Dict[str, Any],
+        assignee_id: str,
+        max_retries: int = 3,
+        loaders: Optional[Loaders] = None
+    ):
         """Send assignment email to assignee
         
         NOTE: Data Separation
@@ -41,13 +52,11 @@ class EmailService:
         """
         try:
             # Get assignee details - uses the Assignee's profile email
-            assignee_response = self.client.table("users").select("email, name").eq("id", assignee_id).execute()
+            assignee = await load_user(assignee_id, loaders)
             
-            if not assignee_response.data:
+            if not assignee:
                 raise ValueError("Assignee not found")
             
-            assignee = assignee_response.data[0]
-            
             # Prepare email content
             subject = f"New Lead Assignment: {lead['name']}"
             template = self.jinja_env.get_template("assignment_email.html")
@@ -79,21 +88,20 @@ class EmailService:
                 )
         
         except Exception as e:
-            print(f"Error sending assignment email: {str(e)}")
+            logger.error("Error sending assignment email: %s", e)
     
-    async def send_reminder_email(self, lead: Dict[str, Any]):
-        """Send deadline reminder email"""
+    async def send_reminder_email(self, lead: Dict[str, Any], loaders: Optional[Loaders] = None) -> bool:
+        """Send deadline reminder email; returns whether it was sent"""
         try:
             assignee_id = lead.get("assignee_id")
             if not assignee_id:
-                return
+                return False
             
-            assignee_response = self.client.table("users").select("email, name").eq("id", assignee_id).execute()
+            assignee = await load_user(assignee_id, loaders)
             
-            if not assignee_response.data:
-                return
+            if not assignee:
+                return False
             
-            assignee = assignee_response.data[0]
             subject = f"Reminder: Lead {lead['name']} deadline approaching"
             
             template = self.jinja_env.get_template("reminder_email.html")
@@ -118,19 +126,20 @@ class EmailService:
                     message_type="reminder",
                     status="sent"
                 )
+            return success
         
         except Exception as e:
-            print(f"Error sending reminder email: {str(e)}")
+            logger.error("Error sending reminder email: %s", e)
+            return False
     
-    async def send_sla_breach_email(self, lead: Dict[str, Any], sdr_id: str):
-        """Send SLA breach notification email"""
+    async def send_sla_breach_email(self, lead: Dict[str, Any], sdr_id: str, loaders: Optional[Loaders] = None) -> bool:
+        """Send SLA breach notification email; returns whether it was sent"""
         try:
-            sdr_response = self.client.table("users").select("email, name").eq("id", sdr_id).execute()
+            sdr = await load_user(sdr_id, loaders)
             
-            if not sdr_response.data:
-                return
+            if not sdr:
+                return False
             
-            sdr = sdr_response.data[0]
             subject = f"SLA Breach Alert: Lead {lead['name']}"
             
             template = self.jinja_env.get_template("sla_breach_email.html")
@@ -154,32 +163,35 @@ class EmailService:
                     message_type="sla_breach",
                     status="sent"
                 )
+            return success
         
         except Exception as e:
-            print(f"Error sending SLA breach email: {str(e)}")
+            logger.error("Error sending SLA breach email: %s", e)
+            return False
     
     async def _send_email_with_retry(self, to_email: str, subject: str, html_content: str, max_retries: int = 3) -> bool:
         """Send email with retry logic"""
         for attempt in range(max_retries):
             try:
-                async with aiosmtplib.SMTP(hostname=self.smtp_host, port=self.smtp_port) as smtp:
-                    await smtp.login(self.smtp_username, self.smtp_password)
-                    
-                    message = MIMEMultipart("alternative")
-                    message["Subject"] = subject
-                    message["From"] = f"{self.from_name} <{self.from_email}>"
-                    message["To"] = to_email
-                    
-                    html_part = MIMEText(html_content, "html")
-                    message.attach(html_part)
-                    
-                    await smtp.send_message(message)
+                with upstream_call("smtp", "send_message"):
+                    async with aiosmtplib.SMTP(hostname=self.smtp_host, port=self.smtp_port) as smtp:
+                        await smtp.login(self.smtp_username, self.smtp_password)
+                        
+                        message = MIMEMultipart("alternative")
+                        message["Subject"] = subject
+                        message["From"] = f"{self.from_name} <{self.from_email}>"
+                        message["To"] = to_email
+                        
+                        html_part = MIMEText(html_content, "html")
+                        message.attach(html_part)
+                        
+                        await smtp.send_message(message)
                 
                 return True
             
             except Exception as e:
                 if attempt == max_retries - 1:
-                    print(f"Failed to send email after {max_retries} attempts: {str(e)}")
+                    logger.error("Failed to send email after %d attempts: %s", max_retries, e)
                     return False
                 await asyncio.sleep(2 ** attempt)  # Exponential backoff
         
@@ -187,11 +199,11 @@ class EmailService:
     
     async def _log_notification(self, lead_id: str, assignee_id: str, message_type: str, status: str):
         """Log notification to database"""
-        self.client.table("notifications").insert({
+        await execute(self.client.table("notifications").insert({
             "lead_id": lead_id,
             "assignee_id": assignee_id,
             "channel": "email",
             "message_type": message_type,
             "status": status,
             "retry_count": 0
-        }).execute()
+        }))
@@ -0,0 +1,184 @@
+"""Event bus - fans lead change events out to stream subscribers"""
+
+import asyncio
+import json
+import select
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+from app.config import get_settings
+from app.utils.log import get_logger
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+LEAD_CREATED = "lead.created"
+LEAD_UPDATED = "lead.updated"
+LEAD_ASSIGNED = "lead.assigned"
+LEAD_DELETED = "lead.deleted"
+LEAD_SLA_BREACHED = "lead.sla_breached"
+LEADS_BULK_DELETED = "leads.bulk_deleted"
+
+# Leads listed per bulk event, keeping NOTIFY payloads under Postgres' 8000 byte limit
+BULK_EVENT_MAX_LEADS = 40
+
+
+class Subscription:
+    """A single stream subscriber with a bounded queue
+
+    Assignees only receive events for leads assigned to them (before or after
+    the change), and only their own entries of a bulk event's "leads"; admins
+    and SDRs receive everything. When a slow client lets the queue fill up,
+    the oldest events are dropped.
+    """
+    
+    def __init__(self, user: Dict[str, Any], queue_size: int):
+        self.user_id = user["id"]
+        self.restricted = user.get("role") == "assignee"
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+    
+    def wants(self, event: Dict[str, Any]) -> bool:
+        if not self.restricted:
+            return True
+        if "leads" in event:
+            return any(lead.get("assignee_id") == self.user_id for lead in event["leads"])
+        return self.user_id in (event.get("assignee_id"), event.get("previous_assignee_id"))
+    
+    def view(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """The event as this subscriber may see it"""
+        if not self.restricted or "leads" not in event:
+            return event
+        leads = [lead for lead in event["leads"] if lead.get("assignee_id") == self.user_id]
+        return {**event, "leads": leads, "deleted": len(leads)}
+    
+    def offer(self, event: Dict[str, Any]):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+    
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class EventBus:
+    """In-process pub/sub for lead events
+
+    Without a backbone, publish() delivers straight to local subscribers.
+    With a PostgresEventBackbone attached, publish() goes through NOTIFY and
+    every worker (including this one) delivers what it hears on LISTEN.
+    """
+    
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or settings.event_stream_queue_size
+        self.subscriptions: Set[Subscription] = set()
+        self.backbone: Optional["PostgresEventBackbone"] = None
+    
+    def subscribe(self, user: Dict[str, Any]) -> Subscription:
+        subscription = Subscription(user, self.queue_size)
+        self.subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+    
+    async def publish(
+        self,
+        event_type: str,
+        lead: Optional[Dict[str, Any]] = None,
+        **extra: Any
+    ):
+        """Publish a lead event; payloads stay small, clients refetch details"""
+        event = {
+            "id": str(uuid.uuid4()),
+            "type": event_type,
+            "lead_id": lead.get("id") if lead else None,
+            "assignee_id": lead.get("assignee_id") if lead else None,
+            "status": lead.get("status") if lead else None,
+            "at": datetime.now(timezone.utc).isoformat(),
+            **extra
+        }
+        
+        if self.backbone is not None:
+            try:
+                await self.backbone.notify(event)
+                return
+            except Exception as e:
+                logger.warning("Error publishing event via Postgres, delivering locally: %s", e)
+        
+        self.deliver(event)
+    
+    def deliver(self, event: Dict[str, Any]):
+        """Fan an event out to matching local subscribers (event loop thread only)"""
+        for subscription in list(self.subscriptions):
+            if subscription.wants(event):
+                subscription.offer(subscription.view(event))
+
+
+class PostgresEventBackbone:
+    """Postgres LISTEN/NOTIFY transport for multi-worker deployments"""
+    
+    def __init__(self, bus: EventBus, dsn: str, channel: str = "lead_events"):
+        self.bus = bus
+        self.dsn = dsn
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._notify_conn = None
+        self._notify_lock = threading.Lock()
+    
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(target=self._listen, name="event-bus-listen", daemon=True)
+        self._thread.start()
+        self.bus.backbone = self
+    
+    def stop(self):
+        self.bus.backbone = None
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._notify_conn is not None:
+            self._notify_conn.close()
+    
+    async def notify(self, event: Dict[str, Any]):
+        await asyncio.get_running_loop().run_in_executor(None, self._notify, json.dumps(event))
+    
+    def _connect(self):
+        import psycopg2
+        
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+    
+    def _notify(self, payload: str):
+        with self._notify_lock:
+            if self._notify_conn is None or self._notify_conn.closed:
+                self._notify_conn = self._connect()
+            with self._notify_conn.cursor() as cur:
+                cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+    
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        event = json.loads(notification.payload)
+                        self._loop.call_soon_threadsafe(self.bus.deliver, event)
+                conn.close()
+            except Exception as e:
+                logger.warning("Event bus LISTEN connection failed, retrying: %s", e)
+                self._stop.wait(5)
+
+
+event_bus = EventBus()
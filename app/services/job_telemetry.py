@@ -0,0 +1,210 @@
+"""Background job telemetry - run history, metrics and overrun alerts"""
+
+import time
+import uuid
+from collections import Counter as TallyCounter, deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.config import get_settings
+from app.utils.metrics import Counter, Gauge, Histogram
+from app.utils.log import get_logger, log_context
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+JOB_DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+JOB_RUNS = Counter(
+    "scheduler_job_runs_total", "Scheduler job runs by outcome", ["job", "status"]
+)
+JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds", "Scheduler job run duration", ["job"], buckets=JOB_DURATION_BUCKETS
+)
+JOB_LAG = Histogram(
+    "scheduler_job_lag_seconds", "Delay between a job's scheduled and actual start", ["job"]
+)
+JOB_ITEMS = Counter(
+    "scheduler_job_items_total", "Items scanned and acted on by scheduler jobs", ["job", "kind"]
+)
+JOB_RUNNING = Gauge(
+    "scheduler_job_running", "Scheduler job runs currently in progress", ["job"]
+)
+JOB_OVERRUNS = Counter(
+    "scheduler_job_overruns_total", "Scheduler job runs that took longer than their interval", ["job"]
+)
+JOB_SKIPPED = Counter(
+    "scheduler_job_skipped_total", "Scheduled runs skipped because the previous run was still going", ["job"]
+)
+JOB_LAST_SUCCESS = Gauge(
+    "scheduler_job_last_success_timestamp_seconds", "Unix time the job last finished without errors", ["job"]
+)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class JobRun:
+    """One execution of a background job"""
+
+    def __init__(self, job_id: str, interval_seconds: Optional[float], scheduled_at: Optional[datetime]):
+        self.job_id = job_id
+        self.run_id = uuid.uuid4().hex[:12]
+        self.interval_seconds = interval_seconds
+        self.scheduled_at = scheduled_at
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.duration_seconds: Optional[float] = None
+        self.scanned = 0
+        self.acted: TallyCounter = TallyCounter()
+        self.errors: List[str] = []
+        self._started = time.monotonic()
+
+    @property
+    def lag_seconds(self) -> Optional[float]:
+        if self.scheduled_at is None:
+            return None
+        return max((self.started_at - self.scheduled_at).total_seconds(), 0.0)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.duration_seconds is not None:
+            return self.duration_seconds
+        return time.monotonic() - self._started
+
+    @property
+    def overran(self) -> bool:
+        return self.interval_seconds is not None and self.elapsed_seconds > self.interval_seconds
+
+    @property
+    def status(self) -> str:
+        if self.finished_at is None:
+            return "running"
+        return "failed" if self.errors else "success"
+
+    def count(self, kind: str, amount: int = 1):
+        """Count an action taken, e.g. count("emails_sent")"""
+        self.acted[kind] += amount
+
+    def failure(self, error: Exception):
+        self.errors.append(f"{type(error).__name__}: {error}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "run_id": self.run_id,
+            "status": self.status,
+            "scheduled_at": _isoformat(self.scheduled_at),
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+            "duration_seconds": round(self.elapsed_seconds, 3),
+            "lag_seconds": round(self.lag_seconds, 3) if self.lag_seconds is not None else None,
+            "overran_interval": self.overran,
+            "scanned": self.scanned,
+            "acted": dict(self.acted),
+            "errors": self.errors,
+        }
+
+
+class JobTelemetry:
+    """Records every run of the scheduler's jobs
+
+    Keeps the last `history_size` runs per job in memory for the admin
+    endpoint and mirrors them to the scheduler_job_* metrics. A run that takes
+    longer than its job's interval raises an overrun alert; alert on
+    increase(scheduler_job_overruns_total[15m]) > 0 or on
+    scheduler_job_skipped_total in Prometheus.
+    """
+
+    def __init__(self, history_size: Optional[int] = None):
+        self.history_size = history_size if history_size is not None else settings.scheduler_history_size
+        self.intervals: Dict[str, float] = {}
+        self.history: Dict[str, deque] = {}
+        self.running: Dict[str, List[JobRun]] = {}
+        self.skipped: TallyCounter = TallyCounter()
+        self._scheduled_at: Dict[str, datetime] = {}
+
+    def register(self, job_id: str, interval_seconds: float):
+        self.intervals[job_id] = interval_seconds
+        self.history.setdefault(job_id, deque(maxlen=self.history_size))
+
+    def job_submitted(self, job_id: str, scheduled_at: datetime):
+        """Called when the scheduler hands a run to its executor"""
+        self._scheduled_at[job_id] = scheduled_at
+
+    def job_skipped(self, job_id: str):
+        """Called when a run is dropped because the previous one is still going"""
+        self.skipped[job_id] += 1
+        JOB_SKIPPED.inc(job_id)
+        logger.error(
+            "%s run skipped, previous run still in progress after %.0fs",
+            job_id, self._oldest_running_seconds(job_id),
+            extra={"alert": "scheduler_skipped_run", "job_id": job_id}
+        )
+
+    @asynccontextmanager
+    async def run(self, job_id: str) -> AsyncIterator[JobRun]:
+        """Record the run of `job_id` executing inside the block
+
+        Exceptions are recorded on the run and not re-raised, so one bad sweep
+        does not take the scheduler down; check the run history instead.
+        """
+        job_run = JobRun(job_id, self.intervals.get(job_id), self._scheduled_at.pop(job_id, None))
+        running = self.running.setdefault(job_id, [])
+        running.append(job_run)
+        JOB_RUNNING.inc(job_id)
+        if job_run.lag_seconds is not None:
+            JOB_LAG.observe(job_id, value=job_run.lag_seconds)
+        try:
+            # Everything the job logs carries its job and run ids
+            with log_context(job=job_id, run_id=job_run.run_id):
+                yield job_run
+        except Exception as e:
+            job_run.failure(e)
+            logger.exception("Scheduler job %s failed", job_id, extra={"run_id": job_run.run_id})
+        finally:
+            job_run.duration_seconds = time.monotonic() - job_run._started
+            job_run.finished_at = datetime.now(timezone.utc)
+            running.remove(job_run)
+            JOB_RUNNING.dec(job_id)
+            self._finish(job_run)
+
+    def _finish(self, job_run: JobRun):
+        job_id = job_run.job_id
+        self.history.setdefault(job_id, deque(maxlen=self.history_size)).append(job_run)
+        JOB_RUNS.inc(job_id, job_run.status)
+        JOB_DURATION.observe(job_id, value=job_run.duration_seconds)
+        JOB_ITEMS.inc(job_id, "scanned", amount=job_run.scanned)
+        for kind, amount in job_run.acted.items():
+            JOB_ITEMS.inc(job_id, kind, amount=amount)
+        if job_run.status == "success":
+            JOB_LAST_SUCCESS.set(job_id, value=time.time())
+        if job_run.overran:
+            JOB_OVERRUNS.inc(job_id)
+            logger.error(
+                "%s overran its %gs interval (took %.1fs)",
+                job_id, job_run.interval_seconds, job_run.duration_seconds,
+                extra={"alert": "scheduler_overrun", "job_id": job_id}
+            )
+
+    def _oldest_running_seconds(self, job_id: str) -> float:
+        return max((r.elapsed_seconds for r in self.running.get(job_id, [])), default=0.0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-job status: interval, runs in progress and recent history (newest first)"""
+        jobs = []
+        for job_id in sorted(set(self.intervals) | set(self.history)):
+            runs = list(self.history.get(job_id, []))
+            jobs.append({
+                "job_id": job_id,
+                "interval_seconds": self.intervals.get(job_id),
+                "running": [r.to_dict() for r in self.running.get(job_id, [])],
+                "skipped_runs": self.skipped[job_id],
+                "last_run": runs[-1].to_dict() if runs else None,
+                "recent_runs": [r.to_dict() for r in reversed(runs)],
+            })
+        return jobs
+
+
+job_telemetry = JobTelemetry()
@@ -1,25 +1,97 @@
 """Lead service - business logic for leads"""
 
-from app.utils.supabase_client import get_supabase_client
 from app.models.lead import LeadCreate, LeadUpdate, LeadResponse
-from app.services.sla_service import SLAService
 from app.services.email_service import EmailService
+from app.services.loaders import Loaders, load_users, load_user
+from app.services.custom_field_service import custom_field_service, CustomFieldFilter
+from app.services.repository import In, Repository, get_repository
+from app.services.event_bus import (
+    event_bus,
+    BULK_EVENT_MAX_LEADS,
+    LEAD_CREATED,
+    LEAD_UPDATED,
+    LEAD_ASSIGNED,
+    LEAD_DELETED,
+    LEADS_BULK_DELETED,
+)
+from app.utils.read_replica import read_router
+from app.utils.pagination import encode_cursor, decode_cursor, quote_filter_value
+from postgrest.types import CountMethod
 from datetime import datetime, timedelta
+import re
 from typing import List, Optional, Dict, Any
+from app.utils.log import get_logger
 
-sla_service = SLAService()
-email_service = EmailService()
+logger = get_logger(__name__)
+
+# Number of status history entries embedded in lead detail responses
+DEFAULT_HISTORY_LIMIT = 20
+
+# Lead table columns returned by the API (excludes internal columns such as search_vector)
+LEAD_COLUMNS = [
+    "id", "name", "email", "website", "source", "status", "deadline", "notes",
+    "sla_deadline", "custom_fields", "assignee_id", "created_by", "created_at", "updated_at"
+]
+
+LEAD_SELECT = ",".join(LEAD_COLUMNS)
+
+# Named field presets for GET /api/leads?fields=
+LEAD_FIELD_PRESETS = {
+    "summary": ["id", "name", "status", "deadline", "sla_deadline", "assignee_id", "assignee_name"],
+    "full": LEAD_COLUMNS + ["assignee_name"],
+}
+
+# Ids per DELETE ... WHERE id IN (...) request. The ids travel in the URL:
+# 150 uuids make it about 6 KB, under the common 8 KB request-line limit
+BULK_DELETE_CHUNK_SIZE = 150
+
+
+def build_prefix_tsquery(q: str) -> str:
+    """Turn free text into a to_tsquery expression that prefix matches every word"""
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def resolve_lead_fields(fields: Optional[str]) -> List[str]:
+    """Resolve a fields= value (preset name or comma separated list) to response fields"""
+    if not fields or fields in LEAD_FIELD_PRESETS:
+        return LEAD_FIELD_PRESETS[fields or "full"]
+    
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    allowed = LEAD_FIELD_PRESETS["full"]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown lead fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in requested if f != "id"]
+
+
+class LeadNotFoundError(ValueError):
+    """Raised when a lead does not exist"""
+
+
+class LeadAccessDeniedError(PermissionError):
+    """Raised when a conditional update is restricted to another assignee's lead"""
+
+
+class LeadPreconditionFailedError(ValueError):
+    """Raised when a lead was modified since the version the client last read"""
 
 
 class LeadService:
     """Service for lead management"""
     
-    def __init__(self):
-        self.client = get_supabase_client()
+    def __init__(self, email_service: Optional[EmailService] = None):
+        self.repository = get_repository()
+        self.email_service = email_service or EmailService()
     
     async def create_lead(self, lead_data: LeadCreate, user_id: str) -> Dict[str, Any]:
         """Create a new lead"""
         try:
+            validator = await custom_field_service.get_validator()
+            custom_fields = validator.validate(lead_data.custom_fields)
+            
             # Calculate SLA deadline
             sla_deadline = None
             if lead_data.deadline:
@@ -34,39 +106,56 @@ class LeadService:
                 "sla_deadline": sla_deadline.isoformat() if sla_deadline else None,
                 "notes": lead_data.notes,
                 "assignee_id": lead_data.assignee_id,
-                "custom_fields": lead_data.custom_fields or {},
+                "custom_fields": custom_fields,
                 "created_by": user_id
             }
             
-            response = self.client.table("leads").insert(lead_record).execute()
-            
-            if not response.data:
-                raise ValueError("Failed to create lead")
-            
-            lead = response.data[0]
-            
-            # Log to audit
-            await self._log_action(
-                lead_id=lead["id"],
-                action_type="lead_created",
-                user_id=user_id,
-                metadata=lead_record
-            )
+            async with self.repository.transaction() as tx:
+                rows = await tx.insert("leads", lead_record)
+                
+                if not rows:
+                    raise ValueError("Failed to create lead")
+                
+                lead = rows[0]
+                
+                # Log to audit
+                await self._log_action(
+                    lead_id=lead["id"],
+                    action_type="lead_created",
+                    user_id=user_id,
+                    metadata=lead_record,
+                    current_status=lead["status"],
+                    repo=tx
+                )
             
             # Send assignment email if assignee is specified
             if lead_data.assignee_id:
                 try:
-                    await email_service.send_assignment_email(lead, lead_data.assignee_id)
+                    await self.email_service.send_assignment_email(lead, lead_data.assignee_id)
                 except Exception as e:
                     # Log email error but don't fail the lead creation
-                    print(f"Warning: Failed to send assignment email: {str(e)}")
+                    logger.warning("Failed to send assignment email: %s", e)
             
+            read_router.mark_write(user_id)
+            await event_bus.publish(LEAD_CREATED, lead)
             return lead
         except Exception as e:
             raise ValueError(f"Failed to create lead: {str(e)}")
     
-    async def update_lead(self, lead_id: str, lead_data: LeadUpdate, user_id: str) -> Dict[str, Any]:
-        """Update an existing lead"""
+    async def update_lead(
+        self,
+        lead_id: str,
+        lead_data: LeadUpdate,
+        user_id: str,
+        owner_id: Optional[str] = None,
+        expected_updated_at: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Update an existing lead in a single conditional round trip
+
+        owner_id restricts the update to leads assigned to that user and
+        expected_updated_at to the version the client last read. When nothing
+        matches, the reason is looked up only on that failure path.
+        """
         try:
             update_dict = lead_data.model_dump(exclude_unset=True)
             
@@ -74,10 +163,31 @@ class LeadService:
             if "deadline" in update_dict and update_dict["deadline"]:
                 update_dict["deadline"] = update_dict["deadline"].isoformat()
             
-            response = self.client.table("leads").update(update_dict).eq("id", lead_id).execute()
+            if update_dict.get("custom_fields") is not None:
+                validator = await custom_field_service.get_validator()
+                update_dict["custom_fields"] = validator.validate(update_dict["custom_fields"], keep_inactive=True)
             
-            if not response.data:
-                raise ValueError("Lead not found")
+            # The previous assignee still gets the event when a lead is moved away.
+            # An owner-restricted update can only match the owner's leads.
+            extra = {}
+            if "assignee_id" in update_dict:
+                if owner_id is not None:
+                    extra["previous_assignee_id"] = owner_id
+                else:
+                    current = await self.repository.select("leads", "assignee_id", {"id": lead_id})
+                    if current:
+                        extra["previous_assignee_id"] = current[0]["assignee_id"]
+            
+            filters = {"id": lead_id}
+            if owner_id is not None:
+                filters["assignee_id"] = owner_id
+            if expected_updated_at is not None:
+                filters["updated_at"] = expected_updated_at
+            
+            rows = await self.repository.update("leads", update_dict, filters)
+            
+            if not rows:
+                await self._raise_update_miss(lead_id, owner_id)
             
             # Log status change if status was updated
             if "status" in update_dict:
@@ -88,171 +198,416 @@ class LeadService:
                     comment=None
                 )
             
-            return response.data[0]
+            lead = rows[0]
+            read_router.mark_write(user_id)
+            await event_bus.publish(LEAD_UPDATED, lead, **extra)
+            return lead
+        except (LeadNotFoundError, LeadAccessDeniedError, LeadPreconditionFailedError):
+            raise
         except Exception as e:
             raise ValueError(f"Failed to update lead: {str(e)}")
     
+    async def _raise_update_miss(self, lead_id: str, owner_id: Optional[str]):
+        """Explain why a conditional update matched no rows"""
+        current = await self.repository.select("leads", "assignee_id", {"id": lead_id})
+        
+        if not current:
+            raise LeadNotFoundError("Lead not found")
+        if owner_id is not None and current[0].get("assignee_id") != owner_id:
+            raise LeadAccessDeniedError("Cannot update leads assigned to others")
+        raise LeadPreconditionFailedError("Lead was modified by another request")
+    
     async def assign_lead(self, lead_id: str, assignee_id: str, user_id: str, comment: Optional[str] = None) -> Dict[str, Any]:
         """Assign a lead to a user"""
         update_data = {"assignee_id": assignee_id}
-        response = self.client.table("leads").update(update_data).eq("id", lead_id).execute()
         
-        # Log assignment
-        await self._log_action(
-            lead_id=lead_id,
-            action_type="lead_assigned",
-            user_id=user_id,
-            metadata={
-                "assigned_to": assignee_id,
-                "assigned_by": user_id,
-                "comment": comment
-            }
-        )
-        
-        # Log status change
-        await self._log_status_change(
-            lead_id=lead_id,
-            new_status="assigned",
-            user_id=user_id,
-            comment=f"Assigned to {assignee_id}. {comment or ''}"
-        )
+        # The update and both history rows commit together on the Postgres backend
+        async with self.repository.transaction() as tx:
+            # Read first so the previous assignee can be notified of the move
+            previous = await tx.select("leads", "assignee_id", {"id": lead_id})
+            if not previous:
+                raise LeadNotFoundError("Lead not found")
+            rows = await tx.update("leads", update_data, {"id": lead_id})
+            if not rows:
+                raise LeadNotFoundError("Lead not found")
+            lead = rows[0]
+            
+            # Log assignment
+            await self._log_action(
+                lead_id=lead_id,
+                action_type="lead_assigned",
+                user_id=user_id,
+                metadata={
+                    "assigned_to": assignee_id,
+                    "assigned_by": user_id,
+                    "comment": comment
+                },
+                current_status=lead["status"],
+                repo=tx
+            )
+            
+            # Log status change
+            await self._log_status_change(
+                lead_id=lead_id,
+                new_status="assigned",
+                user_id=user_id,
+                comment=f"Assigned to {assignee_id}. {comment or ''}",
+                repo=tx
+            )
         
-        return response.data[0]
+        read_router.mark_write(user_id)
+        await event_bus.publish(LEAD_ASSIGNED, lead, previous_assignee_id=previous[0]["assignee_id"])
+        return lead
     
-    async def get_lead_details(self, lead_id: str) -> Dict[str, Any]:
-        """Get lead details with status history and assignee name"""
-        lead_response = self.client.table("leads").select("*").eq("id", lead_id).execute()
+    async def get_lead_version(self, lead_id: str) -> Optional[str]:
+        """The lead's updated_at, for conditional GETs; None if it does not exist"""
+        response = await read_router.execute(
+            lambda client: client.table("leads").select("updated_at").eq("id", lead_id)
+        )
+        return response.data[0]["updated_at"] if response.data else None
+
+    async def get_lead_details(
+        self,
+        lead_id: str,
+        history: str = "recent",
+        history_limit: int = DEFAULT_HISTORY_LIMIT,
+        loaders: Optional[Loaders] = None
+    ) -> Dict[str, Any]:
+        """Get lead details with the most recent status history and assignee name
+
+        history="recent" embeds the newest `history_limit` entries (newest first)
+        together with the total count; history="none" skips the history query.
+        Older entries are paged through with get_lead_history.
+        """
+        lead_response = await read_router.execute(
+            lambda client: client.table("leads").select(LEAD_SELECT).eq("id", lead_id)
+        )
         
         if not lead_response.data:
             raise ValueError("Lead not found")
         
         lead = lead_response.data[0]
         
-        # Initialize default
-        lead["assignee_name"] = "Unassigned"
-        
-        # Batch fetch related data
-        queries = []
-        if lead.get("assignee_id"):
-            queries.append(self.client.table("users").select("name").eq("id", lead["assignee_id"]).execute())
+        assignee = await load_user(lead.get("assignee_id"), loaders)
+        lead["assignee_name"] = assignee["name"] if assignee else "Unassigned"
         
-        # Fetch status history
-        queries.append(self.client.table("status_history").select("*").eq("lead_id", lead_id).order("updated_at", desc=False).execute())
+        if history == "none":
+            lead["status_history"] = None
+            lead["status_history_total"] = None
+            return lead
         
-        # Wait for all (though currently executed sequentially in this client wrapper)
-        results = [q for q in queries]
+        history_resp = await read_router.execute(
+            lambda client: client.table("status_history").select("*", count=CountMethod.exact).eq(
+                "lead_id", lead_id
+            ).order("updated_at", desc=True).order("id", desc=True).limit(history_limit)
+        )
         
-        # Process results
-        if lead.get("assignee_id") and results:
-            user_resp = results[0]
-            if user_resp.data:
-                lead["assignee_name"] = user_resp.data[0].get("name")
-            
-        lead["status_history"] = results[-1].data if results[-1].data else []
+        lead["status_history"] = history_resp.data or []
+        lead["status_history_total"] = history_resp.count
                 
         return lead
 
+    async def get_lead_history(
+        self,
+        lead_id: str,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_HISTORY_LIMIT
+    ) -> Dict[str, Any]:
+        """Page through a lead's status history, newest first
+
+        Uses keyset pagination on (updated_at, id) so deep pages cost the same
+        as the first one. The total count is only computed for the first page.
+        """
+        first_page = cursor is None
+        if not first_page:
+            updated_at, last_id = decode_cursor(cursor, 2)
+            updated_at = quote_filter_value(updated_at)
+            last_id = quote_filter_value(last_id)
+        
+        def build(client):
+            query = client.table("status_history").select(
+                "*", count=CountMethod.exact if first_page else None
+            ).eq("lead_id", lead_id)
+            if not first_page:
+                query = query.or_(
+                    f"updated_at.lt.{updated_at},and(updated_at.eq.{updated_at},id.lt.{last_id})"
+                )
+            # Fetch one extra row to know whether another page exists
+            return query.order("updated_at", desc=True).order("id", desc=True).limit(limit + 1)
+        
+        response = await read_router.execute(build)
+        rows = response.data or []
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last["updated_at"], last["id"])
+        
+        return {
+            "items": rows,
+            "next_cursor": next_cursor,
+            "total": response.count if first_page else None
+        }
+
     async def list_leads(
         self,
         source: Optional[str] = None,
         status: Optional[str] = None,
         assignee_id: Optional[str] = None,
         sla_status: Optional[str] = None,
+        custom_filters: Optional[List[CustomFieldFilter]] = None,
+        fields: Optional[List[str]] = None,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        loaders: Optional[Loaders] = None
     ) -> List[Dict[str, Any]]:
-        """List leads with filters and optimized assignee name enrichment"""
+        """List leads with filters and optimized assignee name enrichment
+
+        `fields` narrows the PostgREST select to the columns a view needs
+        (see resolve_lead_fields); columns needed for SLA filtering and name
+        enrichment are added automatically.
+        """
         leads = []
+        fields = fields or LEAD_FIELD_PRESETS["full"]
         try:
             # 1. Fetch leads
-            query = self.client.table("leads").select("*")
-            if source:
-                query = query.eq("source", source)
-            if status:
-                query = query.eq("status", status)
-            if assignee_id:
-                query = query.eq("assignee_id", assignee_id)
+            def build(client):
+                query = client.table("leads").select(self._select_for(fields, sla_status))
+                if source:
+                    query = query.eq("source", source)
+                if status:
+                    query = query.eq("status", status)
+                if assignee_id:
+                    query = query.eq("assignee_id", assignee_id)
+                if custom_filters:
+                    query = self._apply_custom_field_filters(query, custom_filters)
+                return query.order("created_at", desc=True).range(skip, skip + limit - 1)
             
-            response = query.order("created_at", desc=True).range(skip, skip + limit - 1).execute()
+            response = await read_router.execute(build)
             leads = response.data or []
             
             if not leads:
                 return []
 
-            # 2. Collect unique assignee IDs
-            assignee_ids = list(set(l["assignee_id"] for l in leads if l.get("assignee_id")))
-            
-            # 3. Bulk fetch assignee names
-            user_map = {}
-            if assignee_ids:
-                try:
-                    # Fetch multiple users in one query using 'in'
-                    user_resp = self.client.table("users").select("id, name").in_("id", assignee_ids).execute()
-                    if user_resp.data:
-                        user_map = {u["id"]: u["name"] for u in user_resp.data}
-                except Exception as e:
-                    print(f"Error fetching users in bulk: {str(e)}")
-
-            # 4. Enrich leads from map
-            for lead in leads:
-                lead_assignee_id = lead.get("assignee_id")
-                if lead_assignee_id and lead_assignee_id in user_map:
-                    lead["assignee_name"] = user_map[lead_assignee_id]
-                else:
-                    lead["assignee_name"] = "Unassigned"
-            
-            # 5. Filter by SLA status if provided
-            if sla_status:
-                from datetime import timezone
-                now = datetime.now(timezone.utc)
-                filtered_leads = []
-                for lead in leads:
-                    if sla_status == "breached" and lead.get("sla_deadline"):
-                        try:
-                            sla_deadline = datetime.fromisoformat(lead["sla_deadline"])
-                            if sla_deadline.tzinfo is None:
-                                sla_deadline = sla_deadline.replace(tzinfo=timezone.utc)
-                            if sla_deadline < now:
-                                filtered_leads.append(lead)
-                        except:
-                            pass
-                    elif sla_status == "at_risk" and lead.get("deadline"):
-                        try:
-                            deadline = datetime.fromisoformat(lead["deadline"])
-                            if deadline.tzinfo is None:
-                                deadline = deadline.replace(tzinfo=timezone.utc)
-                            if now < deadline < now + timedelta(hours=1):
-                                filtered_leads.append(lead)
-                        except:
-                            pass
-                return filtered_leads
-            
-            return leads
+            if "assignee_name" in fields:
+                await self._enrich_assignee_names(leads, loaders)
+            return self._filter_by_sla(leads, sla_status)
             
         except Exception as e:
-            print(f"Error listing leads: {str(e)}")
+            logger.exception("Error listing leads")
             raise e
 
-    async def _log_action(self, lead_id: str, action_type: str, user_id: str, metadata: Dict[str, Any]):
-        """Log an action in status_history or audit"""
-        # Get current lead status to include in history record
-        lead_resp = self.client.table("leads").select("status").eq("id", lead_id).execute()
-        current_status = lead_resp.data[0]["status"] if lead_resp.data else None
+    async def search_leads(
+        self,
+        q: str,
+        source: Optional[str] = None,
+        status: Optional[str] = None,
+        assignee_id: Optional[str] = None,
+        sla_status: Optional[str] = None,
+        custom_filters: Optional[List[CustomFieldFilter]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        loaders: Optional[Loaders] = None
+    ) -> Dict[str, Any]:
+        """Full-text search over lead name, email, website and notes
+
+        Every search term is prefix matched so partial input works for
+        type-ahead. Results are ranked and paged with a keyset cursor on
+        (search_rank, id). The search_leads SQL function is inlined by the
+        planner, so the filters below are applied inside the indexed query.
+        """
+        tsquery = build_prefix_tsquery(q)
+        if cursor:
+            rank, last_id = decode_cursor(cursor, 2)
+            rank = quote_filter_value(rank)
+            last_id = quote_filter_value(last_id)
         
-        self.client.table("status_history").insert({
+        def build(client):
+            query = client.rpc("search_leads", {"p_query": tsquery})
+            if source:
+                query = query.eq("source", source)
+            if status:
+                query = query.eq("status", status)
+            if assignee_id:
+                query = query.eq("assignee_id", assignee_id)
+            if custom_filters:
+                query = self._apply_custom_field_filters(query, custom_filters)
+            if cursor:
+                query = query.or_(f"search_rank.lt.{rank},and(search_rank.eq.{rank},id.lt.{last_id})")
+            # Fetch one extra row to know whether another page exists
+            return query.order("search_rank", desc=True).order("id", desc=True).limit(limit + 1)
+        
+        response = await read_router.execute(build)
+        leads = response.data or []
+        
+        next_cursor = None
+        if len(leads) > limit:
+            leads = leads[:limit]
+            last = leads[-1]
+            next_cursor = encode_cursor(last["search_rank"], last["id"])
+        
+        await self._enrich_assignee_names(leads, loaders)
+        return {
+            "items": self._filter_by_sla(leads, sla_status),
+            "next_cursor": next_cursor
+        }
+
+    @staticmethod
+    def _select_for(fields: List[str], sla_status: Optional[str]) -> str:
+        """Build the PostgREST select list for the requested response fields"""
+        columns = [f for f in fields if f in LEAD_COLUMNS]
+        if "assignee_name" in fields:
+            columns.append("assignee_id")
+        if sla_status:
+            columns.extend(["deadline", "sla_deadline"])
+        return ",".join(dict.fromkeys(columns))
+
+    async def _enrich_assignee_names(self, leads: List[Dict[str, Any]], loaders: Optional[Loaders] = None):
+        """Set assignee_name on each lead from one batched user lookup"""
+        assignee_ids = list(set(l["assignee_id"] for l in leads if l.get("assignee_id")))
+        
+        user_map = {}
+        if assignee_ids:
+            try:
+                user_map = await load_users(assignee_ids, loaders)
+            except Exception as e:
+                logger.warning("Error fetching users in bulk: %s", e)
+        
+        for lead in leads:
+            lead_assignee_id = lead.get("assignee_id")
+            if lead_assignee_id and lead_assignee_id in user_map:
+                lead["assignee_name"] = user_map[lead_assignee_id]["name"]
+            else:
+                lead["assignee_name"] = "Unassigned"
+
+    def _filter_by_sla(self, leads: List[Dict[str, Any]], sla_status: Optional[str]) -> List[Dict[str, Any]]:
+        """Filter a page of leads by SLA state (breached / at_risk)"""
+        if not sla_status:
+            return leads
+        
+        from datetime import timezone
+        now = datetime.now(timezone.utc)
+        filtered_leads = []
+        for lead in leads:
+            if sla_status == "breached" and lead.get("sla_deadline"):
+                try:
+                    sla_deadline = datetime.fromisoformat(lead["sla_deadline"])
+                    if sla_deadline.tzinfo is None:
+                        sla_deadline = sla_deadline.replace(tzinfo=timezone.utc)
+                    if sla_deadline < now:
+                        filtered_leads.append(lead)
+                except:
+                    pass
+            elif sla_status == "at_risk" and lead.get("deadline"):
+                try:
+                    deadline = datetime.fromisoformat(lead["deadline"])
+                    if deadline.tzinfo is None:
+                        deadline = deadline.replace(tzinfo=timezone.utc)
+                    if now < deadline < now + timedelta(hours=1):
+                        filtered_leads.append(lead)
+                except:
+                    pass
+        return filtered_leads
+
+    async def delete_lead(self, lead_id: str) -> bool:
+        """Delete a lead; status_history and notifications rows go with it via ON DELETE CASCADE
+
+        The row is read first so the event can still name its assignee.
+        """
+        async with self.repository.transaction() as tx:
+            existing = await tx.select("leads", "id, assignee_id, status", {"id": lead_id})
+            if not existing or not await tx.delete("leads", {"id": lead_id}):
+                return False
+        
+        read_router.mark_write()
+        await event_bus.publish(LEAD_DELETED, existing[0])
+        return True
+    
+    async def delete_leads(self, lead_ids: List[str]) -> int:
+        """Bulk delete leads by id, chunk by chunk, returning the number deleted
+
+        Each chunk's ids and assignees are read before it is deleted, so the
+        events tell assignees which of their leads went away.
+        """
+        unique_ids = list(dict.fromkeys(lead_ids))
+        deleted = 0
+        removed: List[Dict[str, Any]] = []
+        
+        for start in range(0, len(unique_ids), BULK_DELETE_CHUNK_SIZE):
+            chunk = unique_ids[start:start + BULK_DELETE_CHUNK_SIZE]
+            async with self.repository.transaction() as tx:
+                existing = await tx.select("leads", "id, assignee_id", {"id": In(chunk)})
+                if not existing:
+                    continue
+                deleted += await tx.delete("leads", {"id": In([lead["id"] for lead in existing])})
+            removed.extend(existing)
+        
+        if deleted:
+            read_router.mark_write()
+            for start in range(0, len(removed), BULK_EVENT_MAX_LEADS):
+                group = removed[start:start + BULK_EVENT_MAX_LEADS]
+                await event_bus.publish(
+                    LEADS_BULK_DELETED,
+                    deleted=len(group),
+                    leads=[{"id": lead["id"], "assignee_id": lead["assignee_id"]} for lead in group]
+                )
+        return deleted
+
+    def _apply_custom_field_filters(self, query, custom_filters: List[CustomFieldFilter]):
+        """Push custom field filters down to Postgres
+
+        Equality uses JSONB containment (served by the GIN index on
+        custom_fields); ranges and membership compare the extracted value
+        (served by the per-field expression indexes from migration 002).
+        Numbers compare as JSONB so ordering is numeric, not lexical.
+        """
+        for f in custom_filters:
+            if f.op == "eq":
+                query = query.contains("custom_fields", {f.name: f.value})
+            elif f.op == "in":
+                query = query.in_(f"custom_fields->>{f.name}", [str(v) for v in f.value])
+            elif f.field_type == "number":
+                query = query.filter(f"custom_fields->{f.name}", f.op, str(f.value))
+            else:
+                query = query.filter(f"custom_fields->>{f.name}", f.op, f.value)
+        return query
+
+    async def _log_action(
+        self,
+        lead_id: str,
+        action_type: str,
+        user_id: str,
+        metadata: Dict[str, Any],
+        current_status: Optional[str] = None,
+        repo: Optional[Repository] = None
+    ):
+        """Log an action in status_history or audit
+
+        current_status comes from the row the caller just wrote, so logging
+        never re-reads the lead.
+        """
+        await (repo or self.repository).insert("status_history", {
             "lead_id": lead_id,
             "status": current_status,
             "action_type": action_type,
             "updated_by": user_id,
             "metadata": metadata
-        }).execute()
+        })
     
-    async def _log_status_change(self, lead_id: str, new_status: str, user_id: str, comment: Optional[str] = None):
+    async def _log_status_change(
+        self,
+        lead_id: str,
+        new_status: str,
+        user_id: str,
+        comment: Optional[str] = None,
+        repo: Optional[Repository] = None
+    ):
         """Log a status change"""
-        self.client.table("status_history").insert({
+        await (repo or self.repository).insert("status_history", {
             "lead_id": lead_id,
             "status": new_status,
             "action_type": "status_change",
             "comment": comment,
             "updated_by": user_id
-        }).execute()
+        })
@@ -0,0 +1,33 @@
+"""Request-scoped loaders for related-entity lookups"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from app.utils.dataloader import DataLoader
+from app.services.user_directory import user_directory
+
+
+class Loaders:
+    """DataLoaders for related entities, created per request via Depends(get_loaders)
+
+    User lookups go through the shared user directory, so a batch only hits
+    the database for users that are not already cached in-process.
+    """
+    
+    def __init__(self):
+        self.users = DataLoader(self._load_users)
+    
+    async def _load_users(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return await user_directory.get_many(user_ids)
+
+
+async def load_users(user_ids: Iterable[str], loaders: Optional[Loaders] = None) -> Dict[str, Dict[str, Any]]:
+    """Resolve users by id through the request's loader when available"""
+    if loaders is not None:
+        return await loaders.users.load_many(user_ids)
+    return await user_directory.get_many(user_ids)
+
+
+async def load_user(user_id: Optional[str], loaders: Optional[Loaders] = None) -> Optional[Dict[str, Any]]:
+    """Resolve a single user by id through the request's loader when available"""
+    if not user_id:
+        return None
+    return (await load_users([user_id], loaders)).get(user_id)
@@ -0,0 +1,326 @@
+"""Data access repositories - PostgREST (default) and direct Postgres backends"""
+
+import asyncio
+import copy
+import hashlib
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+import httpx
+from app.config import get_settings
+from app.utils.resilience import execute
+from app.utils.supabase_client import get_supabase_client
+
+Filters = Dict[str, Any]
+Rows = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class In:
+    """Filter value matching any of several values (column IN (...))"""
+    
+    def __init__(self, values):
+        self.values = list(values)
+
+
+class Repository(ABC):
+    """Minimal table access used by the services
+
+    Filters map a column to a value (equality) or an In(...) of values.
+    Rows come back shaped like PostgREST JSON: uuids and timestamps are
+    strings, JSONB columns are dicts.
+    """
+    
+    @abstractmethod
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Filters] = None,
+        order: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def insert(self, table: str, rows: Rows) -> List[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def update(self, table: str, values: Dict[str, Any], filters: Filters) -> List[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def delete(self, table: str, filters: Filters) -> int:
+        ...
+    
+    @abstractmethod
+    def transaction(self):
+        """Async context manager yielding a repository whose writes commit together"""
+
+
+class PostgrestRepository(Repository):
+    """Repository over supabase-py / PostgREST (one HTTPS request per call)
+
+    PostgREST has no multi-request transactions, so transaction() yields
+    this repository unchanged and statements commit individually.
+    """
+    
+    def __init__(self, client=None):
+        self.client = client or get_supabase_client()
+    
+    def _apply_filters(self, query, filters: Optional[Filters]):
+        for column, value in (filters or {}).items():
+            query = query.in_(column, value.values) if isinstance(value, In) else query.eq(column, value)
+        return query
+    
+    async def select(self, table, columns="*", filters=None, order=None, desc=False, limit=None):
+        query = self._apply_filters(self.client.table(table).select(columns), filters)
+        if order:
+            query = query.order(order, desc=desc)
+        if limit is not None:
+            query = query.limit(limit)
+        return (await execute(query)).data or []
+    
+    async def insert(self, table, rows):
+        return (await execute(self.client.table(table).insert(rows))).data or []
+    
+    async def update(self, table, values, filters):
+        query = self._apply_filters(self.client.table(table).update(values), filters)
+        return (await execute(query)).data or []
+    
+    async def delete(self, table, filters):
+        from postgrest.types import CountMethod, ReturnMethod
+        
+        query = self._apply_filters(
+            self.client.table(table).delete(count=CountMethod.exact, returning=ReturnMethod.minimal),
+            filters
+        )
+        return (await execute(query)).count or 0
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["PostgrestRepository"]:
+        yield self
+
+
+def quote_ident(name: str) -> str:
+    """Quote a SQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _columns_sql(columns: str) -> str:
+    if columns.strip() == "*":
+        return "*"
+    return ", ".join(quote_ident(c.strip()) for c in columns.split(","))
+
+
+def _where_sql(filters: Optional[Filters], start: int = 1) -> Tuple[str, List[Any]]:
+    clauses, params = [], []
+    for column, value in (filters or {}).items():
+        if isinstance(value, In):
+            clauses.append(f"{quote_ident(column)} = ANY(${start + len(params)})")
+            params.append(value.values)
+        elif value is None:
+            clauses.append(f"{quote_ident(column)} IS NULL")
+        else:
+            clauses.append(f"{quote_ident(column)} = ${start + len(params)}")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def build_select(table, columns="*", filters=None, order=None, desc=False, limit=None) -> Tuple[str, List[Any]]:
+    where, params = _where_sql(filters)
+    sql = f"SELECT {_columns_sql(columns)} FROM {quote_ident(table)}{where}"
+    if order:
+        sql += f" ORDER BY {quote_ident(order)}{' DESC' if desc else ''}"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def build_insert(table, columns: List[str]) -> str:
+    placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    names = ", ".join(quote_ident(c) for c in columns)
+    return f"INSERT INTO {quote_ident(table)} ({names}) VALUES ({placeholders}) RETURNING *"
+
+
+def build_update(table, values: Dict[str, Any], filters: Filters) -> Tuple[str, List[Any]]:
+    sets = ", ".join(f"{quote_ident(c)} = ${i}" for i, c in enumerate(values, start=1))
+    where, params = _where_sql(filters, start=len(values) + 1)
+    return f"UPDATE {quote_ident(table)} SET {sets}{where} RETURNING *", list(values.values()) + params
+
+
+def build_delete(table, filters: Filters) -> Tuple[str, List[Any]]:
+    where, params = _where_sql(filters)
+    return f"DELETE FROM {quote_ident(table)}{where}", params
+
+
+def _to_json_shape(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class SqlCall:
+    """One blocking SQL statement, shaped like the equivalent PostgREST query
+
+    resilience.execute runs it like any query, so the direct backend gets the
+    same deadline, circuit breaker, metrics and query budget fingerprints.
+    """
+    
+    session = SimpleNamespace(base_url="postgres")
+    
+    def __init__(self, run, method: str, table: str, columns: Optional[str] = None, filters: Optional[Filters] = None):
+        self.run = run
+        self.http_method = method
+        self.path = f"/{table}"
+        params = [("select", columns)] if columns else []
+        for column, value in (filters or {}).items():
+            operator = "in" if isinstance(value, In) else "is" if value is None else "eq"
+            params.append((column, f"{operator}.?"))
+        self.params = httpx.QueryParams(params)
+    
+    def execute(self):
+        return self.run()
+
+
+class PostgresRepository(Repository):
+    """Repository over a direct psycopg2 connection pool
+
+    Statements are PREPAREd once per pooled connection and then EXECUTEd,
+    so repeated queries skip parsing and planning. Blocking driver calls run
+    in worker threads through resilience.execute, like PostgREST queries.
+    """
+    
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10, _connection=None):
+        from psycopg2.pool import ThreadedConnectionPool
+        
+        self.dsn = dsn
+        self.pool = ThreadedConnectionPool(min_size, max_size, dsn) if _connection is None else None
+        self._connection = _connection
+        # Prepared statement parameter types per live connection
+        self._prepared: "weakref.WeakKeyDictionary[Any, Dict[str, List[str]]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def _run(self, sql: str, params: List[Any], fetch: bool) -> Tuple[List[Dict[str, Any]], int]:
+        conn = self._connection or self.pool.getconn()
+        try:
+            rows, rowcount = self._execute_prepared(conn, sql, params, fetch)
+            if self._connection is None:
+                conn.commit()
+            return rows, rowcount
+        except Exception:
+            if self._connection is None:
+                conn.rollback()
+            raise
+        finally:
+            if self._connection is None:
+                self.pool.putconn(conn)
+    
+    def _execute_prepared(self, conn, sql: str, params: List[Any], fetch: bool):
+        from psycopg2.extras import Json, RealDictCursor
+        
+        name = "stmt_" + hashlib.md5(sql.encode()).hexdigest()[:16]
+        with self._lock:
+            prepared = self._prepared.setdefault(conn, {})
+        
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            if name not in prepared:
+                cur.execute(f"PREPARE {name} AS {sql}")
+                cur.execute("SELECT parameter_types::text[] AS types FROM pg_prepared_statements WHERE name = %s", (name,))
+                prepared[name] = cur.fetchone()["types"] or []
+            
+            # JSON/JSONB parameters need an explicit adapter; everything else
+            # (including lists for = ANY(...)) uses psycopg2's defaults
+            types = prepared[name]
+            adapted = [
+                Json(value) if i < len(types) and types[i] in ("json", "jsonb") else value
+                for i, value in enumerate(params)
+            ]
+            if adapted:
+                cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(adapted))})", adapted)
+            else:
+                cur.execute(f"EXECUTE {name}")
+            rows = cur.fetchall() if fetch and cur.description else []
+            return [{k: _to_json_shape(v) for k, v in row.items()} for row in rows], cur.rowcount
+    
+    async def _call(
+        self,
+        method: str,
+        table: str,
+        sql: str,
+        params: List[Any],
+        fetch: bool = True,
+        columns: Optional[str] = None,
+        filters: Optional[Filters] = None
+    ):
+        call = SqlCall(lambda: self._run(sql, params, fetch), method, table, columns, filters)
+        return await execute(call)
+    
+    async def select(self, table, columns="*", filters=None, order=None, desc=False, limit=None):
+        sql, params = build_select(table, columns, filters, order, desc, limit)
+        rows, _ = await self._call("GET", table, sql, params, columns=columns, filters=filters)
+        return rows
+    
+    async def insert(self, table, rows):
+        results = []
+        for row in rows if isinstance(rows, list) else [rows]:
+            sql = build_insert(table, list(row.keys()))
+            inserted, _ = await self._call("POST", table, sql, list(row.values()))
+            results.extend(inserted)
+        return results
+    
+    async def update(self, table, values, filters):
+        sql, params = build_update(table, values, filters)
+        rows, _ = await self._call("PATCH", table, sql, params, filters=filters)
+        return rows
+    
+    async def delete(self, table, filters):
+        sql, params = build_delete(table, filters)
+        _, rowcount = await self._call("DELETE", table, sql, params, fetch=False, filters=filters)
+        return rowcount
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["PostgresRepository"]:
+        """Run several statements on one pooled connection, committing at the end"""
+        if self._connection is not None:
+            yield self
+            return
+        
+        conn = await asyncio.to_thread(self.pool.getconn)
+        tx = copy.copy(self)
+        tx._connection = conn
+        try:
+            yield tx
+            await asyncio.to_thread(conn.commit)
+        except Exception:
+            await asyncio.to_thread(conn.rollback)
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+
+@lru_cache()
+def get_repository() -> Repository:
+    """Get the repository selected by Settings.database_backend"""
+    settings = get_settings()
+    if settings.database_backend == "postgres":
+        if not settings.database_url:
+            raise ValueError("DATABASE_URL is required when DATABASE_BACKEND=postgres")
+        return PostgresRepository(
+            settings.database_url,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size
+        )
+    return PostgrestRepository()
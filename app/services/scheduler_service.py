@@ -2,68 +2,91 @@
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MAX_INSTANCES
+from app.config import get_settings
 from app.services.sla_service import SLAService
 from app.services.email_service import EmailService
+from app.services.event_bus import event_bus, LEAD_SLA_BREACHED
 from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+from app.utils.query_budget import track_queries
+from app.services.loaders import Loaders
+from app.services.job_telemetry import job_telemetry
 import asyncio
+from typing import Optional
 
-sla_service = SLAService()
-email_service = EmailService()
+settings = get_settings()
 
 
 class SchedulerService:
     """Service for background job scheduling"""
     
-    def __init__(self):
+    def __init__(self, sla_service: Optional[SLAService] = None, email_service: Optional[EmailService] = None):
         self.scheduler = AsyncIOScheduler()
         self.client = get_supabase_client()
+        self.sla_service = sla_service or SLAService()
+        self.email_service = email_service or EmailService()
     
     def start(self):
         """Start the scheduler"""
-        # Check for approaching deadlines every 5 minutes
-        self.scheduler.add_job(
-            self._check_approaching_deadlines,
-            IntervalTrigger(minutes=5),
-            id="check_approaching_deadlines"
-        )
-        
-        # Check for SLA breaches every 5 minutes
-        self.scheduler.add_job(
-            self._check_sla_breaches,
-            IntervalTrigger(minutes=5),
-            id="check_sla_breaches"
+        interval_minutes = settings.scheduler_interval_minutes
+        jobs = (
+            ("check_approaching_deadlines", self._check_approaching_deadlines),
+            ("check_sla_breaches", self._check_sla_breaches),
         )
+        for job_id, job in jobs:
+            job_telemetry.register(job_id, interval_minutes * 60)
+            self.scheduler.add_job(job, IntervalTrigger(minutes=interval_minutes), id=job_id)
         
+        self.scheduler.add_listener(self._on_job_event, EVENT_JOB_SUBMITTED | EVENT_JOB_MAX_INSTANCES)
         self.scheduler.start()
     
+    def _on_job_event(self, event):
+        """Feed scheduled run times and skipped runs to the job telemetry"""
+        if event.code == EVENT_JOB_SUBMITTED:
+            job_telemetry.job_submitted(event.job_id, event.scheduled_run_times[-1])
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            job_telemetry.job_skipped(event.job_id)
+    
     async def _check_approaching_deadlines(self):
         """Check for leads with approaching deadlines"""
-        try:
-            approaching_leads = await sla_service.get_approaching_deadlines(minutes_window=30)
-            
-            for lead in approaching_leads:
-                # Check if reminder already sent
-                notification = self.client.table("notifications").select("*").eq(
-                    "lead_id", lead["id"]
-                ).eq("message_type", "reminder").execute()
+        async with job_telemetry.run("check_approaching_deadlines") as run:
+            with track_queries("scheduler:check_approaching_deadlines", raise_on_violation=False):
+                approaching_leads = await self.sla_service.get_approaching_deadlines(
+                    minutes_window=settings.reminder_before_deadline_minutes
+                )
+                run.scanned = len(approaching_leads)
+                if not approaching_leads:
+                    return
                 
-                if not notification.data:
-                    await email_service.send_reminder_email(lead)
-        
-        except Exception as e:
-            print(f"Error checking approaching deadlines: {str(e)}")
+                # Leads that already got a reminder, in one query for the whole batch
+                reminded = await execute(self.client.table("notifications").select("lead_id").in_(
+                    "lead_id", [lead["id"] for lead in approaching_leads]
+                ).eq("message_type", "reminder"))
+                reminded_ids = {row["lead_id"] for row in reminded.data or []}
+                run.count("already_reminded", len(reminded_ids))
+                
+                loaders = Loaders()
+                for lead in approaching_leads:
+                    if lead["id"] not in reminded_ids:
+                        sent = await self.email_service.send_reminder_email(lead, loaders)
+                        run.count("emails_sent" if sent else "emails_not_sent")
     
     async def _check_sla_breaches(self):
         """Check for leads that have breached SLA"""
-        try:
-            breached_leads = await sla_service.get_breached_leads()
-            
-            for lead in breached_leads:
+        async with job_telemetry.run("check_sla_breaches") as run:
+            with track_queries("scheduler:check_sla_breaches", raise_on_violation=False):
+                breached_leads = await self.sla_service.get_breached_leads()
+                run.scanned = len(breached_leads)
+                
                 # Mark as SLA breached
-                await sla_service.mark_sla_breached(lead["id"])
+                await self.sla_service.mark_sla_breached_many([lead["id"] for lead in breached_leads])
+                run.count("leads_marked_breached", len(breached_leads))
                 
-                # Send notification to SDR
-                await email_service.send_sla_breach_email(lead, lead["created_by"])
-        
-        except Exception as e:
-            print(f"Error checking SLA breaches: {str(e)}")
+                loaders = Loaders()
+                for lead in breached_leads:
+                    await event_bus.publish(LEAD_SLA_BREACHED, {**lead, "status": "sla_breached"})
+                    
+                    # Send notification to SDR
+                    sent = await self.email_service.send_sla_breach_email(lead, lead["created_by"], loaders)
+                    run.count("emails_sent" if sent else "emails_not_sent")
@@ -3,7 +3,8 @@
 from datetime import datetime, timedelta
 from app.config import get_settings
 from app.utils.supabase_client import get_supabase_client
-from typing import Optional
+from app.utils.resilience import execute
+from typing import List, Optional
 
 settings = get_settings()
 
@@ -25,7 +26,7 @@ class SLAService:
     
     async def check_sla_breach(self, lead_id: str) -> bool:
         """Check if a lead has breached SLA"""
-        lead_response = self.client.table("leads").select("sla_deadline").eq("id", lead_id).execute()
+        lead_response = await execute(self.client.table("leads").select("sla_deadline").eq("id", lead_id))
         
         if not lead_response.data:
             return False
@@ -49,7 +50,7 @@ class SLAService:
         window_start = now
         window_end = now + timedelta(minutes=minutes_window)
         
-        response = self.client.table("leads").select("*").filter(
+        response = await execute(self.client.table("leads").select("*").filter(
             "deadline",
             "gte",
             window_start.isoformat()
@@ -57,7 +58,7 @@ class SLAService:
             "deadline",
             "lte",
             window_end.isoformat()
-        ).eq("status", "active").execute()
+        ).eq("status", "active"))
         
         return response.data if response.data else []
     
@@ -66,16 +67,24 @@ class SLAService:
         from datetime import timezone
         now = datetime.now(timezone.utc)
         
-        response = self.client.table("leads").select("*").filter(
+        response = await execute(self.client.table("leads").select("*").filter(
             "sla_deadline",
             "lt",
             now.isoformat()
-        ).eq("status", "active").execute()
+        ).eq("status", "active"))
         
         return response.data if response.data else []
     
+    async def mark_sla_breached_many(self, lead_ids: List[str]):
+        """Mark several leads as SLA breached in one update"""
+        if not lead_ids:
+            return
+        await execute(self.client.table("leads").update({
+            "status": "sla_breached"
+        }).in_("id", lead_ids).eq("status", "active"))
+    
     async def mark_sla_breached(self, lead_id: str):
         """Mark lead as SLA breached"""
-        self.client.table("leads").update({
+        await execute(self.client.table("leads").update({
             "status": "sla_breached"
-        }).eq("id", lead_id).execute()
+        }).eq("id", lead_id))
@@ -0,0 +1,93 @@
+"""User directory - shared in-process cache for user id to name/email lookups"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Any
+from app.config import get_settings
+from app.utils.supabase_client import get_supabase_client
+from app.utils.resilience import execute
+
+settings = get_settings()
+
+USER_DIRECTORY_COLUMNS = "id, name, email, role"
+
+
+class UserDirectory:
+    """TTL + LRU bounded cache of user profiles with batched miss loading
+
+    Misses for a lookup are loaded with a single `in_` query. Unknown ids are
+    cached as negative entries so repeated lookups of deleted users stay cheap.
+    User admin routes must call invalidate() after writing to the users table.
+    """
+    
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self._client = None
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.user_directory_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.user_directory_max_entries
+        self._entries: "OrderedDict[str, tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_supabase_client()
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single user profile, or None if the user does not exist"""
+        users = await self.get_many([user_id])
+        return users.get(user_id)
+    
+    async def get_many(self, user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get user profiles keyed by id; unknown ids are omitted"""
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        now = time.monotonic()
+        
+        with self._lock:
+            for user_id in set(u for u in user_ids if u):
+                entry = self._entries.get(user_id)
+                if entry is None or entry[0] <= now:
+                    missing.append(user_id)
+                    continue
+                self._entries.move_to_end(user_id)
+                if entry[1] is not None:
+                    found[user_id] = entry[1]
+        
+        if missing:
+            response = await execute(self.client.table("users").select(USER_DIRECTORY_COLUMNS).in_("id", missing))
+            loaded = {user["id"]: user for user in (response.data or [])}
+            found.update(loaded)
+            
+            expires_at = time.monotonic() + self.ttl_seconds
+            with self._lock:
+                for user_id in missing:
+                    self._entries[user_id] = (expires_at, loaded.get(user_id))
+                    self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        
+        return found
+    
+    async def get_name(self, user_id: Optional[str], default: str = "Unassigned") -> str:
+        """Resolve a user id to a display name"""
+        if not user_id:
+            return default
+        user = await self.get(user_id)
+        return user.get("name") if user else default
+    
+    def invalidate(self, user_id: Optional[str] = None):
+        """Drop one cached user, or the whole directory when no id is given"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+user_directory = UserDirectory()
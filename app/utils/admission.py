@@ -0,0 +1,91 @@
+"""Concurrency limits with bounded wait queues for admission control"""
+
+import asyncio
+from collections import deque
+from typing import Deque
+from app.utils.metrics import Counter, Gauge, Histogram
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Requests holding an admission slot", ["lane"]
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued", "Requests waiting for an admission slot", ["lane"]
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds", "Time admitted requests waited for a slot", ["lane"]
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "Requests shed by admission control", ["lane", "reason"]
+)
+
+
+class AdmissionLane:
+    """At most `limit` concurrent holders; up to `max_queue` more wait in FIFO order
+
+    acquire() returns False without waiting when the queue is full, and
+    False after `timeout` seconds if no slot frees up. A released slot is
+    handed straight to the oldest waiter, so late arrivals cannot jump the
+    queue.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            ADMISSION_IN_FLIGHT.inc(self.name)
+            return True
+        if len(self._waiters) >= self.max_queue:
+            ADMISSION_REJECTED.inc(self.name, "queue_full")
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED.inc(self.name)
+        loop_time = asyncio.get_running_loop().time
+        started = loop_time()
+        try:
+            await asyncio.wait({waiter}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            # Client went away while queued; pass on a slot we were just handed
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        finally:
+            ADMISSION_QUEUED.dec(self.name)
+
+        if waiter.done():
+            ADMISSION_WAIT.observe(self.name, value=loop_time() - started)
+            return True
+        self._discard(waiter)
+        ADMISSION_REJECTED.inc(self.name, "timeout")
+        return False
+
+    def release(self):
+        # Hand the slot over rather than freeing it, so `active` is unchanged
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+        ADMISSION_IN_FLIGHT.dec(self.name)
+
+    def _discard(self, waiter: asyncio.Future):
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
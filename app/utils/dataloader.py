@@ -0,0 +1,72 @@
+"""Request-scoped batching loader for related-entity lookups"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+BatchLoadFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class DataLoader:
+    """Collects load() calls made in the same event loop tick into one batch
+
+    Keys are deduplicated and results cached for the loader's lifetime, so
+    a loader should live for a single request. The batch function receives
+    a list of unique keys and returns a dict; missing keys resolve to None.
+    """
+    
+    def __init__(self, batch_load: BatchLoadFn, max_batch_size: int = 500):
+        self._batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._pending: List[Hashable] = []
+        self._scheduled = False
+        self.batches = 0
+    
+    def load(self, key: Hashable) -> Awaitable[Optional[Any]]:
+        """Schedule a key for the next batch and return a future for its value"""
+        future = self._cache.get(key)
+        if future is not None:
+            return future
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._pending.append(key)
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(lambda: loop.create_task(self._dispatch()))
+        return future
+    
+    async def load_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Load several keys in one batch, returning only the ones found"""
+        keys = list(dict.fromkeys(k for k in keys if k))
+        values = await asyncio.gather(*(self.load(k) for k in keys))
+        return {k: v for k, v in zip(keys, values) if v is not None}
+    
+    def clear(self, key: Optional[Hashable] = None):
+        """Forget one cached key, or everything"""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+    
+    async def _dispatch(self):
+        keys, self._pending, self._scheduled = self._pending, [], False
+        for start in range(0, len(keys), self.max_batch_size):
+            await self._load_batch(keys[start:start + self.max_batch_size])
+    
+    async def _load_batch(self, keys: List[Hashable]):
+        self.batches += 1
+        try:
+            results = await self._batch_load(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+        
+        for key in keys:
+            future = self._cache.get(key)
+            if future is not None and not future.done():
+                future.set_result(results.get(key))
@@ -0,0 +1,59 @@
+"""Weak ETags and If-None-Match handling for conditional GETs
+
+Single rows are versioned by their updated_at (W/"<updated_at>", plus a
+variant suffix where one row has several representations), which clients
+can also send back as If-Match on updates. Lists are versioned by
+a hash of the encoded body. Responses carry Cache-Control: no-cache so
+polling clients revalidate on every request instead of using stale copies.
+"""
+
+import hashlib
+from typing import Optional
+from fastapi import Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(version: str) -> str:
+    return f'W/"{version}"'
+
+
+def content_etag(body: bytes) -> str:
+    """Weak ETag from a hash of the response body"""
+    return weak_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag.strip('"')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
+
+
+def conditional_response(response: Response, if_none_match: Optional[str]) -> Response:
+    """Tag an encoded response with a content ETag, or swap it for a 304 on match"""
+    etag = content_etag(response.body)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,203 @@
+"""Structured, non-blocking application logging
+
+Modules log through the standard library (`logger = get_logger(__name__)`).
+configure_logging() routes the "app" logger hierarchy through a queue: the
+calling thread or event loop only formats the message and enqueues it, and
+a background listener thread writes JSON lines to stdout. Each record
+carries the request id and any other fields bound for the current request
+or scheduler job.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+from app.config import get_settings
+
+APP_LOGGER = "app"
+
+# Fields bound to the current request or job, shared by reference so values
+# bound deep in a dependency are seen by everything later in the request
+_log_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("log_context", default=None)
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+def bind(**fields: Any):
+    """Add fields (e.g. user_id) to every record logged later in this request or job"""
+    context = _log_context.get()
+    if context is None:
+        _log_context.set(dict(fields))
+    else:
+        context.update(fields)
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[Dict[str, Any]]:
+    """Start a new logging context (a request or a job run) inside the block"""
+    context = {**(_log_context.get() or {}), **fields}
+    token = _log_context.set(context)
+    try:
+        yield context
+    finally:
+        _log_context.reset(token)
+
+
+def current_context() -> Dict[str, Any]:
+    return dict(_log_context.get() or {})
+
+
+class ContextFilter(logging.Filter):
+    """Copy the bound request/job fields onto each record when it is logged"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = current_context()
+        return True
+
+
+class RepeatLimitFilter(logging.Filter):
+    """Let each distinct message through at most `limit` times per window
+
+    Messages are keyed by logger and unformatted template, so "SMTP send
+    failed: %s" during an outage is one key whatever the error text. The
+    first record after a window closes reports how many were suppressed.
+    """
+
+    def __init__(self, limit: int, window_seconds: float):
+        super().__init__()
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._windows: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            window[1] += 1
+            if window[1] > self.limit:
+                window[2] += 1
+                return False
+            return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue without ever waiting; records are dropped (and counted) if the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render message and traceback now: args and exc_info may not survive the hand-off
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", None) or {})
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "context":
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human readable lines for local development"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s %(message)s%(fields)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {**(getattr(record, "context", None) or {})}
+        fields.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS and k not in ("context", "fields")})
+        record.fields = "".join(f" {k}={v}" for k, v in fields.items())
+        return super().format(record)
+
+
+def parse_levels(value: str) -> Dict[str, str]:
+    """"app.services.email_service=DEBUG,app.utils=WARNING" -> {module: level}"""
+    levels = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        name, _, level = part.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging():
+    """Route the app's loggers through the queue (called from the lifespan)"""
+    global _listener
+    if _listener is not None:
+        return
+    settings = get_settings()
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RepeatLimitFilter(settings.log_repeat_limit, settings.log_repeat_window_seconds))
+    handler.addFilter(ContextFilter())
+
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.handlers = [handler]
+    app_logger.propagate = False
+    app_logger.setLevel(settings.log_level.upper())
+    for name, level in parse_levels(settings.log_levels).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,204 @@
+"""In-process metrics with Prometheus text exposition"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.utils.resilience import call_observers
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+
+# Upstream calls made while serving the current request, per service
+_request_calls: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_calls", default=None)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Base class: a named family of labelled series"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(v) for v in labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines for every series of the family"""
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, *labels: str, value: float):
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts followed by sum and count
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = _labels(self.labelnames, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_number(series[-1])}")
+        return lines
+
+
+REGISTRY: List[Metric] = []
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"]
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ["method", "route"]
+)
+REQUEST_UPSTREAM_CALLS = Histogram(
+    "http_request_upstream_calls", "Upstream calls made while serving one request",
+    ["method", "route", "service"], buckets=CALL_COUNT_BUCKETS
+)
+UPSTREAM_CALLS = Counter(
+    "upstream_calls_total", "Upstream calls by service, operation and outcome", ["service", "operation", "outcome"]
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_call_duration_seconds", "Upstream call latency", ["service", "operation"]
+)
+
+UPSTREAM_SERVICES = ("postgrest", "gotrue", "smtp")
+
+# Callbacks receiving (service, operation, outcome, seconds) for every upstream call
+upstream_observers: List[Callable[[str, str, str, float], None]] = []
+
+
+def record_upstream_call(service: str, operation: str, outcome: str, seconds: float):
+    """Record one upstream call, globally and against the current request"""
+    UPSTREAM_CALLS.inc(service, operation, outcome)
+    if outcome != "circuit_open":
+        UPSTREAM_LATENCY.observe(service, operation, value=seconds)
+        calls = _request_calls.get()
+        if calls is not None:
+            calls[service] = calls.get(service, 0) + 1
+    for observer in upstream_observers:
+        observer(service, operation, outcome, seconds)
+
+
+@contextmanager
+def upstream_call(service: str, operation: str) -> Iterator[None]:
+    """Time a call to an upstream service that does not go through resilience.execute"""
+    started = time.perf_counter()
+    outcome = "success"
+    try:
+        yield
+    except Exception:
+        outcome = "failure"
+        raise
+    finally:
+        record_upstream_call(service, operation, outcome, time.perf_counter() - started)
+
+
+def start_request_tally() -> Dict[str, int]:
+    """Begin counting upstream calls for the current request"""
+    calls: Dict[str, int] = {}
+    _request_calls.set(calls)
+    return calls
+
+
+def render_metrics() -> str:
+    """All registered metrics in Prometheus text format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+call_observers.append(
+    lambda operation, outcome, seconds: record_upstream_call("postgrest", operation, outcome, seconds)
+)
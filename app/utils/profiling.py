@@ -0,0 +1,198 @@
+"""Sampling profiler for single requests (opt-in, see ProfilingMiddleware)"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.config import get_settings
+from app.utils.metrics import upstream_observers
+
+# Innermost frames meaning the event loop was waiting for I/O, not running Python
+IDLE_FRAMES = {("selectors.py", "select"), ("selectors.py", "poll")}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", code.co_filename)
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (code.co_filename.rsplit("/", 1)[-1], code.co_name) in IDLE_FRAMES
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a background thread
+
+    Stacks are folded root-first ("a;b;c") and counted, the input format of
+    flamegraph.pl and speedscope. Samples where the thread is parked in the
+    event loop selector are counted as idle rather than stored.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            if _is_idle(frame):
+                self.idle_samples += 1
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+
+class RequestProfile:
+    """Timing breakdown and sampled stacks for one request"""
+
+    def __init__(self, method: str, path: str, interval: float):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self.status_code: Optional[int] = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.upstream: Dict[str, Dict[str, float]] = {}
+        self.sampler = StackSampler(threading.get_ident(), interval)
+        self._started = 0.0
+        self._cpu_started = 0.0
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._cpu_started = time.thread_time()
+        self.sampler.start()
+
+    def measure(self):
+        """Update wall and CPU time to now"""
+        self.wall_seconds = time.perf_counter() - self._started
+        self.cpu_seconds = time.thread_time() - self._cpu_started
+
+    def stop(self):
+        self.sampler.stop()
+        self.measure()
+
+    def record_upstream(self, service: str, seconds: float):
+        totals = self.upstream.setdefault(service, {"calls": 0, "seconds": 0.0})
+        totals["calls"] += 1
+        totals["seconds"] += seconds
+
+    @property
+    def upstream_seconds(self) -> float:
+        return sum(totals["seconds"] for totals in self.upstream.values())
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, shown in browser dev tools"""
+        return (
+            f"upstream;dur={self.upstream_seconds * 1000:.1f}, "
+            f"cpu;dur={self.cpu_seconds * 1000:.1f}, "
+            f"total;dur={self.wall_seconds * 1000:.1f}"
+        )
+
+    def folded(self) -> str:
+        """Collapsed stacks, one "frame;frame;frame count" line each"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.sampler.stacks.most_common())
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "started_at": self.started_at.isoformat(),
+            "wall_ms": round(self.wall_seconds * 1000, 2),
+            "upstream_ms": round(self.upstream_seconds * 1000, 2),
+            "cpu_ms": round(self.cpu_seconds * 1000, 2),
+            # Wall time neither in upstream calls nor on the CPU: scheduling,
+            # thread pool hand-offs and waiting behind other requests
+            "other_ms": round(max(self.wall_seconds - self.upstream_seconds - self.cpu_seconds, 0) * 1000, 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.summary(),
+            "upstream": {
+                service: {"calls": int(totals["calls"]), "ms": round(totals["seconds"] * 1000, 2)}
+                for service, totals in self.upstream.items()
+            },
+            "samples": self.sampler.samples,
+            "idle_samples": self.sampler.idle_samples,
+            "sample_interval_ms": self.sampler.interval * 1000,
+        }
+
+
+class ProfileStore:
+    """The most recent profiles, kept in memory for the admin endpoints"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+    def recent(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+
+profile_store = ProfileStore(get_settings().profiling_max_profiles)
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+_observer_installed = False
+
+
+def _record_upstream(service: str, operation: str, outcome: str, seconds: float):
+    profile = _profile.get()
+    if profile is not None:
+        profile.record_upstream(service, seconds)
+
+
+def install_upstream_observer():
+    """Start attributing upstream call time to profiled requests (called once profiling is enabled)"""
+    global _observer_installed
+    if not _observer_installed:
+        upstream_observers.append(_record_upstream)
+        _observer_installed = True
+
+
+def activate(profile: RequestProfile):
+    """Attribute upstream calls in the current context to `profile`"""
+    return _profile.set(profile)
+
+
+def deactivate(token):
+    _profile.reset(token)
@@ -0,0 +1,127 @@
+"""N+1 query detection and per-request query budgets (debug/staging)"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+from app.config import get_settings
+from app.utils.resilience import before_call_hooks
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+QUERY_BUDGET_MODES = ("off", "warn", "raise")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in QUERY_BUDGET_MODE=raise when a request repeats or overspends queries"""
+
+
+def fingerprint(query) -> str:
+    """Shape of a PostgREST query: method, table and filter operators without values
+
+    GET leads?id=eq.1 and GET leads?id=eq.2 share the fingerprint
+    "GET leads?id=eq", which is what an N+1 loop looks like.
+    """
+    method = getattr(query, "http_method", "GET")
+    path = str(getattr(query, "path", "") or "").strip("/")
+    params = getattr(query, "params", None)
+    parts = []
+    for key, value in params.multi_items() if params is not None else []:
+        if key in ("select", "order"):
+            parts.append(f"{key}={value}")
+        elif key in ("limit", "offset"):
+            parts.append(key)
+        else:
+            parts.append(f"{key}={str(value).split('.', 1)[0]}")
+    shape = "&".join(sorted(parts))
+    return f"{method} {path}?{shape}" if shape else f"{method} {path}"
+
+
+class QueryTracker:
+    """Fingerprints of the queries issued by one request or background job"""
+
+    def __init__(
+        self,
+        name: str,
+        mode: str,
+        repeat_threshold: int,
+        budget: Optional[int] = None,
+        raise_on_violation: bool = True
+    ):
+        self.name = name
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+        self.budget = budget
+        self.raise_on_violation = raise_on_violation
+        self.counts: Counter = Counter()
+        self.violations: List[str] = []
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, query_fingerprint: str):
+        self.counts[query_fingerprint] += 1
+        count = self.counts[query_fingerprint]
+
+        # Report each problem once, when it first crosses the limit
+        if count == self.repeat_threshold + 1:
+            self._violation(
+                f"{self.name}: query repeated more than {self.repeat_threshold} times "
+                f"(possible N+1): {query_fingerprint}"
+            )
+        if self.budget is not None and self.total == self.budget + 1:
+            self._violation(f"{self.name}: more than {self.budget} queries in one request")
+
+    def _violation(self, message: str):
+        self.violations.append(message)
+        if self.mode == "raise" and self.raise_on_violation:
+            raise QueryBudgetExceeded(message)
+        logger.warning("Query budget exceeded: %s", message)
+
+
+_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+
+
+def _record_query(query):
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(fingerprint(query))
+
+
+before_call_hooks.append(_record_query)
+
+
+@contextmanager
+def track_queries(name: str, budget: Optional[int] = None, raise_on_violation: bool = True) -> Iterator[Optional[QueryTracker]]:
+    """Track queries issued inside the block; a no-op when QUERY_BUDGET_MODE=off"""
+    settings = get_settings()
+    if settings.query_budget_mode == "off":
+        yield None
+        return
+
+    tracker = QueryTracker(
+        name,
+        settings.query_budget_mode,
+        settings.query_repeat_threshold,
+        budget if budget is not None else settings.default_query_budget,
+        raise_on_violation
+    )
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+def query_budget(max_queries: int):
+    """Route dependency declaring how many upstream queries the route may issue
+
+    Usage: @router.get("/{lead_id}", dependencies=[Depends(query_budget(4))])
+    """
+    async def apply_budget():
+        tracker = _tracker.get()
+        if tracker is not None:
+            tracker.budget = max_queries
+    return apply_budget
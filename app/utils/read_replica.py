@@ -0,0 +1,107 @@
+"""Read-replica routing for read-only queries"""
+
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+from app.config import get_settings
+from app.utils.resilience import CircuitOpenError, execute, is_transient_error
+from app.utils.supabase_client import get_supabase_client, get_supabase_replica_client
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# User behind the current request, set by get_current_user
+current_user_id: ContextVar[Optional[str]] = ContextVar("current_user_id", default=None)
+
+
+class ReadRouter:
+    """Send reads to the replica and writes to the primary
+
+    A user who wrote within the last `sticky_seconds` reads from the primary
+    so they see their own changes despite replication lag. When a replica
+    read fails with a connection-level error or runs past its deadline the
+    replica is skipped for `retry_after_seconds` and the read is repeated on
+    the primary.
+    Stickiness is tracked per process.
+    """
+
+    def __init__(
+        self,
+        primary=None,
+        replica=None,
+        sticky_seconds: Optional[float] = None,
+        retry_after_seconds: Optional[float] = None
+    ):
+        settings = get_settings()
+        self._primary = primary
+        self._replica = replica
+        self.replica_configured = replica is not None or bool(settings.supabase_read_replica_url)
+        self.sticky_seconds = settings.read_your_writes_seconds if sticky_seconds is None else sticky_seconds
+        self.retry_after_seconds = (
+            settings.replica_retry_after_seconds if retry_after_seconds is None else retry_after_seconds
+        )
+        self._recent_writers: Dict[str, float] = {}
+        self._replica_down_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self):
+        if self._primary is None:
+            self._primary = get_supabase_client()
+        return self._primary
+
+    @property
+    def replica(self):
+        if self._replica is None:
+            self._replica = get_supabase_replica_client()
+        return self._replica
+
+    def mark_write(self, user_id: Optional[str] = None):
+        """Pin the user's reads to the primary for the read-your-writes window"""
+        user_id = user_id or current_user_id.get()
+        if not user_id or not self.replica_configured:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writers[user_id] = now + self.sticky_seconds
+            if len(self._recent_writers) > 1000:
+                self._recent_writers = {u: t for u, t in self._recent_writers.items() if t > now}
+
+    def replica_healthy(self) -> bool:
+        return time.monotonic() >= self._replica_down_until
+
+    def mark_replica_unhealthy(self):
+        self._replica_down_until = time.monotonic() + self.retry_after_seconds
+
+    def use_replica(self, user_id: Optional[str] = None) -> bool:
+        """Whether a read for this user should go to the replica"""
+        if not self.replica_configured or not self.replica_healthy():
+            return False
+        user_id = user_id or current_user_id.get()
+        if user_id:
+            sticky_until = self._recent_writers.get(user_id)
+            if sticky_until and sticky_until > time.monotonic():
+                return False
+        return True
+
+    async def execute(self, build: Callable[[Any], Any], user_id: Optional[str] = None):
+        """Build a read query against the chosen client and execute it
+
+        `build` receives a Supabase client and returns a query builder; it is
+        called again with the primary if the replica turns out to be down.
+        Reads are idempotent, so read-only RPCs are retried as well.
+        """
+        if self.use_replica(user_id):
+            try:
+                return await execute(build(self.replica), idempotent=True)
+            except Exception as e:
+                if not (is_transient_error(e) or isinstance(e, (asyncio.TimeoutError, CircuitOpenError))):
+                    raise
+                logger.warning("Read replica unavailable, failing back to primary: %s", e)
+                self.mark_replica_unhealthy()
+        return await execute(build(self.primary), idempotent=True)
+
+
+read_router = ReadRouter()
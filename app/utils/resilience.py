@@ -0,0 +1,191 @@
+"""Timeouts, retries and circuit breaking for PostgREST (and direct Postgres) calls"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from postgrest.exceptions import APIError
+from app.config import get_settings
+from app.utils.log import get_logger
+
+try:
+    from psycopg2 import InterfaceError as DriverInterfaceError, OperationalError as DriverOperationalError
+    DRIVER_TRANSIENT_ERRORS = (DriverInterfaceError, DriverOperationalError)
+except ImportError:
+    DRIVER_TRANSIENT_ERRORS = ()
+
+logger = get_logger(__name__)
+
+# PostgREST errors meaning "the database behind this endpoint is unavailable"
+UNAVAILABLE_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+# Callbacks receiving (operation, outcome, seconds) for every call
+call_observers: List[Callable[[str, str, float], None]] = []
+
+# Callbacks receiving each query before it is first sent; raising aborts the call
+before_call_hooks: List[Callable[[Any], None]] = []
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while a circuit breaker is open"""
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether an error is a connection/availability problem rather than a bad query"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, DRIVER_TRANSIENT_ERRORS):
+        # Lost or refused connections from the direct Postgres backend
+        return True
+    if isinstance(error, APIError):
+        # Non-JSON gateway responses carry the HTTP status as an int; JSON errors
+        # carry a SQLSTATE or PGRST code string
+        if isinstance(error.code, int):
+            return error.code >= 500
+        return error.code in UNAVAILABLE_CODES
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker
+
+    After `failure_threshold` transient failures in a row the circuit opens
+    and calls fail fast with CircuitOpenError. Once `reset_seconds` have
+    passed a single trial call is let through; success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                raise CircuitOpenError("Upstream unavailable, circuit breaker is open")
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Circuit breaker for one upstream endpoint (primary and replica trip independently)"""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            settings = get_settings()
+            breaker = CircuitBreaker(
+                settings.circuit_breaker_failure_threshold,
+                settings.circuit_breaker_reset_seconds
+            )
+            _breakers[endpoint] = breaker
+        return breaker
+
+
+def _describe(query) -> tuple:
+    session = getattr(query, "session", None)
+    endpoint = str(getattr(session, "base_url", "") or "default")
+    path = str(getattr(query, "path", "") or "").strip("/")
+    method = getattr(query, "http_method", "GET")
+    return endpoint, f"{method} {path}".strip(), method
+
+
+def _report(operation: str, outcome: str, seconds: float):
+    for observer in call_observers:
+        try:
+            observer(operation, outcome, seconds)
+        except Exception as e:
+            logger.exception("Call observer failed")
+
+
+async def execute(query, idempotent: Optional[bool] = None) -> Any:
+    """Execute a PostgREST query off the event loop with retries and circuit breaking
+
+    Each attempt is bounded by the client timeout (SUPABASE_TIMEOUT_SECONDS)
+    and by whatever is left of SUPABASE_CALL_DEADLINE_SECONDS, after which
+    the caller gets TimeoutError. The worker thread cannot be interrupted,
+    so a write abandoned at the deadline may still commit. Idempotent calls
+    (GET/HEAD, or idempotent=True for read-only RPCs) are retried on
+    transient errors with jittered exponential backoff; writes never are.
+    """
+    settings = get_settings()
+    endpoint, operation, method = _describe(query)
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    retries = settings.supabase_read_retries if idempotent else 0
+    breaker = get_breaker(endpoint)
+    deadline = time.monotonic() + settings.supabase_call_deadline_seconds
+    
+    for hook in before_call_hooks:
+        hook(query)
+
+    attempt = 0
+    while True:
+        started = time.monotonic()
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            _report(operation, "circuit_open", 0.0)
+            raise
+
+        try:
+            response = await asyncio.wait_for(asyncio.to_thread(query.execute), deadline - started)
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            _report(operation, "failure", time.monotonic() - started)
+            raise
+        except Exception as e:
+            elapsed = time.monotonic() - started
+            if not is_transient_error(e):
+                # The endpoint answered; a bad query says nothing about its health
+                breaker.record_success()
+                _report(operation, "error", elapsed)
+                raise
+
+            breaker.record_failure()
+            backoff = settings.supabase_retry_backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if attempt >= retries or time.monotonic() + backoff >= deadline:
+                _report(operation, "failure", elapsed)
+                raise
+
+            _report(operation, "retry", elapsed)
+            attempt += 1
+            await asyncio.sleep(backoff)
+            continue
+
+        breaker.record_success()
+        _report(operation, "success", time.monotonic() - started)
+        return response
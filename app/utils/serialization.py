@@ -0,0 +1,37 @@
+"""Fast JSON serialization for list endpoints
+
+FastAPI's default path validates the return value against response_model,
+dumps it to Python objects, runs jsonable_encoder over the result and then
+json.dumps. For list endpoints we validate once with a precompiled
+TypeAdapter and let pydantic-core write the JSON bytes directly. The output
+is byte-for-byte what the default path produces.
+"""
+
+from typing import Any, Dict, List
+from fastapi import Response
+from pydantic import TypeAdapter
+from app.models.lead import LeadResponse, LeadSummaryResponse, LeadPartialResponse
+from app.models.user import UserResponse
+
+LEAD_LIST_ADAPTER = TypeAdapter(List[LeadResponse])
+LEAD_SUMMARY_LIST_ADAPTER = TypeAdapter(List[LeadSummaryResponse])
+LEAD_PARTIAL_LIST_ADAPTER = TypeAdapter(List[LeadPartialResponse])
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+AUDIT_LOG_LIST_ADAPTER = TypeAdapter(List[Dict[str, Any]])
+
+
+def dump_json(adapter: TypeAdapter, rows: Any) -> bytes:
+    """Validate rows against the adapter's type and encode them as JSON"""
+    return adapter.dump_json(adapter.validate_python(rows))
+
+
+def json_response(adapter: TypeAdapter, rows: Any, status_code: int = 200) -> Response:
+    """Build a JSON response through the fast path"""
+    return Response(content=dump_json(adapter, rows), status_code=status_code, media_type="application/json")
+
+
+def fields_response(adapter: TypeAdapter, rows: List[Dict[str, Any]], fields: List[str]) -> Response:
+    """Build a JSON response containing only the requested fields of each row"""
+    trimmed = [{key: row[key] for key in fields if key in row} for row in rows]
+    body = adapter.dump_json(adapter.validate_python(trimmed), exclude_unset=True)
+    return Response(content=body, media_type="application/json")
@@ -1,22 +1,48 @@
 """Supabase client initialization and utilities"""
 
-from supabase import create_client, Client
+from functools import lru_cache
+from supabase import create_client, Client, ClientOptions
 from app.config import get_settings
 
 
+def _client_options() -> ClientOptions:
+    """Client options with an explicit PostgREST request timeout"""
+    return ClientOptions(postgrest_client_timeout=get_settings().supabase_timeout_seconds)
+
+
+@lru_cache()
 def get_supabase_client() -> Client:
-    """Initialize and return Supabase client with service role key"""
+    """Shared Supabase client with service role key, built on first use
+
+    One per process: it never signs in, so it carries no user session.
+    """
     settings = get_settings()
     return create_client(
         supabase_url=settings.supabase_url,
-        supabase_key=settings.supabase_service_role_key
+        supabase_key=settings.supabase_service_role_key,
+        options=_client_options()
+    )
+
+
+@lru_cache()
+def get_supabase_replica_client() -> Client:
+    """Shared service role client for the read replica, built on first use"""
+    settings = get_settings()
+    return create_client(
+        supabase_url=settings.supabase_read_replica_url,
+        supabase_key=settings.supabase_service_role_key,
+        options=_client_options()
     )
 
 
 def get_supabase_anon_client() -> Client:
-    """Initialize and return Supabase client with anon key (user-scoped)"""
+    """Initialize and return Supabase client with anon key (user-scoped)
+
+    Not shared: sign_in_with_password stores the user's session on the client.
+    """
     settings = get_settings()
     return create_client(
         supabase_url=settings.supabase_url,
-        supabase_key=settings.supabase_anon_key
+        supabase_key=settings.supabase_anon_key,
+        options=_client_options()
     )
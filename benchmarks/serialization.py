@@ -0,0 +1,76 @@
+"""Benchmark: default FastAPI response encoding vs the fast TypeAdapter path
+
+Run with:  python -m benchmarks.serialization [rows] [iterations]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from app.models.lead import LeadResponse
+from app.utils.serialization import LEAD_LIST_ADAPTER, dump_json
+
+
+def make_leads(count: int) -> List[dict]:
+    """Build lead rows shaped like PostgREST output"""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Lead {i} — Ünïcode Co",
+            "email": f"lead{i}@example.com",
+            "website": f"https://lead{i}.example.com",
+            "source": "web",
+            "status": "active",
+            "deadline": (now + timedelta(hours=i)).isoformat(),
+            "notes": "Called twice, wants a demo next week. " * 4,
+            "sla_deadline": (now + timedelta(hours=i)).isoformat(),
+            "custom_fields": {"industry": "fintech", "budget": 50000 + i, "qualified": True},
+            "assignee_id": str(uuid.uuid4()),
+            "assignee_name": "Ann Example",
+            "created_by": str(uuid.uuid4()),
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def default_path(loop, field, rows) -> bytes:
+    """What FastAPI does for a route declared with response_model=List[LeadResponse]"""
+    content = loop.run_until_complete(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content).body
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main(rows: int = 100, iterations: int = 500):
+    leads = make_leads(rows)
+    field = create_model_field("Response_list_leads", List[LeadResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+    
+    default_body = default_path(loop, field, leads)
+    fast_body = dump_json(LEAD_LIST_ADAPTER, leads)
+    assert default_body == fast_body, "fast path output differs from FastAPI's default encoding"
+    
+    default_ms = timed(lambda: default_path(loop, field, leads), iterations)
+    fast_ms = timed(lambda: dump_json(LEAD_LIST_ADAPTER, leads), iterations)
+    
+    print(f"{rows} leads/page, {len(fast_body)} bytes, outputs identical")
+    print(f"default FastAPI encoding: {default_ms:.3f} ms/page")
+    print(f"fast TypeAdapter path:    {fast_ms:.3f} ms/page ({default_ms / fast_ms:.1f}x faster)")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,217 @@
+"""Scripted load-test workloads against the API
+
+Seed data first with benchmarks.datagen, start the API against the same
+database, then run e.g.:
+
+    python -m benchmarks.workload http://localhost:8000 --users 20 --duration 60
+    python -m benchmarks.workload http://localhost:8000 --mix browse=1 --users 50
+
+Virtual users run scenarios picked by weight (--mix) back to back for
+--duration seconds. Throughput and latency percentiles are reported per
+operation; --json writes the same report for comparing runs.
+
+Scenarios:
+    browse     SDR board: list pages, open a lead, page its history, search
+    assign     bulk assigns: reassign a handful of leads in a row
+    dashboard  dashboard polling: metrics and leads-per-assignee
+    sla        SLA sweep: the scheduler's deadline and breach jobs, in-process
+               against the database configured in the environment
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+import httpx
+from benchmarks.datagen import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD
+
+DEFAULT_MIX = {"browse": 70, "assign": 10, "dashboard": 15, "sla": 5}
+SEARCH_TERMS = ["bench", "lead", "acme", "fintech", "follow", "discovery"]
+
+
+class Recorder:
+    """Latencies and errors per operation"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def timed(self, operation: str, call):
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception:
+            self.errors[operation] += 1
+            return None
+        self.latencies[operation].append(time.perf_counter() - started)
+        if isinstance(result, httpx.Response) and result.status_code >= 400:
+            self.errors[operation] += 1
+        return result
+
+    def report(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        rows = {}
+        for operation in sorted(set(self.latencies) | set(self.errors)):
+            samples = sorted(self.latencies[operation])
+            count = len(samples)
+            if count >= 2:
+                cuts = statistics.quantiles(samples, n=100)
+                p50, p95, p99 = statistics.median(samples), cuts[94], cuts[98]
+            else:
+                p50 = p95 = p99 = samples[0] if samples else 0.0
+            rows[operation] = {
+                "requests": count,
+                "errors": self.errors[operation],
+                "rps": count / elapsed,
+                "p50_ms": p50 * 1000,
+                "p95_ms": p95 * 1000,
+                "p99_ms": p99 * 1000,
+            }
+        return rows
+
+
+class VirtualUser:
+    """One signed-in SDR issuing scenario steps"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, lead_ids: List[str], assignee_ids: List[str]):
+        self.client = client
+        self.recorder = recorder
+        self.lead_ids = lead_ids
+        self.assignee_ids = assignee_ids
+        self.headers: Dict[str, str] = {}
+
+    async def login(self, email: str):
+        response = await self.client.post("/api/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def get(self, operation: str, url: str, **params):
+        return self.recorder.timed(operation, self.client.get(url, params=params, headers=self.headers))
+
+    async def browse(self):
+        for page in range(random.randint(1, 3)):
+            await self.get("list_leads", "/api/leads", skip=page * 20, limit=20, fields="summary")
+        lead_id = random.choice(self.lead_ids)
+        await self.get("lead_detail", f"/api/leads/{lead_id}")
+        await self.get("lead_history", f"/api/leads/{lead_id}/history", limit=20)
+        await self.get("search_leads", "/api/leads/search", q=random.choice(SEARCH_TERMS), limit=20)
+
+    async def assign(self):
+        for lead_id in random.sample(self.lead_ids, min(5, len(self.lead_ids))):
+            await self.recorder.timed("assign_lead", self.client.post(
+                f"/api/leads/{lead_id}/assign",
+                json={"assignee_id": random.choice(self.assignee_ids), "comment": "load test"},
+                headers=self.headers,
+            ))
+
+    async def dashboard(self):
+        await self.get("dashboard_metrics", "/api/dashboard/metrics")
+        await self.get("dashboard_per_assignee", "/api/dashboard/leads-per-assignee")
+
+    async def sla(self):
+        from app.container import get_scheduler_service
+
+        scheduler_service = get_scheduler_service()
+        await self.recorder.timed("sla_approaching_deadlines", scheduler_service._check_approaching_deadlines())
+        await self.recorder.timed("sla_breaches", scheduler_service._check_sla_breaches())
+
+
+async def discover(client: httpx.AsyncClient, headers: Dict[str, str]) -> tuple:
+    """Sample lead and assignee ids to drive the scenarios with"""
+    lead_ids: List[str] = []
+    for page in range(5):
+        response = await client.get("/api/leads", params={"skip": page * 100, "limit": 100, "fields": "id"}, headers=headers)
+        response.raise_for_status()
+        lead_ids.extend(lead["id"] for lead in response.json())
+    users = await client.get("/api/users", headers=headers)
+    assignee_ids = [u["id"] for u in users.json() if u.get("role") == "assignee"] if users.is_success else []
+    if not lead_ids:
+        raise SystemExit("No leads found - seed data with python -m benchmarks.datagen first")
+    return lead_ids, assignee_ids
+
+
+async def run(base_url: str, users: int, duration: float, mix: Dict[str, int], sdrs: int, app=None) -> Dict:
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app) if app is not None else None
+    limits = httpx.Limits(max_connections=users * 2)
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=60) as client:
+        # Discovery runs as an admin so the users listing is allowed
+        admin = VirtualUser(client, recorder, [], [])
+        await admin.login(f"admin0@{BENCH_EMAIL_DOMAIN}")
+        lead_ids, assignee_ids = await discover(client, admin.headers)
+        if not assignee_ids:
+            mix = {name: weight for name, weight in mix.items() if name != "assign"}
+
+        vus = []
+        for i in range(users):
+            vu = VirtualUser(client, recorder, lead_ids, assignee_ids)
+            await vu.login(f"sdr{i % sdrs}@{BENCH_EMAIL_DOMAIN}")
+            vus.append(vu)
+
+        names, weights = list(mix), list(mix.values())
+        deadline = time.monotonic() + duration
+
+        async def loop(vu: VirtualUser):
+            while time.monotonic() < deadline:
+                await getattr(vu, random.choices(names, weights)[0])()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(loop(vu) for vu in vus))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "base_url": base_url,
+        "users": users,
+        "duration_s": elapsed,
+        "mix": mix,
+        "operations": recorder.report(elapsed),
+    }
+
+
+def print_report(report: Dict):
+    print(f"{report['users']} users for {report['duration_s']:.0f}s against {report['base_url']}, mix {report['mix']}")
+    print(f"{'operation':<28}{'requests':>10}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in report["operations"].items():
+        print(f"{name:<28}{row['requests']:>10}{row['errors']:>8}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, int]:
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive scripted workloads against the API")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="e.g. browse=70,assign=10,dashboard=15,sla=5")
+    parser.add_argument("--sdrs", type=int, default=10, help="distinct seeded SDR accounts to sign in as")
+    parser.add_argument("--in-process", action="store_true", help="call app.main in-process instead of over HTTP")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    app = None
+    if args.in_process:
+        from app.main import app
+
+    report = asyncio.run(run(args.base_url, args.users, args.duration, args.mix or dict(DEFAULT_MIX), args.sdrs, app))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
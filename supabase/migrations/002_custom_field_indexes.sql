@@ -0,0 +1,58 @@
+-- =============================================
+-- Indexes for filtering leads on custom field values
+-- Version: 1.1
+-- =============================================
+
+-- =============================================
+-- TABLE: custom_fields
+-- Description: Admin-defined lead fields stored in leads.custom_fields
+-- (already present in existing projects, declared here for fresh installs)
+-- =============================================
+CREATE TABLE IF NOT EXISTS custom_fields (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    name VARCHAR(255) NOT NULL,
+    field_type VARCHAR(50) NOT NULL CHECK (field_type IN ('text', 'number', 'date', 'select', 'checkbox')),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    options JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =============================================
+-- FUNCTION: custom_field_index_statements
+-- Description: CREATE INDEX CONCURRENTLY statements for filtering leads on
+-- custom field values, so building them never blocks writes to leads.
+-- Equality filters (cf=name:eq:value) are sent as JSONB containment, which
+-- one jsonb_path_ops GIN index serves for every field at once. Range and
+-- membership filters get an expression index per active field: numbers are
+-- indexed as JSONB (numeric ordering), everything else as extracted text
+-- (ISO dates sort correctly as text).
+--
+-- CONCURRENTLY cannot run inside a transaction or a function, so this
+-- migration only defines the statements. Build the indexes from psql in
+-- autocommit mode (not the SQL editor, which wraps a script in a
+-- transaction), and again after adding commonly filtered fields:
+--   SELECT custom_field_index_statements() \gexec
+-- A failed concurrent build leaves an INVALID index; drop it and re-run.
+-- =============================================
+CREATE OR REPLACE FUNCTION custom_field_index_statements()
+RETURNS SETOF TEXT AS $$
+    SELECT 'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leads_custom_fields '
+        || 'ON leads USING GIN (custom_fields jsonb_path_ops)'
+    UNION ALL
+    SELECT format(
+        CASE WHEN field_type = 'number'
+            THEN 'CREATE INDEX CONCURRENTLY IF NOT EXISTS %I ON leads ((custom_fields -> %L))'
+            ELSE 'CREATE INDEX CONCURRENTLY IF NOT EXISTS %I ON leads ((custom_fields ->> %L))'
+        END,
+        'idx_leads_cf_' || left(md5(name || ':' || field_type), 16),
+        name
+    )
+    FROM custom_fields
+    WHERE is_active AND field_type IN ('number', 'date', 'select', 'text')
+      AND name ~ '^[A-Za-z0-9_]+$';
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- END OF MIGRATION
+-- =============================================
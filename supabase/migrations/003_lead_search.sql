@@ -0,0 +1,80 @@
+-- =============================================
+-- Full-text search over leads
+-- Version: 1.2
+-- =============================================
+
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- Name ranks highest, then contact details, then notes. Emails and websites
+-- are indexed both whole and split on punctuation so "acme" finds
+-- "sales@acme.io" and "https://www.acme.io".
+CREATE OR REPLACE FUNCTION leads_search_vector(
+    p_name TEXT, p_email TEXT, p_website TEXT, p_notes TEXT
+)
+RETURNS TSVECTOR AS $$
+    SELECT
+        setweight(to_tsvector('simple', coalesce(p_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(p_email, '') || ' ' ||
+            regexp_replace(coalesce(p_email, ''), '[@._/:-]+', ' ', 'g')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(p_website, '') || ' ' ||
+            regexp_replace(coalesce(p_website, ''), '[@._/:-]+', ' ', 'g')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(p_notes, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION leads_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector = leads_search_vector(NEW.name, NEW.email, NEW.website, NEW.notes);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS leads_search_vector_update ON leads;
+CREATE TRIGGER leads_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, email, website, notes ON leads
+    FOR EACH ROW
+    EXECUTE FUNCTION leads_search_vector_update();
+
+-- Backfill existing rows
+UPDATE leads SET search_vector = leads_search_vector(name, email, website, notes)
+WHERE search_vector IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_leads_search_vector ON leads USING GIN (search_vector);
+
+-- =============================================
+-- FUNCTION: search_leads
+-- Description: Matching leads with their rank. Kept as a single STABLE SQL
+-- statement so PostgREST filters, ORDER BY and LIMIT applied on top are
+-- inlined into the indexed query. p_query is a to_tsquery expression built
+-- by the API (e.g. 'acme:* & pay:*').
+-- =============================================
+CREATE OR REPLACE FUNCTION search_leads(p_query TEXT)
+RETURNS TABLE (
+    id UUID,
+    name VARCHAR(255),
+    email VARCHAR(255),
+    website VARCHAR(255),
+    source VARCHAR(100),
+    status VARCHAR(50),
+    deadline TIMESTAMP WITH TIME ZONE,
+    sla_deadline TIMESTAMP WITH TIME ZONE,
+    notes TEXT,
+    custom_fields JSONB,
+    assignee_id UUID,
+    created_by UUID,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    search_rank REAL
+) AS $$
+    SELECT
+        l.id, l.name, l.email, l.website, l.source, l.status, l.deadline,
+        l.sla_deadline, l.notes, l.custom_fields, l.assignee_id, l.created_by,
+        l.created_at, l.updated_at,
+        ts_rank(l.search_vector, to_tsquery('simple', p_query)) AS search_rank
+    FROM leads l
+    WHERE l.search_vector @@ to_tsquery('simple', p_query)
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- END OF MIGRATION
+-- =============================================
@@ -2,7 +2,16 @@
 
 import pytest
 from fastapi.testclient import TestClient
+from tests.fake_supabase import install_fake_supabase
+
+# Must run before the first get_supabase_*_client() call, which caches the client it builds
+fake_supabase = install_fake_supabase()
+
 from app.main import app
+from app.services.custom_field_service import custom_field_service
+from app.services.email_service import EmailService
+from app.services.user_directory import user_directory
+from app.utils import resilience
 
 
 @pytest.fixture
@@ -11,6 +20,46 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def api(client, monkeypatch):
+    """Fresh fake data: an SDR, an assignee and one lead assigned to the assignee, with history
+
+    Outgoing email is stubbed and recorded as an "smtp send_message" call.
+    get(url, headers, user) sends a GET as the SDR unless another user is given.
+    """
+    fake_supabase.reset()
+    user_directory.invalidate()
+    custom_field_service.invalidate()
+    resilience._breakers.clear()
+
+    async def send_email(self, *args, **kwargs):
+        fake_supabase._record("smtp send_message")
+        return True
+
+    monkeypatch.setattr(EmailService, "_send_email_with_retry", send_email)
+
+    sdr = fake_supabase.add_user("Sam Sdr", "sdr")
+    assignee = fake_supabase.add_user("Ann Assignee", "assignee")
+    lead = fake_supabase.seed("leads", {"name": "Acme Corp", "created_by": sdr["id"], "assignee_id": assignee["id"]})[0]
+    fake_supabase.seed("status_history", {"lead_id": lead["id"], "updated_by": sdr["id"], "status": "active"})
+
+    def headers_for(user):
+        return {"Authorization": f"Bearer token-{user['id']}"}
+
+    def get(url, headers=None, user=None):
+        return client.get(url, headers={**headers_for(user or sdr), **(headers or {})})
+
+    return {
+        "client": client,
+        "headers": headers_for(sdr),
+        "headers_for": headers_for,
+        "sdr": sdr,
+        "assignee": assignee,
+        "lead": lead,
+        "get": get,
+    }
+
+
 @pytest.fixture
 def mock_user():
     """Mock user fixture"""
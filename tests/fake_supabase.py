@@ -0,0 +1,328 @@
+"""In-process stand-in for the Supabase PostgREST and GoTrue APIs used by the app
+
+The real postgrest-py request builders are used unchanged; only the HTTP
+transport is replaced by a handler that evaluates PostgREST requests against
+in-memory tables. Every HTTP request and auth call is appended to `calls`,
+so tests can assert exact round-trip counts without a network.
+"""
+
+import json
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote
+import httpx
+from postgrest import SyncPostgrestClient
+
+BASE_URL = "http://fake-supabase.test"
+
+# Column defaults applied on insert, mirroring 001_initial_schema.sql
+TABLE_DEFAULTS = {
+    "leads": {"source": "manual", "status": "active", "custom_fields": {}, "assignee_id": None,
+              "email": None, "website": None, "deadline": None, "sla_deadline": None, "notes": None},
+    "status_history": {"status": None, "action_type": None, "comment": None, "metadata": {}},
+    "notifications": {"channel": "email", "status": "pending", "retry_count": 0, "sent_at": None},
+    "custom_fields": {"is_active": True, "options": None},
+    "users": {"phone": None},
+}
+
+# ON DELETE CASCADE children
+CASCADES = {"leads": [("status_history", "lead_id"), ("notifications", "lead_id")]}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _unquote_value(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _compare(left: Any, right: str) -> Optional[int]:
+    """Compare a row value with a filter value, numerically when both are numbers"""
+    if left is None:
+        return None
+    try:
+        a, b = float(left), float(right)
+    except (TypeError, ValueError):
+        a, b = _as_text(left), right
+    return (a > b) - (a < b)
+
+
+def _split_top_level(expr: str) -> List[str]:
+    parts, depth, quoted, current = [], 0, False, ""
+    for i, ch in enumerate(expr):
+        if ch == '"' and (i == 0 or expr[i - 1] != "\\"):
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _column_value(row: Dict[str, Any], column: str) -> Any:
+    """Resolve plain columns and JSON paths such as custom_fields->>industry"""
+    match = re.match(r"^(\w+)(->>?)(\w+)$", column)
+    if not match:
+        return row.get(column)
+    base, arrow, key = match.groups()
+    value = (row.get(base) or {}).get(key)
+    return _as_text(value) if arrow == "->>" else value
+
+
+def _predicate(column: str, op_value: str) -> Callable[[Dict[str, Any]], bool]:
+    negate = op_value.startswith("not.")
+    if negate:
+        op_value = op_value[4:]
+    op, _, raw = op_value.partition(".")
+
+    def test(row: Dict[str, Any]) -> bool:
+        value = _column_value(row, column)
+        if op == "eq":
+            return _as_text(value) == _unquote_value(raw)
+        if op == "neq":
+            return _as_text(value) != _unquote_value(raw)
+        if op in ("gt", "gte", "lt", "lte"):
+            cmp = _compare(value, _unquote_value(raw))
+            if cmp is None:
+                return False
+            return {"gt": cmp > 0, "gte": cmp >= 0, "lt": cmp < 0, "lte": cmp <= 0}[op]
+        if op == "in":
+            options = [_unquote_value(v) for v in _split_top_level(raw.strip("()"))]
+            return _as_text(value) in options
+        if op == "is":
+            return value is None if raw == "null" else _as_text(value) == raw
+        if op == "cs":
+            expected = json.loads(raw)
+            return isinstance(value, dict) and all(value.get(k) == v for k, v in expected.items())
+        raise ValueError(f"Unsupported operator {op}")
+
+    return (lambda row: not test(row)) if negate else test
+
+
+def _logic(expr: str, combine) -> Callable[[Dict[str, Any]], bool]:
+    """Build a predicate from or=(...) / and(...) logic trees"""
+    tests = []
+    for part in _split_top_level(expr):
+        if part.startswith(("and(", "or(")):
+            name, inner = part.split("(", 1)
+            tests.append(_logic(inner[:-1], all if name == "and" else any))
+        else:
+            column, op_value = part.split(".", 1)
+            tests.append(_predicate(column, op_value))
+    return lambda row: combine(t(row) for t in tests)
+
+
+class FakeAuth:
+    """GoTrue surface: get_user, sign_in_with_password and admin create/delete"""
+
+    def __init__(self, backend: "FakeSupabase"):
+        self.backend = backend
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.tokens: Dict[str, str] = {}
+        self.admin = SimpleNamespace(create_user=self._create_user, delete_user=self._delete_user)
+
+    def add_user(self, user_id: str, email: str, password: str = "password", token: Optional[str] = None):
+        self.users[user_id] = {"id": user_id, "email": email, "password": password}
+        self.tokens[token or f"token-{user_id}"] = user_id
+
+    def _user(self, user_id: str):
+        user = self.users[user_id]
+        return SimpleNamespace(id=user["id"], email=user["email"])
+
+    def get_user(self, token: str):
+        self.backend._record("gotrue get_user")
+        user_id = self.tokens.get(token)
+        if user_id is None:
+            raise Exception("Invalid JWT")
+        return SimpleNamespace(user=self._user(user_id))
+
+    def sign_in_with_password(self, credentials: Dict[str, str]):
+        self.backend._record("gotrue sign_in_with_password")
+        for user_id, user in self.users.items():
+            if user["email"] == credentials["email"] and user["password"] == credentials["password"]:
+                token = f"token-{user_id}"
+                self.tokens[token] = user_id
+                session = SimpleNamespace(access_token=token, refresh_token=f"refresh-{user_id}")
+                return SimpleNamespace(user=self._user(user_id), session=session)
+        raise Exception("Invalid login credentials")
+
+    def _create_user(self, attributes: Dict[str, Any]):
+        self.backend._record("gotrue admin.create_user")
+        user_id = str(uuid.uuid4())
+        self.add_user(user_id, attributes["email"], attributes.get("password", ""))
+        return SimpleNamespace(user=self._user(user_id))
+
+    def _delete_user(self, user_id: str):
+        self.backend._record("gotrue admin.delete_user")
+        self.users.pop(user_id, None)
+
+
+class FakeSupabase:
+    """Supabase client stand-in backed by in-memory tables"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.rpcs: Dict[str, Callable[[Dict[str, Any]], List[Dict[str, Any]]]] = {
+            "search_leads": self._search_leads
+        }
+        self.calls: List[str] = []
+        self.auth = FakeAuth(self)
+        self.postgrest = SyncPostgrestClient(f"{BASE_URL}/rest/v1")
+        self.postgrest.session = httpx.Client(
+            base_url=f"{BASE_URL}/rest/v1", transport=httpx.MockTransport(self._handle)
+        )
+
+    def reset(self):
+        self.tables.clear()
+        self.calls.clear()
+        self.auth.users.clear()
+        self.auth.tokens.clear()
+        self.latency = 0.0
+
+    # Client surface used by the app
+
+    def table(self, name: str):
+        return self.postgrest.from_(name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None):
+        return self.postgrest.rpc(fn, params or {})
+
+    # Seeding helpers
+
+    def seed(self, table: str, *rows: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [self._insert_row(table, dict(row)) for row in rows]
+
+    def add_user(self, name: str, role: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        user_id = user_id or str(uuid.uuid4())
+        email = f"{name.lower().replace(' ', '.')}@example.com"
+        self.auth.add_user(user_id, email)
+        return self.seed("users", {"id": user_id, "name": name, "email": email, "role": role})[0]
+
+    # Request handling
+
+    def _record(self, call: str):
+        self.calls.append(call)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _insert_row(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now()
+        full = {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now}
+        full.update(json.loads(json.dumps(TABLE_DEFAULTS.get(table, {}))))
+        full.update(row)
+        self.tables.setdefault(table, []).append(full)
+        return full
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/rest/v1/", 1)[1]
+        self._record(f"postgrest {request.method} {path}")
+        prefer = request.headers.get("prefer", "")
+        body = json.loads(request.content) if request.content else None
+
+        if path.startswith("rpc/"):
+            rows = self.rpcs[path[4:]](body or {})
+        elif request.method == "POST":
+            rows = [self._insert_row(path, row) for row in (body if isinstance(body, list) else [body])]
+            return self._respond(rows, prefer, status=201, select=request.url.params.get("select"))
+        else:
+            rows = self.tables.setdefault(path, [])
+
+        params = list(request.url.params.multi_items())
+        matched = [row for row in rows if all(test(row) for test in self._filters(params))]
+
+        if request.method == "PATCH":
+            for row in matched:
+                row.update(body)
+                row["updated_at"] = _now()
+        elif request.method == "DELETE":
+            ids = {row["id"] for row in matched}
+            self.tables[path] = [row for row in rows if row["id"] not in ids]
+            for child, column in CASCADES.get(path, []):
+                self.tables[child] = [r for r in self.tables.get(child, []) if r.get(column) not in ids]
+
+        total = len(matched)
+        matched = self._order_and_page(matched, dict(params))
+        return self._respond(matched, prefer, total=total, select=request.url.params.get("select"))
+
+    def _filters(self, params):
+        for key, value in params:
+            if key in ("select", "order", "limit", "offset", "columns"):
+                continue
+            if key == "or":
+                yield _logic(value[1:-1], any)
+            else:
+                yield _predicate(unquote(key), value)
+
+    def _order_and_page(self, rows, params):
+        for spec in reversed((params.get("order") or "").split(",")):
+            if not spec:
+                continue
+            column, *mods = spec.split(".")
+            desc = "desc" in mods
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            rows = sorted(present, key=lambda r: r[column], reverse=desc) + missing
+        offset = int(params.get("offset") or 0)
+        limit = params.get("limit")
+        return rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+
+    def _respond(self, rows, prefer, status=200, total=None, select=None):
+        headers = {"content-type": "application/json"}
+        if "count=exact" in prefer:
+            count = len(rows) if total is None else total
+            headers["content-range"] = f"0-{max(len(rows) - 1, 0)}/{count}"
+        if "return=minimal" in prefer:
+            return httpx.Response(status, headers=headers, content=b"")
+        columns = [c.strip() for c in (select or "*").split(",")]
+        if "*" not in columns:
+            rows = [{c: row.get(c) for c in columns} for row in rows]
+        return httpx.Response(status, headers=headers, content=json.dumps(rows).encode())
+
+    def _search_leads(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Prefix match every term of a build_prefix_tsquery expression"""
+        terms = re.findall(r"(\w+):\*", params.get("p_query", ""))
+        results = []
+        for lead in self.tables.get("leads", []):
+            words = re.findall(r"\w+", " ".join(
+                str(lead.get(c) or "") for c in ("name", "email", "website", "notes")
+            ).lower())
+            hits = [sum(w.startswith(t) for w in words) for t in terms]
+            if all(hits):
+                results.append({**lead, "search_rank": float(sum(hits))})
+        return results
+
+
+def install_fake_supabase(fake: Optional[FakeSupabase] = None) -> FakeSupabase:
+    """Make every get_supabase_*_client() return the fake (call before importing app.main)"""
+    import app.utils.supabase_client as supabase_client
+
+    fake = fake or FakeSupabase()
+    supabase_client.create_client = lambda *args, **kwargs: fake
+    return fake
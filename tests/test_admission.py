@@ -0,0 +1,90 @@
+"""Admission control tests"""
+
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.config import Settings
+from app.middleware import admission
+from app.middleware.admission import AdmissionControlMiddleware, route_lane
+from app.utils.admission import ADMISSION_REJECTED, AdmissionLane
+
+
+def test_lane_queues_in_order_and_sheds():
+    """Test a full lane queues FIFO, rejects past its queue and times out waiters"""
+    async def scenario():
+        lane = AdmissionLane("test", limit=1, max_queue=1, timeout=1)
+        assert await lane.acquire()
+
+        waiter = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        assert lane.queued == 1
+        assert not await lane.acquire()  # queue full
+
+        lane.release()
+        assert await waiter
+        assert lane.active == 1 and lane.queued == 0
+
+        lane.timeout = 0.01
+        assert not await lane.acquire()  # timed out
+        assert lane.queued == 0
+        lane.release()
+        assert lane.active == 0
+
+    before = ADMISSION_REJECTED.value("test", "timeout")
+    asyncio.run(scenario())
+    assert ADMISSION_REJECTED.value("test", "timeout") == before + 1
+    assert ADMISSION_REJECTED.value("test", "queue_full") >= 1
+
+
+def test_route_lanes():
+    """Test routes map to the priority, heavy and default lanes"""
+    assert route_lane("POST", "/api/leads/{lead_id}/assign") == "critical"
+    assert route_lane("GET", "/api/dashboard/metrics") == "heavy"
+    assert route_lane("GET", "/api/leads") == "default"
+    assert route_lane("GET", "/api/events/stream") is None
+    assert route_lane("POST", "/api/batch") is None
+
+
+@pytest.fixture
+def busy_app(monkeypatch):
+    """App whose dashboard blocks until released, with one heavy slot and no queue"""
+    settings = Settings(admission_heavy_concurrency=1, admission_heavy_queue=0, admission_retry_after_seconds=3)
+    monkeypatch.setattr(admission, "get_settings", lambda: settings)
+    release = asyncio.Event()
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware)
+
+    @app.get("/api/dashboard/metrics")
+    async def dashboard():
+        await release.wait()
+        return {"ok": True}
+
+    @app.post("/api/leads")
+    async def create_lead():
+        return {"id": "lead-1"}
+
+    return app, release
+
+
+def test_dashboard_is_shed_while_lead_create_stays_up(busy_app):
+    """Test saturated heavy routes get 503 + Retry-After without blocking the critical lane"""
+    app, release = busy_app
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/api/dashboard/metrics"))
+            await asyncio.sleep(0.05)
+
+            shed = await client.get("/api/dashboard/metrics")
+            created = await client.post("/api/leads")
+
+            release.set()
+            return await first, shed, created
+
+    first, shed, created = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "3"
+    assert created.status_code == 200
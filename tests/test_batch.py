@@ -0,0 +1,96 @@
+"""Tests for POST /api/batch"""
+
+import pytest
+from app.config import get_settings
+from app.dependencies import batch_user
+from app.main import app
+from app.middleware.admission import AdmissionControlMiddleware
+from app.utils.admission import AdmissionLane
+from tests.conftest import fake_supabase as fake
+
+
+@pytest.fixture
+def batch(api):
+    """POST /api/batch as the SDR, or as another user"""
+    def send(requests, user=None):
+        return api["client"].post(
+            "/api/batch",
+            json={"requests": requests},
+            headers=api["headers_for"](user or api["sdr"])
+        )
+    return send
+
+
+def test_batch_authenticates_once(api, batch):
+    """Test sub-requests run in order of the request and share one token check"""
+    fake.calls.clear()
+    response = batch([
+        {"id": "me", "path": "/api/auth/me"},
+        {"id": "fields", "path": "/api/custom-fields"},
+        {"id": "users", "path": "/api/users"},
+        {"id": "leads", "path": "/api/leads?limit=5"},
+        {"id": "lead", "path": f"/api/leads/{api['lead']['id']}?history=none"},
+    ])
+    assert response.status_code == 200, response.text
+    results = response.json()["responses"]
+
+    assert [r["id"] for r in results] == ["me", "fields", "users", "leads", "lead"]
+    assert all(r["status"] == 200 for r in results), results
+    assert results[0]["body"]["id"] == api["sdr"]["id"]
+    assert results[3]["body"][0]["name"] == "Acme Corp"
+    assert results[4]["headers"]["etag"]
+    assert fake.calls.count("gotrue get_user") == 1
+    assert batch_user.get() is None
+
+
+def test_batch_per_item_status(api, batch):
+    """Test failures and writes are reported per item without failing the batch"""
+    results = batch([
+        {"path": "/api/nope"},
+        {"path": "/api/events/stream"},
+        {"path": "/api/batch", "method": "POST", "body": {"requests": []}},
+        {"path": "/api/leads", "method": "POST", "body": {"name": "Globex"}},
+        {"path": "/api/leads", "method": "POST", "body": {}},
+    ]).json()["responses"]
+
+    assert [r["status"] for r in results] == [404, 400, 400, 200, 422]
+    assert results[3]["body"]["name"] == "Globex"
+
+    # Each sub-request still applies the role checks of its route
+    forbidden = batch([{"path": "/api/admin/scheduler/jobs"}], user=api["assignee"]).json()["responses"]
+    assert forbidden[0]["status"] == 403
+
+
+def test_batch_conditional_and_limits(api, batch):
+    """Test sub-request headers are forwarded and the batch size is bounded"""
+    url = f"/api/leads/{api['lead']['id']}"
+    etag = batch([{"path": url}]).json()["responses"][0]["headers"]["etag"]
+    cached = batch([{"path": url, "headers": {"If-None-Match": etag}}]).json()["responses"][0]
+    assert cached["status"] == 304
+    assert cached["body"] is None
+
+    too_many = [{"path": "/api/auth/me"}] * (get_settings().batch_max_requests + 1)
+    assert batch(too_many).status_code == 400
+    assert api["client"].post("/api/batch", json={"requests": [{"path": "/api/auth/me"}]}).status_code == 401
+
+
+def test_sub_requests_take_their_own_admission_lanes(api, batch, monkeypatch):
+    """Test a saturated heavy lane sheds batched dashboards while other lanes still run"""
+    batch([{"path": "/api/auth/me"}])
+    middleware = app.middleware_stack
+    while not isinstance(middleware, AdmissionControlMiddleware):
+        middleware = middleware.app
+
+    full = AdmissionLane("heavy", limit=1, max_queue=0, timeout=0.1)
+    full.active = 1
+    monkeypatch.setitem(middleware.lanes, "heavy", full)
+
+    results = batch([
+        {"path": "/api/dashboard/metrics"},
+        {"path": "/api/leads", "method": "POST", "body": {"name": "Globex"}},
+        {"path": "/api/auth/me"},
+    ]).json()["responses"]
+
+    assert [r["status"] for r in results] == [503, 200, 200]
+    assert results[0]["headers"]["retry-after"] == middleware.retry_after
+    assert full.active == 1
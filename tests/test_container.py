@@ -0,0 +1,56 @@
+"""Service container tests"""
+
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app import container
+from app.container import get_dashboard_service, get_lead_service, reset_container
+from app.main import app
+
+# Counts Supabase clients built while importing app.main with placeholder settings
+IMPORT_PROBE = """
+import app.utils.supabase_client as supabase_client
+built = []
+supabase_client.create_client = lambda *args, **kwargs: built.append(args)
+import app.main
+print(len(built))
+"""
+
+
+def test_importing_app_builds_no_clients():
+    """Test app.main imports without Supabase settings and without side effects"""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("SUPABASE_")}
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "0"
+
+
+def test_services_are_built_once_and_shared():
+    """Test getters build lazily and share dependencies"""
+    reset_container()
+    lead_service = get_lead_service()
+    assert get_lead_service() is lead_service
+    assert lead_service.email_service is container.get_email_service()
+
+    reset_container()
+    assert get_lead_service() is not lead_service
+
+
+def test_routes_resolve_services_through_depends():
+    """Test a service can be swapped with dependency_overrides"""
+    class StubDashboard:
+        async def get_metrics(self):
+            return {
+                "total_leads": 7, "active_leads": 0, "closed_leads": 0, "sla_breaches": 0,
+                "leads_per_assignee": {}, "average_response_time_minutes": None,
+            }
+
+    app.dependency_overrides[get_dashboard_service] = StubDashboard
+    try:
+        response = TestClient(app).get("/api/dashboard/metrics")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert response.json()["total_leads"] == 7
@@ -0,0 +1,72 @@
+"""Custom field validator tests"""
+
+import pytest
+from app.services.custom_field_service import CustomFieldValidator
+
+DEFINITIONS = [
+    {"name": "industry", "field_type": "select", "options": ["fintech", "retail"]},
+    {"name": "budget", "field_type": "number"},
+    {"name": "kickoff", "field_type": "date"},
+    {"name": "qualified", "field_type": "checkbox"},
+    {"name": "notes", "field_type": "text"},
+]
+
+
+def test_values_are_coerced():
+    """Test values are coerced to their declared types"""
+    validator = CustomFieldValidator(DEFINITIONS)
+    cleaned = validator.validate({
+        "industry": "fintech",
+        "budget": "50000",
+        "kickoff": "2024-06-01",
+        "qualified": "true",
+        "notes": None,
+    })
+    assert cleaned == {
+        "industry": "fintech",
+        "budget": 50000,
+        "kickoff": "2024-06-01",
+        "qualified": True,
+        "notes": None,
+    }
+
+
+def test_bad_values_are_rejected():
+    """Test unknown fields and wrongly typed values raise ValueError"""
+    validator = CustomFieldValidator(DEFINITIONS)
+    with pytest.raises(ValueError, match="industry"):
+        validator.validate({"industry": "crypto"})
+    with pytest.raises(ValueError, match="budget"):
+        validator.validate({"budget": True})
+    with pytest.raises(ValueError, match="unknown"):
+        validator.validate({"unknown": 1})
+    for value in ("nan", "inf", "-Infinity", float("nan"), float("inf")):
+        with pytest.raises(ValueError, match="finite"):
+            validator.validate({"budget": value})
+
+
+def test_inactive_fields_kept_on_update():
+    """Test values of deactivated fields pass through updates but not creates"""
+    validator = CustomFieldValidator(DEFINITIONS, inactive_names=["region"])
+    values = {"budget": "10", "region": "emea"}
+    
+    assert validator.validate(values, keep_inactive=True) == {"budget": 10, "region": "emea"}
+    with pytest.raises(ValueError, match="region"):
+        validator.validate(values)
+    with pytest.raises(ValueError, match="unknown"):
+        validator.validate({"unknown": 1}, keep_inactive=True)
+
+
+def test_filters_are_parsed_and_typed():
+    """Test filter expressions are checked against field types and coerced"""
+    validator = CustomFieldValidator(DEFINITIONS)
+    filters = validator.parse_filters(["budget:gte:50000", "industry:in:fintech,retail"])
+    
+    assert [(f.name, f.op, f.value) for f in filters] == [
+        ("budget", "gte", 50000),
+        ("industry", "in", ["fintech", "retail"]),
+    ]
+    with pytest.raises(ValueError, match="Operator"):
+        validator.parse_filters(["industry:gt:fintech"])
+    with pytest.raises(ValueError, match="filterable"):
+        validator.parse_filters(["missing:eq:1"])
@@ -0,0 +1,44 @@
+"""Request-scoped DataLoader tests"""
+
+import asyncio
+from app.utils.dataloader import DataLoader
+
+
+def test_loads_in_same_tick_are_batched_and_deduplicated():
+    """Test concurrent loads collapse into one deduplicated batch"""
+    calls = []
+    
+    async def batch_load(keys):
+        calls.append(list(keys))
+        return {key: key.upper() for key in keys if key != "missing"}
+    
+    async def scenario():
+        loader = DataLoader(batch_load)
+        results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("a"), loader.load("missing"))
+        assert results == ["A", "B", "A", None]
+        assert await loader.load_many(["a", "b"]) == {"a": "A", "b": "B"}
+    
+    asyncio.run(scenario())
+    assert calls == [["a", "b", "missing"]]
+
+
+def test_batch_errors_propagate_and_are_not_cached():
+    """Test a failed batch rejects its futures and later loads retry"""
+    attempts = []
+    
+    async def batch_load(keys):
+        attempts.append(keys)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream down")
+        return {key: 1 for key in keys}
+    
+    async def scenario():
+        loader = DataLoader(batch_load)
+        try:
+            await loader.load("a")
+            assert False, "expected failure"
+        except RuntimeError:
+            pass
+        assert await loader.load("a") == 1
+    
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+"""Tests for ETag / If-None-Match conditional GETs"""
+
+from app.routers.leads import parse_if_match
+from app.services.lead_service import DEFAULT_HISTORY_LIMIT
+from app.utils.etag import content_etag, etag_matches, weak_etag
+from tests.conftest import fake_supabase as fake
+
+
+def test_etag_matching():
+    """Test weak comparison, lists of tags and the wildcard"""
+    etag = weak_etag("2026-01-01T00:00:00")
+    assert etag == 'W/"2026-01-01T00:00:00"'
+    assert etag_matches('"2026-01-01T00:00:00"', etag)
+    assert etag_matches('W/"other", W/"2026-01-01T00:00:00"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"other"', etag)
+    assert not etag_matches(None, etag)
+    assert content_etag(b"[]") == content_etag(b"[]") != content_etag(b"[1]")
+
+
+def test_lead_detail_not_modified(api):
+    """Test a matching If-None-Match returns 304 after a single version lookup"""
+    url = f"/api/leads/{api['lead']['id']}"
+    first = api["get"](url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag == weak_etag(f"{api['lead']['updated_at']}:recent:{DEFAULT_HISTORY_LIMIT}")
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    fake.calls.clear()
+    second = api["get"](url, {"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+    assert fake.calls[-1] == "postgrest GET leads"
+    assert fake.calls.count("postgrest GET leads") == 1
+    assert "postgrest GET status_history" not in fake.calls
+
+
+def test_lead_detail_modified_after_update(api):
+    """Test the ETag works as If-Match and an update changes it"""
+    url = f"/api/leads/{api['lead']['id']}"
+    etag = api["get"](url).headers["ETag"]
+
+    updated = api["client"].patch(url, json={"name": "Acme Inc"}, headers={**api["headers"], "If-Match": etag})
+    assert updated.status_code == 200, updated.text
+
+    response = api["get"](url, {"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Acme Inc"
+    assert response.headers["ETag"] != etag
+
+
+def test_lead_detail_history_variants(api):
+    """Test each history option is its own ETag variant, all usable as If-Match"""
+    url = f"/api/leads/{api['lead']['id']}"
+    tags = {query: api["get"](url + query).headers["ETag"] for query in ("", "?history=none", "?history_limit=5")}
+    assert len(set(tags.values())) == 3
+
+    # A cached full response must not satisfy a request for another variant
+    assert api["get"](url + "?history=none", {"If-None-Match": tags[""]}).status_code == 200
+    assert api["get"](url + "?history=none", {"If-None-Match": tags["?history=none"]}).status_code == 304
+
+    updated_at = api["lead"]["updated_at"]
+    assert {parse_if_match(tag) for tag in tags.values()} == {updated_at}
+    assert parse_if_match(f'"{updated_at}"') == updated_at
+
+
+def test_list_endpoints_not_modified(api):
+    """Test list endpoints tag the body and return 304 until it changes"""
+    for url in ("/api/leads", "/api/leads?fields=summary", "/api/users", "/api/custom-fields", "/api/auth/me"):
+        first = api["get"](url)
+        assert first.status_code == 200, url
+        etag = first.headers["ETag"]
+        assert api["get"](url, {"If-None-Match": etag}).status_code == 304, url
+        assert api["get"](url, {"If-None-Match": 'W/"stale"'}).status_code == 200, url
+
+    etag = api["get"]("/api/leads").headers["ETag"]
+    fake.seed("leads", {"name": "Globex", "created_by": api["lead"]["created_by"]})
+    assert api["get"]("/api/leads", {"If-None-Match": etag}).status_code == 200
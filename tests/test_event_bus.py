@@ -0,0 +1,102 @@
+"""Lead event bus tests"""
+
+import asyncio
+from app.services.event_bus import EventBus, LEAD_ASSIGNED, LEADS_BULK_DELETED, event_bus
+from app.services.lead_service import LeadService
+from app.models.lead import LeadUpdate
+from tests.conftest import fake_supabase as fake
+
+
+def test_assignees_only_receive_their_leads():
+    """Test fan-out filters events per subscriber role"""
+    async def scenario():
+        bus = EventBus(queue_size=10)
+        admin = bus.subscribe({"id": "a1", "role": "admin"})
+        mine = bus.subscribe({"id": "u1", "role": "assignee"})
+        other = bus.subscribe({"id": "u2", "role": "assignee"})
+        
+        await bus.publish(LEAD_ASSIGNED, {"id": "l1", "assignee_id": "u1", "status": "active"})
+        
+        assert admin.queue.qsize() == 1
+        assert (await mine.get())["lead_id"] == "l1"
+        assert other.queue.empty()
+    
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest():
+    """Test a full queue drops the oldest event instead of blocking publishers"""
+    async def scenario():
+        bus = EventBus(queue_size=2)
+        subscription = bus.subscribe({"id": "a1", "role": "sdr"})
+        for lead_id in ("l1", "l2", "l3"):
+            await bus.publish(LEAD_ASSIGNED, {"id": lead_id})
+        
+        assert subscription.dropped == 1
+        assert (await subscription.get())["lead_id"] == "l2"
+    
+    asyncio.run(scenario())
+
+
+def test_previous_assignee_receives_reassignment(client):
+    """Test assign and update events reach the assignee the lead was moved away from"""
+    fake.reset()
+    sdr = fake.add_user("Sam Sdr", "sdr")
+    old = fake.add_user("Old Owner", "assignee")
+    new = fake.add_user("New Owner", "assignee")
+    lead = fake.seed("leads", {"name": "Acme Corp", "created_by": sdr["id"], "assignee_id": old["id"]})[0]
+    
+    async def scenario():
+        service = LeadService()
+        subscription = event_bus.subscribe(old)
+        try:
+            await service.assign_lead(lead["id"], new["id"], sdr["id"])
+            assigned = await subscription.get()
+            assert assigned["previous_assignee_id"] == old["id"]
+            assert assigned["assignee_id"] == new["id"]
+            
+            await service.update_lead(lead["id"], LeadUpdate(assignee_id=old["id"]), sdr["id"])
+            await service.update_lead(lead["id"], LeadUpdate(assignee_id=sdr["id"]), sdr["id"])
+            assert (await subscription.get())["assignee_id"] == old["id"]
+            assert (await subscription.get())["previous_assignee_id"] == old["id"]
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    asyncio.run(scenario())
+
+
+def test_bulk_delete_events_list_deleted_leads(client, monkeypatch):
+    """Test bulk delete events name each lead and reach only the assignees who owned one"""
+    monkeypatch.setattr("app.services.event_bus.BULK_EVENT_MAX_LEADS", 2)
+    monkeypatch.setattr("app.services.lead_service.BULK_EVENT_MAX_LEADS", 2)
+    fake.reset()
+    sdr = fake.add_user("Sam Sdr", "sdr")
+    mine = fake.add_user("Ann Assignee", "assignee")
+    other = fake.add_user("Other Owner", "assignee")
+    leads = fake.seed("leads", *[
+        {"name": f"Lead {i}", "created_by": sdr["id"], "assignee_id": owner["id"]}
+        for i, owner in enumerate([mine, other, other])
+    ])
+    
+    async def scenario():
+        admin_view = event_bus.subscribe(sdr)
+        assignee_view = event_bus.subscribe(mine)
+        try:
+            deleted = await LeadService().delete_leads([lead["id"] for lead in leads] + [leads[0]["id"]])
+            assert deleted == 3
+            
+            events = [await admin_view.get(), await admin_view.get()]
+            assert all(event["type"] == LEADS_BULK_DELETED for event in events)
+            assert [lead for event in events for lead in event["leads"]] == [
+                {"id": lead["id"], "assignee_id": lead["assignee_id"]} for lead in leads
+            ]
+            
+            own = await assignee_view.get()
+            assert own["leads"] == [{"id": leads[0]["id"], "assignee_id": mine["id"]}]
+            assert own["deleted"] == 1
+            assert assignee_view.queue.empty()
+        finally:
+            event_bus.unsubscribe(admin_view)
+            event_bus.unsubscribe(assignee_view)
+    
+    asyncio.run(scenario())
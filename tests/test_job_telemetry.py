@@ -0,0 +1,112 @@
+"""Scheduler job telemetry tests"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.services.email_service import EmailService
+from app.services.job_telemetry import JOB_OVERRUNS, JobTelemetry, job_telemetry
+from app.services.scheduler_service import SchedulerService
+from app.services.user_directory import user_directory
+from app.utils import resilience
+from tests.conftest import fake_supabase as fake
+
+
+def _iso(delta: timedelta) -> str:
+    return (datetime.now(timezone.utc) + delta).isoformat()
+
+
+@pytest.fixture
+def sweep(monkeypatch):
+    """An SDR with one breached lead and one lead due for a reminder"""
+    fake.reset()
+    user_directory.invalidate()
+    resilience._breakers.clear()
+
+    async def send_email(self, *args, **kwargs):
+        return True
+
+    monkeypatch.setattr(EmailService, "_send_email_with_retry", send_email)
+    sdr = fake.add_user("Sam Sdr", "sdr")
+    assignee = fake.add_user("Ann Assignee", "assignee")
+    fake.seed(
+        "leads",
+        {"name": "Late", "created_by": sdr["id"], "sla_deadline": _iso(timedelta(hours=-1))},
+        {"name": "Due soon", "created_by": sdr["id"], "assignee_id": assignee["id"],
+         "deadline": _iso(timedelta(minutes=10))},
+    )
+    return SchedulerService()
+
+
+def test_sweeps_record_scanned_and_acted_counts(sweep):
+    """Test each sweep's run is recorded with what it scanned and did"""
+    asyncio.run(sweep._check_sla_breaches())
+    asyncio.run(sweep._check_approaching_deadlines())
+
+    jobs = {job["job_id"]: job for job in job_telemetry.snapshot()}
+    breaches = jobs["check_sla_breaches"]["last_run"]
+    assert breaches["status"] == "success"
+    assert breaches["scanned"] == 1
+    assert breaches["acted"] == {"leads_marked_breached": 1, "emails_sent": 1}
+    assert breaches["finished_at"] is not None
+
+    reminders = jobs["check_approaching_deadlines"]["last_run"]
+    assert reminders["scanned"] == 1
+    assert reminders["acted"] == {"already_reminded": 0, "emails_sent": 1}
+
+
+def test_failed_sweep_is_recorded_not_raised(sweep, monkeypatch):
+    """Test an exception inside a sweep marks the run failed"""
+    async def broken():
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(sweep.sla_service, "get_breached_leads", broken)
+    asyncio.run(sweep._check_sla_breaches())
+
+    run = {job["job_id"]: job for job in job_telemetry.snapshot()}["check_sla_breaches"]["last_run"]
+    assert run["status"] == "failed"
+    assert run["errors"] == ["RuntimeError: database down"]
+
+
+def test_lag_overrun_and_skipped_runs(caplog):
+    """Test lag is measured from the scheduled time and overruns alert"""
+    telemetry = JobTelemetry(history_size=2)
+    telemetry.register("sweep", interval_seconds=0.01)
+    telemetry.job_submitted("sweep", datetime.now(timezone.utc) - timedelta(seconds=3))
+    before = JOB_OVERRUNS.value("sweep")
+
+    async def slow_run():
+        async with telemetry.run("sweep") as run:
+            assert telemetry.snapshot()[0]["running"][0]["status"] == "running"
+            telemetry.job_skipped("sweep")
+            await asyncio.sleep(0.02)
+            run.count("emails_sent", 2)
+
+    asyncio.run(slow_run())
+
+    job = telemetry.snapshot()[0]
+    assert job["running"] == []
+    assert job["skipped_runs"] == 1
+    assert job["last_run"]["lag_seconds"] >= 3
+    assert job["last_run"]["overran_interval"] is True
+    assert JOB_OVERRUNS.value("sweep") == before + 1
+    alerts = {(getattr(r, "alert", None), getattr(r, "job_id", None)): r for r in caplog.records}
+    skipped = alerts[("scheduler_skipped_run", "sweep")]
+    overrun = alerts[("scheduler_overrun", "sweep")]
+    assert skipped.getMessage().startswith("sweep run skipped")
+    assert "overran its 0.01s interval" in overrun.getMessage()
+    # Distinct templates, so the repeat limiter throttles each kind separately
+    assert skipped.msg != overrun.msg
+
+
+def test_scheduler_jobs_endpoint_is_admin_only(client):
+    """Test the run history endpoint"""
+    fake.reset()
+    resilience._breakers.clear()
+    admin = fake.add_user("Ada Admin", "admin")
+    sdr = fake.add_user("Sam Sdr", "sdr")
+
+    response = client.get("/api/admin/scheduler/jobs", headers={"Authorization": f"Bearer token-{admin['id']}"})
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+    response = client.get("/api/admin/scheduler/jobs", headers={"Authorization": f"Bearer token-{sdr['id']}"})
+    assert response.status_code == 403
@@ -0,0 +1,67 @@
+"""Lead delete and bulk delete tests"""
+
+import uuid
+from postgrest import SyncPostgrestClient
+from app.services import lead_service
+from tests.conftest import fake_supabase as fake
+
+MISSING_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def seed_leads(api, count):
+    return fake.seed("leads", *[
+        {"name": f"Lead {i}", "created_by": api["sdr"]["id"], "assignee_id": api["assignee"]["id"]}
+        for i in range(count)
+    ])
+
+
+def bulk_delete(api, lead_ids, user=None):
+    return api["client"].post(
+        "/api/leads/bulk-delete",
+        json={"lead_ids": lead_ids},
+        headers=api["headers_for"](user or api["sdr"])
+    )
+
+
+def test_bulk_delete_counts_only_existing_leads(api):
+    """Test missing and duplicate ids are ignored in the deleted count"""
+    leads = seed_leads(api, 3)
+    ids = [lead["id"] for lead in leads]
+
+    response = bulk_delete(api, ids[:2] + [ids[0], MISSING_ID])
+    assert response.status_code == 200, response.text
+    assert response.json() == {"deleted": 2}
+    assert {row["id"] for row in fake.tables["leads"]} == {api["lead"]["id"], ids[2]}
+
+
+def test_bulk_delete_requires_sdr(api):
+    """Test assignees cannot bulk delete"""
+    response = bulk_delete(api, [api["lead"]["id"]], user=api["assignee"])
+    assert response.status_code == 403
+    assert any(row["id"] == api["lead"]["id"] for row in fake.tables["leads"])
+
+
+def test_bulk_delete_chunks_the_id_filter(api, monkeypatch):
+    """Test large deletes are split into several DELETE requests"""
+    monkeypatch.setattr(lead_service, "BULK_DELETE_CHUNK_SIZE", 2)
+    ids = [lead["id"] for lead in seed_leads(api, 5)]
+
+    fake.calls.clear()
+    assert bulk_delete(api, ids).json() == {"deleted": 5}
+    assert fake.calls.count("postgrest DELETE leads") == 3
+
+
+def test_chunk_url_fits_request_line_limits():
+    """Test a full chunk of uuids keeps the DELETE URL under 8 KB"""
+    client = SyncPostgrestClient("https://project.supabase.co/rest/v1")
+    ids = [str(uuid.uuid4()) for _ in range(lead_service.BULK_DELETE_CHUNK_SIZE)]
+    query = client.table("leads").delete().in_("id", ids)
+    assert len(f"{query.session.base_url}{query.path}?{query.params}") < 8 * 1024
+
+
+def test_delete_missing_lead_is_404(api):
+    """Test deleting an unknown id returns 404 and a known one succeeds"""
+    client, headers = api["client"], api["headers"]
+    assert client.delete(f"/api/leads/{MISSING_ID}", headers=headers).status_code == 404
+    assert client.delete(f"/api/leads/{api['lead']['id']}", headers=headers).status_code == 200
+    assert client.delete(f"/api/leads/{api['lead']['id']}", headers=headers).status_code == 404
@@ -0,0 +1,35 @@
+"""Sparse fieldset tests for lead listing"""
+
+import json
+import pytest
+from app.services.lead_service import LeadService, resolve_lead_fields, LEAD_FIELD_PRESETS
+from app.utils.serialization import fields_response, LEAD_PARTIAL_LIST_ADAPTER
+
+
+def test_resolve_presets_and_lists():
+    """Test presets resolve by name and custom lists always include id"""
+    assert resolve_lead_fields(None) == LEAD_FIELD_PRESETS["full"]
+    assert resolve_lead_fields("summary") == LEAD_FIELD_PRESETS["summary"]
+    assert resolve_lead_fields("name,status") == ["id", "name", "status"]
+    with pytest.raises(ValueError):
+        resolve_lead_fields("name,password")
+
+
+def test_select_adds_columns_needed_internally():
+    """Test the narrow select keeps columns needed for enrichment and SLA filtering"""
+    select = LeadService._select_for(["id", "assignee_name"], "breached")
+    assert select == "id,assignee_id,deadline,sla_deadline"
+
+
+def test_fields_response_only_emits_requested_fields():
+    """Test rows are trimmed to the requested fields"""
+    rows = [{"id": "l1", "name": "Acme", "sla_deadline": None, "assignee_id": "u1"}]
+    response = fields_response(LEAD_PARTIAL_LIST_ADAPTER, rows, ["id", "name"])
+    assert json.loads(response.body) == [{"id": "l1", "name": "Acme"}]
+
+
+def test_openapi_documents_sparse_shapes(client):
+    """Test the list schema advertises the summary and partial item shapes"""
+    schema = client.get("/openapi.json").json()["paths"]["/api/leads"]["get"]["responses"]["200"]
+    refs = {option["items"]["$ref"].rsplit("/", 1)[-1] for option in schema["content"]["application/json"]["schema"]["anyOf"]}
+    assert refs == {"LeadResponse", "LeadSummaryResponse", "LeadPartialResponse"}
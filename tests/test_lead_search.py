@@ -0,0 +1,12 @@
+"""Lead search query building tests"""
+
+import pytest
+from app.services.lead_service import build_prefix_tsquery
+
+
+def test_prefix_tsquery():
+    """Test search input becomes a prefix-matching tsquery of plain words"""
+    assert build_prefix_tsquery("Acme  pay!") == "acme:* & pay:*"
+    assert build_prefix_tsquery("o'brien & co") == "o:* & brien:* & co:*"
+    with pytest.raises(ValueError):
+        build_prefix_tsquery("  !! ")
@@ -0,0 +1,39 @@
+"""Lead update ownership and optimistic concurrency tests"""
+
+from tests.conftest import fake_supabase as fake
+
+
+def patch(api, lead_id, user, **kwargs):
+    return api["client"].patch(
+        f"/api/leads/{lead_id}",
+        json={"notes": "called back"},
+        headers=api["headers_for"](user),
+        **kwargs
+    )
+
+
+def test_assignee_updates_own_lead_only(api):
+    """Test assignees get 200 on their lead, 403 on others' and 404 on missing ones"""
+    other = fake.seed("leads", {"name": "Globex", "created_by": api["sdr"]["id"], "assignee_id": api["sdr"]["id"]})[0]
+
+    own = patch(api, api["lead"]["id"], api["assignee"])
+    assert own.status_code == 200, own.text
+    assert own.json()["notes"] == "called back"
+
+    assert patch(api, other["id"], api["assignee"]).status_code == 403
+    assert fake.tables["leads"][-1]["notes"] is None
+    assert patch(api, "00000000-0000-0000-0000-000000000000", api["assignee"]).status_code == 404
+
+
+def test_stale_updated_at_query_param_is_rejected(api):
+    """Test ?updated_at= with an old version gets 412 and the current one succeeds"""
+    lead = api["lead"]
+    stale = patch(api, lead["id"], api["sdr"], params={"updated_at": "2000-01-01T00:00:00+00:00"})
+    assert stale.status_code == 412
+
+    version = lead["updated_at"]
+    current = patch(api, lead["id"], api["sdr"], params={"updated_at": version})
+    assert current.status_code == 200, current.text
+
+    # The write bumped updated_at, so the version just used is now stale too
+    assert patch(api, lead["id"], api["sdr"], params={"updated_at": version}).status_code == 412
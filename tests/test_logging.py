@@ -0,0 +1,89 @@
+"""Structured logging tests"""
+
+import json
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.request_id import RequestIdMiddleware
+from app.utils import log
+from app.utils.log import RepeatLimitFilter, bind, get_logger, log_context, parse_levels
+
+
+@pytest.fixture
+def json_logs(capsys):
+    """Returns a function that configures queue logging and one that collects its output"""
+    app_logger = logging.getLogger(log.APP_LOGGER)
+    saved = (app_logger.handlers, app_logger.propagate, app_logger.level)
+
+    def lines():
+        log.shutdown_logging()
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+
+    yield log.configure_logging, lines
+    log.shutdown_logging()
+    app_logger.handlers, app_logger.propagate, app_logger.level = saved
+
+
+def _record(msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("app.test", logging.ERROR, __file__, 1, msg, args, None)
+
+
+def test_repeat_limit_suppresses_and_reports():
+    """Test repeats of one template are capped per window and counted"""
+    limiter = RepeatLimitFilter(limit=2, window_seconds=60)
+    passed = [limiter.filter(_record("SMTP send failed: %s", f"error {i}")) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert limiter.filter(_record("Another message"))
+
+    limiter.window_seconds = 0
+    record = _record("SMTP send failed: %s", "error 5")
+    assert limiter.filter(record)
+    assert record.suppressed == 3
+
+
+def test_request_and_job_context_in_json_lines(json_logs):
+    """Test request ids and bound fields reach every line written by the listener"""
+    configure, collect = json_logs
+    configure()
+    logger = get_logger("app.test_logging")
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/work")
+    async def work():
+        bind(user_id="u1")
+        logger.warning("Working on %s", "leads", extra={"lead_count": 3})
+        return {}
+
+    client = TestClient(app)
+    response = client.get("/work", headers={"X-Request-ID": "req-123"})
+    assert response.headers["x-request-id"] == "req-123"
+    generated = client.get("/work", headers={"X-Request-ID": "bad id\n"}).headers["x-request-id"]
+    assert generated != "bad id\n" and len(generated) == 32
+
+    with log_context(job="check_sla_breaches", run_id="r1"):
+        try:
+            raise RuntimeError("smtp down")
+        except RuntimeError:
+            logger.exception("Job failed")
+
+    lines = collect()
+    first = lines[0]
+    assert first["message"] == "Working on leads"
+    assert first["level"] == "warning"
+    assert first["logger"] == "app.test_logging"
+    assert first["request_id"] == "req-123"
+    assert first["user_id"] == "u1"
+    assert first["lead_count"] == 3
+    assert lines[1]["request_id"] == generated
+    assert lines[2]["job"] == "check_sla_breaches"
+    assert "RuntimeError: smtp down" in lines[2]["exc"]
+
+
+def test_per_module_levels():
+    """Test LOG_LEVELS parsing"""
+    assert parse_levels("app.services.email_service=debug, app.utils=WARNING,") == {
+        "app.services.email_service": "DEBUG",
+        "app.utils": "WARNING",
+    }
@@ -0,0 +1,66 @@
+"""Metrics registry and middleware tests"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.metrics import MetricsMiddleware
+from app.utils import metrics
+from app.utils.metrics import Counter, Histogram, Metric, REGISTRY, record_upstream_call, render_metrics
+
+
+def test_prometheus_text_format():
+    """Test counters and histograms render in the Prometheus exposition format"""
+    counter = Counter("test_events_total", "Test events", ["kind"])
+    histogram = Histogram("test_latency_seconds", "Test latency", buckets=(0.1, 1.0))
+    try:
+        counter.inc('a"b')
+        histogram.observe(value=0.5)
+        histogram.observe(value=3)
+        text = render_metrics()
+    finally:
+        REGISTRY.remove(counter)
+        REGISTRY.remove(histogram)
+
+    assert "# TYPE test_events_total counter" in text
+    assert 'test_events_total{kind="a\\"b"} 1' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'test_latency_seconds_bucket{le="1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "test_latency_seconds_sum 3.5" in text
+    assert "test_latency_seconds_count 2" in text
+
+
+def test_metric_kinds_must_render_samples():
+    """Test a metric type without _samples cannot be instantiated or registered"""
+    class Broken(Metric):
+        kind = "gauge"
+
+    count = len(REGISTRY)
+    with pytest.raises(TypeError, match="abstract"):
+        Broken("test_broken", "Broken metric")
+    assert len(REGISTRY) == count
+
+
+def test_middleware_counts_upstream_calls_per_route():
+    """Test requests are labelled by route template and tally their upstream calls"""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: str):
+        record_upstream_call("postgrest", "GET things", "success", 0.01)
+        record_upstream_call("postgrest", "GET users", "success", 0.01)
+        return {"id": thing_id}
+
+    before = metrics.REQUEST_UPSTREAM_CALLS.count("GET", "/things/{thing_id}", "postgrest")
+    client = TestClient(app)
+    assert client.get("/things/1").status_code == 200
+    assert client.get("/things/2").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    assert metrics.HTTP_REQUESTS.value("GET", "/things/{thing_id}", "200") >= 2
+    assert metrics.HTTP_REQUESTS.value("GET", "unmatched", "404") >= 1
+    assert metrics.HTTP_IN_FLIGHT.value("GET", "/things/{thing_id}") == 0
+    assert metrics.REQUEST_UPSTREAM_CALLS.count("GET", "/things/{thing_id}", "postgrest") == before + 2
+    text = render_metrics()
+    assert 'http_request_upstream_calls_bucket{method="GET",route="/things/{thing_id}",service="postgrest",le="1"}' in text
@@ -0,0 +1,23 @@
+"""Cursor pagination helper tests"""
+
+import pytest
+from app.utils.pagination import encode_cursor, decode_cursor, quote_filter_value
+
+
+def test_cursor_round_trip():
+    """Test cursors decode back to the values they were built from"""
+    cursor = encode_cursor("2024-05-01T10:00:00.123456+00:00", "abc-123")
+    assert decode_cursor(cursor, 2) == ("2024-05-01T10:00:00.123456+00:00", "abc-123")
+
+
+def test_malformed_cursor_rejected():
+    """Test garbage or wrongly sized cursors raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!", 2)
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("only-one"), 2)
+
+
+def test_quote_filter_value():
+    """Test values are quoted for PostgREST or filters"""
+    assert quote_filter_value('a"b') == '"a\\"b"'
@@ -0,0 +1,97 @@
+"""Per-request profiling middleware tests"""
+
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.profiling import ProfilingMiddleware
+from app.routers import admin_profiles
+from app.utils import resilience
+from app.utils.metrics import record_upstream_call
+from tests.conftest import fake_supabase as fake
+
+
+def busy_handler():
+    """Spin for a while so the sampler has something to see"""
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+@pytest.fixture
+def profiled():
+    fake.reset()
+    resilience._breakers.clear()
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(admin_profiles.router)
+
+    @app.get("/slow")
+    async def slow():
+        record_upstream_call("postgrest", "GET leads", "success", 0.02)
+        record_upstream_call("gotrue", "get_user", "success", 0.01)
+        return {"spins": busy_handler()}
+
+    admin = fake.add_user("Ada Admin", "admin")
+    sdr = fake.add_user("Sam Sdr", "sdr")
+    return {
+        "client": TestClient(app),
+        "admin": {"Authorization": f"Bearer token-{admin['id']}"},
+        "sdr": {"Authorization": f"Bearer token-{sdr['id']}"},
+    }
+
+
+def test_unflagged_and_non_admin_requests_are_not_profiled(profiled):
+    """Test the profile flag is ignored without an admin token and absent flags add nothing"""
+    client = profiled["client"]
+    fake.calls.clear()
+    response = client.get("/slow", headers=profiled["admin"])
+    assert "x-profile-id" not in response.headers
+    assert fake.calls == []
+
+    response = client.get("/slow?profile=1", headers=profiled["sdr"])
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+
+def test_admin_profile_breakdown_and_folded_stacks(profiled):
+    """Test an admin-flagged request is profiled and retrievable"""
+    client = profiled["client"]
+    response = client.get("/slow", headers={**profiled["admin"], "X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+    assert "upstream;dur=30.0" in response.headers["server-timing"]
+
+    detail = client.get(f"/api/admin/profiles/{profile_id}", headers=profiled["admin"]).json()
+    assert detail["status_code"] == 200
+    assert detail["upstream"] == {
+        "postgrest": {"calls": 1, "ms": 20.0},
+        "gotrue": {"calls": 1, "ms": 10.0},
+    }
+    assert detail["upstream_ms"] == 30.0
+    assert detail["cpu_ms"] > 20
+    assert detail["samples"] > 0
+
+    folded = client.get(f"/api/admin/profiles/{profile_id}/folded", headers=profiled["admin"]).text
+    assert "test_profiling:busy_handler" in folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+    listed = client.get("/api/admin/profiles", headers=profiled["admin"]).json()
+    assert listed[0]["id"] == profile_id
+    assert client.get("/api/admin/profiles", headers=profiled["sdr"]).status_code == 403
+    assert client.get("/api/admin/profiles/missing", headers=profiled["admin"]).status_code == 404
+
+
+def test_store_keeps_most_recent_profiles():
+    """Test the store evicts the oldest profiles beyond its limit"""
+    from app.utils.profiling import ProfileStore, RequestProfile
+
+    store = ProfileStore(max_entries=2)
+    profiles = [RequestProfile("GET", f"/{i}", 0.01) for i in range(3)]
+    for profile in profiles:
+        store.add(profile)
+    assert [p.path for p in store.recent()] == ["/2", "/1"]
+    assert store.get(profiles[0].id) is None
@@ -0,0 +1,56 @@
+"""N+1 detector and query budget tests"""
+
+import asyncio
+import pytest
+from postgrest import SyncPostgrestClient
+from app.config import get_settings
+from app.utils.query_budget import QueryBudgetExceeded, fingerprint, query_budget, track_queries
+from app.utils.resilience import before_call_hooks
+
+client = SyncPostgrestClient("http://postgrest.test")
+
+
+def issue(query):
+    """Run the before-call hooks the way resilience.execute does, without sending"""
+    for hook in before_call_hooks:
+        hook(query)
+
+
+def test_fingerprint_ignores_values():
+    """Test queries differing only in filter values share a fingerprint"""
+    first = client.table("notifications").select("*").eq("lead_id", "1").eq("message_type", "reminder")
+    second = client.table("notifications").select("*").eq("lead_id", "2").eq("message_type", "reminder")
+    batched = client.table("notifications").select("*").in_("lead_id", ["1", "2"])
+    assert fingerprint(first) == fingerprint(second)
+    assert fingerprint(first) == "GET notifications?lead_id=eq&message_type=eq&select=*"
+    assert fingerprint(batched) != fingerprint(first)
+
+
+def test_repeated_fingerprint_raises(monkeypatch):
+    """Test raise mode stops a request once a query shape repeats past the threshold"""
+    monkeypatch.setattr(get_settings(), "query_budget_mode", "raise")
+    monkeypatch.setattr(get_settings(), "query_repeat_threshold", 2)
+    with track_queries("GET /api/leads") as tracker:
+        issue(client.table("leads").select("status").eq("id", "1"))
+        issue(client.table("leads").select("status").eq("id", "2"))
+        with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+            issue(client.table("leads").select("status").eq("id", "3"))
+    assert tracker.total == 3
+
+
+def test_route_budget_and_warn_mode(monkeypatch):
+    """Test a declared route budget is enforced, and warn mode only records"""
+    monkeypatch.setattr(get_settings(), "query_budget_mode", "warn")
+    with track_queries("GET /api/leads/{lead_id}") as tracker:
+        asyncio.run(query_budget(1)())
+        issue(client.table("leads").select("*").eq("id", "1"))
+        issue(client.table("users").select("*").eq("id", "1"))
+    assert tracker.budget == 1
+    assert tracker.violations == ["GET /api/leads/{lead_id}: more than 1 queries in one request"]
+
+
+def test_off_mode_tracks_nothing():
+    """Test the detector is inert by default"""
+    with track_queries("GET /api/leads") as tracker:
+        issue(client.table("leads").select("*"))
+    assert tracker is None
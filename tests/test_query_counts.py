@@ -0,0 +1,143 @@
+"""Upstream round-trip and latency regression tests against the in-process Supabase fake
+
+Each endpoint's exact sequence of upstream calls is pinned, so an extra
+round trip (or a new N+1) fails the suite. Update the expectation together
+with the change that legitimately alters it.
+"""
+
+import gc
+import statistics
+import time
+import pytest
+from app.services.user_directory import user_directory
+from tests.conftest import fake_supabase as fake
+
+# get_current_user: token check with GoTrue, then the profile row
+AUTH = ["gotrue get_user", "postgrest GET users"]
+
+# Simulated upstream latency for the latency tests
+UPSTREAM_LATENCY = 0.005
+LATENCY_SAMPLES = 20
+
+
+def calls_for(request):
+    """Upstream calls made while serving one request"""
+    fake.calls.clear()
+    response = request()
+    assert response.status_code < 300, response.text
+    return list(fake.calls)
+
+
+def test_lead_detail_round_trips(api):
+    """Test GET /api/leads/{id} costs one query per resource, and the assignee is cached"""
+    url = f"/api/leads/{api['lead']['id']}"
+    assert calls_for(lambda: api["get"](url)) == AUTH + [
+        "postgrest GET leads",
+        "postgrest GET users",
+        "postgrest GET status_history",
+    ]
+    # Second request: assignee name comes from the user directory cache
+    assert calls_for(lambda: api["get"](url)) == AUTH + [
+        "postgrest GET leads",
+        "postgrest GET status_history",
+    ]
+    assert calls_for(lambda: api["get"](url + "?history=none")) == AUTH + ["postgrest GET leads"]
+
+
+def test_read_endpoint_round_trips(api):
+    """Test list, search and history endpoints make a single data query each"""
+    fake.seed("leads", *[
+        {"name": f"Acme {i}", "created_by": api["sdr"]["id"], "assignee_id": api["assignee"]["id"]}
+        for i in range(25)
+    ])
+    user_directory.invalidate()
+
+    assert calls_for(lambda: api["get"]("/api/leads?limit=20")) == AUTH + [
+        "postgrest GET custom_fields",
+        "postgrest GET leads",
+        "postgrest GET users",
+    ]
+    assert calls_for(lambda: api["get"]("/api/leads/search?q=acme&limit=20")) == AUTH + [
+        "postgrest POST rpc/search_leads",
+    ]
+    assert calls_for(lambda: api["get"](f"/api/leads/{api['lead']['id']}/history")) == AUTH + [
+        "postgrest GET status_history",
+    ]
+
+
+def test_write_endpoint_round_trips(api):
+    """Test create, update, assign and delete do not re-read what they just wrote"""
+    client, headers, lead = api["client"], api["headers"], api["lead"]
+
+    assert calls_for(lambda: client.post("/api/leads", headers=headers, json={"name": "Globex"})) == AUTH + [
+        "postgrest GET custom_fields",
+        "postgrest POST leads",
+        "postgrest POST status_history",
+    ]
+    assert calls_for(lambda: client.patch(
+        f"/api/leads/{lead['id']}", headers=headers, json={"status": "in_progress"}
+    )) == AUTH + [
+        "postgrest PATCH leads",
+        "postgrest POST status_history",
+    ]
+    assert calls_for(lambda: client.post(
+        f"/api/leads/{lead['id']}/assign", headers=headers, json={"assignee_id": api["assignee"]["id"]}
+    )) == AUTH + [
+        "postgrest GET leads",
+        "postgrest PATCH leads",
+        "postgrest POST status_history",
+        "postgrest POST status_history",
+        "postgrest GET users",
+        "smtp send_message",
+        "postgrest POST notifications",
+    ]
+    # The delete event names the assignee, so the row is read before it goes
+    assert calls_for(lambda: client.delete(f"/api/leads/{lead['id']}", headers=headers)) == AUTH + [
+        "postgrest GET leads",
+        "postgrest DELETE leads",
+    ]
+    assert not [row for row in fake.tables["status_history"] if row["lead_id"] == lead["id"]]
+
+
+def added_latency(request):
+    """Median latency added by UPSTREAM_LATENCY per call, over LATENCY_SAMPLES pairs
+
+    Requests with and without the simulated upstream latency alternate, so
+    in-process overhead and background load affect both halves alike. GC is
+    paused so collections are not sampled.
+    """
+    timings = {0.0: [], UPSTREAM_LATENCY: []}
+    gc.disable()
+    try:
+        for _ in range(LATENCY_SAMPLES):
+            for latency in timings:
+                fake.latency = latency
+                started = time.perf_counter()
+                assert request().status_code < 300
+                timings[latency].append(time.perf_counter() - started)
+    finally:
+        fake.latency = 0.0
+        gc.enable()
+    return statistics.median(timings[UPSTREAM_LATENCY]) - statistics.median(timings[0.0])
+
+
+@pytest.mark.parametrize("path", [
+    "/api/leads/{lead_id}",
+    "/api/leads?limit=20",
+    "/api/leads/search?q=acme",
+    "/api/leads/{lead_id}/history",
+])
+def test_read_endpoint_latency(api, path):
+    """Test the latency a simulated 5ms upstream adds tracks the round trip count
+
+    Subtracting the latency-free median cancels in-process overhead, so the
+    remaining slack (under one upstream latency) only absorbs thread
+    hand-offs and one more sequential round trip exceeds it. Tail percentiles
+    are not asserted: over a few dozen samples they measure scheduler and GC
+    pauses, not the endpoint.
+    """
+    url = path.format(lead_id=api["lead"]["id"])
+    calls_for(lambda: api["get"](url))
+    round_trips = len(calls_for(lambda: api["get"](url)))
+
+    assert added_latency(lambda: api["get"](url)) < (round_trips + 1) * UPSTREAM_LATENCY
@@ -0,0 +1,112 @@
+"""Read-replica routing tests"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+from app.config import get_settings
+from app.utils import resilience
+from app.utils.read_replica import ReadRouter, current_user_id
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    resilience._breakers.clear()
+    yield
+    resilience._breakers.clear()
+
+
+class FakeQuery:
+    http_method = "GET"
+
+    def __init__(self, client):
+        self.client = client
+        self.session = SimpleNamespace(base_url=client.name)
+
+    def execute(self):
+        self.client.calls += 1
+        if self.client.error:
+            raise self.client.error
+        return self.client.name
+
+
+class FakeClient:
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+        self.calls = 0
+
+
+def read(router, **kwargs):
+    return asyncio.run(router.execute(FakeQuery, **kwargs))
+
+
+def make_router(replica_error=None, **kwargs):
+    primary, replica = FakeClient("primary"), FakeClient("replica", replica_error)
+    return ReadRouter(primary, replica, **kwargs), primary, replica
+
+
+def test_reads_go_to_replica():
+    """Test reads use the replica when it is configured and healthy"""
+    router, primary, replica = make_router()
+    assert read(router) == "replica"
+    assert primary.calls == 0
+
+
+def test_recent_writer_reads_from_primary():
+    """Test read-your-writes stickiness is per user and expires"""
+    router, _, _ = make_router(sticky_seconds=60)
+    router.mark_write("u1")
+    assert read(router, user_id="u1") == "primary"
+    assert read(router, user_id="u2") == "replica"
+
+    token = current_user_id.set("u1")
+    try:
+        assert read(router) == "primary"
+    finally:
+        current_user_id.reset(token)
+
+    expired, _, _ = make_router(sticky_seconds=0)
+    expired.mark_write("u1")
+    assert read(expired, user_id="u1") == "replica"
+
+
+def test_unhealthy_replica_fails_back_to_primary():
+    """Test connection errors fail over and skip the replica until the retry window ends"""
+    router, primary, replica = make_router(httpx.ConnectError("down"), retry_after_seconds=60)
+    assert read(router) == "primary"
+    replica_calls = replica.calls
+    assert read(router) == "primary"
+    assert replica.calls == replica_calls
+
+    router.retry_after_seconds = 0
+    router.mark_replica_unhealthy()
+    replica.error = None
+    assert read(router) == "replica"
+
+
+def test_query_errors_are_not_failover():
+    """Test ordinary query errors are raised instead of retried on the primary"""
+    router, primary, _ = make_router(APIError({"code": "42703", "message": "bad column"}))
+    with pytest.raises(APIError):
+        read(router)
+    assert primary.calls == 0
+    assert router.replica_healthy()
+
+
+def test_replica_timeout_fails_back_to_primary(monkeypatch):
+    """Test a replica read abandoned at the call deadline is repeated on the primary"""
+    monkeypatch.setattr(get_settings(), "supabase_call_deadline_seconds", 0.05)
+
+    class SlowQuery(FakeQuery):
+        def execute(self):
+            if self.client.name == "replica":
+                time.sleep(0.2)
+            return super().execute()
+
+    router, primary, replica = make_router(retry_after_seconds=60)
+    assert asyncio.run(router.execute(SlowQuery)) == "primary"
+    assert primary.calls == 1
+    assert not router.replica_healthy()
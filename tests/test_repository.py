@@ -0,0 +1,145 @@
+"""Repository SQL builder and direct Postgres backend tests"""
+
+import asyncio
+import os
+import time
+import pytest
+from app.services.repository import (
+    In,
+    PostgresRepository,
+    Repository,
+    build_delete,
+    build_insert,
+    build_select,
+    build_update,
+    quote_ident,
+)
+
+
+def test_quote_ident_escapes_quotes():
+    """Test identifiers are quoted and embedded quotes doubled"""
+    assert quote_ident("leads") == '"leads"'
+    assert quote_ident('a"b') == '"a""b"'
+
+
+def test_incomplete_backend_fails_at_construction():
+    """Test a backend missing part of the interface cannot be instantiated"""
+    class ReadOnlyRepository(Repository):
+        async def select(self, table, columns="*", filters=None, order=None, desc=False, limit=None):
+            return []
+    
+    with pytest.raises(TypeError, match="abstract"):
+        ReadOnlyRepository()
+
+
+def test_build_select_with_filters():
+    """Test selects use numbered placeholders, ANY() for In and IS NULL for None"""
+    sql, params = build_select(
+        "leads", "id, status",
+        {"status": "active", "id": In(["a", "b"]), "assignee_id": None},
+        order="created_at", desc=True, limit=5
+    )
+    assert sql == (
+        'SELECT "id", "status" FROM "leads" WHERE "status" = $1 AND "id" = ANY($2) '
+        'AND "assignee_id" IS NULL ORDER BY "created_at" DESC LIMIT 5'
+    )
+    assert params == ["active", ["a", "b"]]
+
+
+def test_build_write_statements():
+    """Test insert/update/delete placeholders line up with their parameters"""
+    assert build_insert("status_history", ["lead_id", "status"]) == (
+        'INSERT INTO "status_history" ("lead_id", "status") VALUES ($1, $2) RETURNING *'
+    )
+    sql, params = build_update("leads", {"status": "closed", "notes": "x"}, {"id": "1"})
+    assert sql == 'UPDATE "leads" SET "status" = $1, "notes" = $2 WHERE "id" = $3 RETURNING *'
+    assert params == ["closed", "x", "1"]
+    sql, params = build_delete("leads", {"id": In(["1", "2"])})
+    assert sql == 'DELETE FROM "leads" WHERE "id" = ANY($1)'
+    assert params == [["1", "2"]]
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+def test_postgres_repository_round_trip():
+    """Test CRUD and transaction rollback against a real database"""
+    import psycopg2
+
+    dsn = os.environ["TEST_DATABASE_URL"]
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+        cur.execute("DROP TABLE IF EXISTS repo_test")
+        cur.execute("CREATE TABLE repo_test (id int PRIMARY KEY, data jsonb)")
+    repo = PostgresRepository(dsn, max_size=2)
+
+    async def scenario():
+        rows = await repo.insert("repo_test", {"id": 1, "data": {"a": 1}})
+        assert rows == [{"id": 1, "data": {"a": 1}}]
+        await repo.update("repo_test", {"data": {"a": 2}}, {"id": 1})
+        assert (await repo.select("repo_test", "data", {"id": 1}))[0]["data"] == {"a": 2}
+
+        with pytest.raises(RuntimeError):
+            async with repo.transaction() as tx:
+                await tx.insert("repo_test", {"id": 2, "data": {}})
+                raise RuntimeError("boom")
+        assert await repo.select("repo_test", "id", {"id": In([2])}) == []
+
+        assert await repo.delete("repo_test", {"id": 1}) == 1
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        repo.pool.closeall()
+        with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+            cur.execute("DROP TABLE repo_test")
+
+
+def test_postgres_calls_go_through_resilience(monkeypatch):
+    """Test direct Postgres statements get observers, query budget hooks, the breaker and the deadline"""
+    import psycopg2
+    from app.config import get_settings
+    from app.utils import resilience
+    from app.utils.query_budget import fingerprint
+
+    seen, hooked = [], []
+    monkeypatch.setattr(resilience, "call_observers", [lambda op, outcome, _: seen.append((op, outcome))])
+    monkeypatch.setattr(resilience, "before_call_hooks", [lambda query: hooked.append(fingerprint(query))])
+    monkeypatch.setattr(get_settings(), "supabase_retry_backoff_seconds", 0)
+    monkeypatch.setattr(get_settings(), "circuit_breaker_failure_threshold", 2)
+    resilience._breakers.clear()
+    repo = PostgresRepository("postgresql://db.test/crm", _connection=object())
+
+    def run(sql, params, fetch):
+        if sql.startswith("DELETE"):
+            raise psycopg2.OperationalError("connection refused")
+        if sql.startswith("UPDATE"):
+            time.sleep(0.2)
+        return [{"id": "1"}], 1
+
+    monkeypatch.setattr(repo, "_run", run)
+
+    async def scenario():
+        assert await repo.select("leads", "id", {"id": In(["1"]), "status": "active"}) == [{"id": "1"}]
+        for _ in range(2):
+            with pytest.raises(psycopg2.OperationalError):
+                await repo.delete("leads", {"id": "1"})
+        with pytest.raises(resilience.CircuitOpenError):
+            await repo.select("leads")
+
+        resilience._breakers.clear()
+        monkeypatch.setattr(get_settings(), "supabase_call_deadline_seconds", 0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await repo.update("leads", {"status": "closed"}, {"id": "1"})
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        resilience._breakers.clear()
+
+    assert hooked[0] == "GET leads?id=in&select=id&status=eq"
+    assert hooked[1:3] == ["DELETE leads?id=eq"] * 2
+    assert seen == [
+        ("GET leads", "success"),
+        ("DELETE leads", "failure"),
+        ("DELETE leads", "failure"),
+        ("GET leads", "circuit_open"),
+        ("PATCH leads", "failure"),
+    ]
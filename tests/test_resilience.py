@@ -0,0 +1,91 @@
+"""Upstream call protection tests"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+from app.config import get_settings
+from app.utils import resilience
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, execute
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(get_settings(), "supabase_retry_backoff_seconds", 0)
+    resilience._breakers.clear()
+    yield
+    resilience._breakers.clear()
+
+
+class FlakyQuery:
+    """Query failing with the given errors before succeeding"""
+
+    def __init__(self, errors, method="GET"):
+        self.errors = list(errors)
+        self.http_method = method
+        self.path = "/leads"
+        self.session = SimpleNamespace(base_url="https://db.test")
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_reads_retry_transient_errors(monkeypatch):
+    """Test GETs are retried on connection errors and 5xx, and report each attempt"""
+    seen = []
+    monkeypatch.setattr(resilience, "call_observers", [lambda op, outcome, _: seen.append((op, outcome))])
+    query = FlakyQuery([httpx.ReadTimeout("slow"), APIError({"code": 503})])
+    assert asyncio.run(execute(query)) == "ok"
+    assert query.calls == 3
+    assert seen == [("GET leads", "retry"), ("GET leads", "retry"), ("GET leads", "success")]
+
+
+def test_writes_and_query_errors_are_not_retried():
+    """Test writes and non-transient errors surface on the first failure"""
+    write = FlakyQuery([httpx.ConnectError("reset")], method="POST")
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(execute(write))
+    assert write.calls == 1
+
+    bad = FlakyQuery([APIError({"code": "42703", "message": "bad column"})])
+    with pytest.raises(APIError):
+        asyncio.run(execute(bad))
+    assert bad.calls == 1
+
+
+def test_call_deadline_bounds_a_hung_attempt(monkeypatch):
+    """Test an attempt still in flight at the deadline is abandoned with TimeoutError"""
+    monkeypatch.setattr(get_settings(), "supabase_call_deadline_seconds", 0.05)
+
+    class HungQuery(FlakyQuery):
+        def execute(self):
+            time.sleep(0.2)
+            return "late"
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(execute(HungQuery([])))
+    assert resilience.get_breaker("https://db.test").failures == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test the breaker fails fast once open and lets one trial through after the reset"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.reset_seconds = 0
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
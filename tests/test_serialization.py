@@ -0,0 +1,20 @@
+"""Fast JSON serialization path tests"""
+
+import asyncio
+from typing import List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from app.models.lead import LeadResponse
+from app.utils.serialization import LEAD_LIST_ADAPTER, dump_json
+from benchmarks.serialization import make_leads
+
+
+def test_fast_path_matches_default_encoding():
+    """Test the TypeAdapter path emits the same bytes as FastAPI's response_model path"""
+    leads = make_leads(5)
+    field = create_model_field("Response_list_leads", List[LeadResponse], mode="serialization")
+    
+    content = asyncio.run(serialize_response(field=field, response_content=leads))
+    
+    assert dump_json(LEAD_LIST_ADAPTER, leads) == JSONResponse(content).body
@@ -0,0 +1,55 @@
+"""User directory cache tests"""
+
+import asyncio
+from types import SimpleNamespace
+from app.services.user_directory import UserDirectory
+
+
+class _UsersTable:
+    """Minimal stand-in for client.table("users") that records in_ lookups"""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.lookups = []
+        self._ids = []
+    
+    def select(self, *columns):
+        return self
+    
+    def in_(self, column, values):
+        self._ids = list(values)
+        return self
+    
+    def execute(self):
+        self.lookups.append(sorted(self._ids))
+        return SimpleNamespace(data=[r for r in self.rows if r["id"] in self._ids])
+
+
+def _directory(rows, **kwargs):
+    table = _UsersTable(rows)
+    directory = UserDirectory(**kwargs)
+    directory.client = SimpleNamespace(table=lambda name: table)
+    return directory, table
+
+
+def test_misses_are_batched_and_cached():
+    """Test misses load in one query and repeat lookups hit the cache"""
+    directory, table = _directory([{"id": "u1", "name": "Ann"}, {"id": "u2", "name": "Bob"}])
+    
+    users = asyncio.run(directory.get_many(["u1", "u2", "ghost"]))
+    assert set(users) == {"u1", "u2"}
+    asyncio.run(directory.get_many(["u1", "ghost"]))
+    
+    assert table.lookups == [["ghost", "u1", "u2"]]
+
+
+def test_invalidate_and_lru_bound():
+    """Test invalidation forces a reload and the LRU bound evicts old entries"""
+    directory, table = _directory([{"id": f"u{i}", "name": str(i)} for i in range(3)], max_entries=2)
+    
+    asyncio.run(directory.get_many(["u0", "u1", "u2"]))
+    assert len(directory._entries) == 2
+    
+    directory.invalidate("u2")
+    assert asyncio.run(directory.get_name("u2")) == "2"
+    assert len(table.lookups) == 2